@@ -62,6 +62,7 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 
     "corsheaders.middleware.CorsMiddleware",
+    "node.middleware.ArtifactOwnerMiddleware",
 ]
 
 CORS_ALLOW_ALL_ORIGINS = True
@@ -97,6 +98,9 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Workspace runs write from several threads; unlike the default in-memory test
+        # database, a file waits for locks held by other connections instead of failing
+        'TEST': {'NAME': BASE_DIR / 'test_db.sqlite3'},
     }
 }
 
@@ -165,6 +169,66 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
 MEDIA_URL = "/media/"
 
+# CSV parser for datasets: "auto" (the default) uses pyarrow's multithreaded reader when
+# pyarrow is installed and the pandas C parser ("c") otherwise; "pyarrow" requires it.
+# Both apply dtype hints while parsing
+DATASET_CSV_ENGINE = os.getenv("DATASET_CSV_ENGINE", "auto")
+
+# Convert CSV datasets to a memory-mapped columnar copy (an artifact keyed by the file's
+# path, mtime and size) on first load, so later loads skip parsing
+DATASET_CSV_SIDECAR = os.getenv("DATASET_CSV_SIDECAR", "true").lower() == "true"
+
+# Uploaded dataset files, stored once per content hash and streamed in fixed-size chunks
+DATASET_UPLOAD_ROOT = os.path.join(MEDIA_ROOT, "uploads")
+DATASET_UPLOAD_CHUNK_SIZE = 1024 * 1024
+DATASET_UPLOAD_MAX_BYTES = int(os.getenv("DATASET_UPLOAD_MAX_BYTES", str(10 * 1024 ** 3)))
+
+# Intermediate DataFrames/Series returned by node executions
+ARTIFACT_ROOT = os.path.join(MEDIA_ROOT, "artifacts")
+# Seconds after their last use that stored artifacts are deleted (see node.artifacts.prune_artifacts)
+ARTIFACT_TTL = int(os.getenv("ARTIFACT_TTL", str(7 * 86400)))
+
+# Trained models (coefficients, intercept and feature names) and how many stay loaded
+MODEL_REGISTRY_ROOT = os.path.join(MEDIA_ROOT, "models")
+MODEL_REGISTRY_CACHE_SIZE = int(os.getenv("MODEL_REGISTRY_CACHE_SIZE", "64"))
+# Models kept per node; older ones are deleted when a node saves a new one (see node.model_registry.prune_models)
+MODEL_REGISTRY_MODELS_PER_NODE = int(os.getenv("MODEL_REGISTRY_MODELS_PER_NODE", "3"))
+
+# Worker processes used by LinearRegression to fit the models of grouped training data
+GROUPED_TRAINING_MAX_WORKERS = int(os.getenv("GROUPED_TRAINING_MAX_WORKERS", "4"))
+
+# Workspace graph runs
+WORKSPACE_RUN_MAX_WORKERS = int(os.getenv("WORKSPACE_RUN_MAX_WORKERS", "4"))
+
+NODE_OUTPUT_CACHE = {
+    "MAX_ENTRIES": int(os.getenv("NODE_OUTPUT_CACHE_MAX_ENTRIES", "128")),
+    "MAX_BYTES": int(os.getenv("NODE_OUTPUT_CACHE_MAX_BYTES", str(2 * 1024 ** 3))),
+}
+
+# Redis (django-redis) is used for the job queue when REDIS_URL is set
+REDIS_URL = os.getenv("REDIS_URL")
+
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django_redis.cache.RedisCache",
+            "LOCATION": REDIS_URL,
+            "OPTIONS": {
+                "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            },
+        }
+    }
+
+# Long-running node executions; "database" stores jobs in the database and runs them on a
+# thread pool of WORKERS threads in each web process (0 leaves them to `manage.py run_jobs`)
+JOB_QUEUE = {
+    "BACKEND": os.getenv("JOB_QUEUE_BACKEND", "redis" if REDIS_URL else "database"),
+    "WORKERS": int(os.getenv("JOB_QUEUE_WORKERS", "2")),
+    "RESULT_TTL": int(os.getenv("JOB_QUEUE_RESULT_TTL", "86400")),
+    # Seconds after which a database job still running is assumed lost with its process
+    "TIMEOUT": int(os.getenv("JOB_QUEUE_TIMEOUT", str(6 * 3600))),
+}
+
 # Email Configuration
 EMAIL_BACKENDS = {
     "ai-lab": {
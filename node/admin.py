@@ -4,6 +4,9 @@ from node.modules.output.text import Text
 from node.modules.input.dataset import Dataset
 from node.modules.preprocessing.feature_selection import FeatureSelection
 from node.modules.preprocessing.train_test_split import TrainTestSplit
+from node.modules.preprocessing.filter import Filter
+from node.modules.preprocessing.hash_encoding import HashEncoding
+from node.modules.preprocessing.imputation import Imputation
 from node.modules.model.linear_regression import LinearRegression
 from node.modules.evaluation.predict import Predict
 from node.modules.evaluation.accuracy import Accuracy
@@ -27,6 +30,7 @@ class TextAdmin(admin.ModelAdmin):
 @admin.register(Dataset)
 class DatasetAdmin(admin.ModelAdmin):
     list_display = ("id", "workspace", "file_path", "rows", "columns")
+    readonly_fields = ("profile", "profile_key")
     search_fields = ("id", "file_path")
     list_filter = ("workspace",)
 
@@ -40,7 +44,28 @@ class FeatureSelectionAdmin(admin.ModelAdmin):
 
 @admin.register(TrainTestSplit)
 class TrainTestSplitAdmin(admin.ModelAdmin):
-    list_display = ("id", "workspace", "test_size", "train_samples", "test_samples")
+    list_display = ("id", "workspace", "test_size", "random_state", "train_samples", "test_samples")
+    search_fields = ("id",)
+    list_filter = ("workspace",)
+
+
+@admin.register(Filter)
+class FilterAdmin(admin.ModelAdmin):
+    list_display = ("id", "workspace", "conditions", "rows")
+    search_fields = ("id",)
+    list_filter = ("workspace",)
+
+
+@admin.register(HashEncoding)
+class HashEncodingAdmin(admin.ModelAdmin):
+    list_display = ("id", "workspace", "columns", "n_buckets", "n_features")
+    search_fields = ("id",)
+    list_filter = ("workspace",)
+
+
+@admin.register(Imputation)
+class ImputationAdmin(admin.ModelAdmin):
+    list_display = ("id", "workspace", "strategy", "columns", "rows", "missing_values")
     search_fields = ("id",)
     list_filter = ("workspace",)
 
@@ -0,0 +1,806 @@
+import contextvars
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+import weakref
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from scipy import sparse
+
+
+def artifact_root():
+    return getattr(settings, 'ARTIFACT_ROOT', os.path.join(settings.MEDIA_ROOT, 'artifacts'))
+
+
+def artifact_path(artifact_id):
+    if not re.fullmatch(r'[0-9a-f]{32}', str(artifact_id)):
+        raise ValueError(f"Invalid artifact id: {artifact_id}")
+    return os.path.join(artifact_root(), str(artifact_id))
+
+
+# Stored kind of sparse matrices and sparse arrays, which are both reopened in CSR format
+SPARSE_KINDS = ('csr_matrix', 'csr_array')
+
+
+# Returns the ID of the user artifacts are stored for and opened by; see artifacts_owned_by
+_owner = contextvars.ContextVar('artifact_owner', default=None)
+
+
+@contextmanager
+def artifacts_owned_by(owner):
+    """
+    Stores artifacts for, and only opens artifacts of, a user within the block.
+
+    Args:
+        owner (int | callable): User ID, or a function returning it (or None) when called,
+            for users only known once the request is authenticated.
+    """
+    token = _owner.set(owner)
+    try:
+        yield
+    finally:
+        _owner.reset(token)
+
+
+def artifact_owner():
+    """ID of the user artifacts are stored for, or None outside a user's request or job."""
+    owner = _owner.get()
+    return owner() if callable(owner) else owner
+
+
+def is_artifact_handle(value):
+    return isinstance(value, dict) and 'artifact_id' in value
+
+
+def save_artifact(value, artifact_id=None):
+    """
+    Persists a DataFrame or Series as one column file per column under ARTIFACT_ROOT.
+
+    Numeric, boolean and datetime columns are written as .npy files and string columns as
+    Arrow IPC files, which are opened memory-mapped; categoricals as integer codes plus
+    their categories; any other column as a JSON list. Sparse matrices are written as
+    their CSR data, indices and indptr arrays.
+
+    Args:
+        value (pd.DataFrame | pd.Series | scipy.sparse matrix | RowView): Table to persist.
+        artifact_id (str): Optional 32-character hex id, for artifacts derived
+            deterministically from their source. Defaults to a random id, and the artifact
+            then belongs to the current artifact_owner: other users cannot open it.
+
+    Returns:
+        dict: Handle {'artifact_id', 'kind', 'shape', 'columns', 'dtypes', 'fingerprint'} that
+        can be passed to open_artifact or given to a node input in place of the table. Row views
+        and tables recorded with remember_rows are stored as their parent's handle plus a 'rows'
+        artifact.
+        The value's known fingerprint (see remember_fingerprint) is stored with it; handles only
+        report it, and opening an artifact trusts the stored fingerprint, never the handle's.
+    """
+    if isinstance(value, RowView):
+        known = known_artifact(value)
+        if known is not None and artifact_id in (None, known['artifact_id']):
+            return known
+        handle = None if artifact_id else _save_rows(value.parent, value.positions, value.shape, value.fingerprint())
+        if handle is None:
+            # The parent is itself a row view, so the rows are stored as a table of their own
+            return save_artifact(value.materialize(), artifact_id)
+        remember_artifact(value, handle)
+        return handle
+
+    if isinstance(value, pd.Series):
+        kind, frame = 'Series', value.to_frame(name=value.name)
+    elif isinstance(value, pd.DataFrame):
+        kind, frame = 'DataFrame', value
+    elif sparse.issparse(value):
+        kind, frame = SPARSE_KINDS[isinstance(value, sparse.sparray)], None
+    else:
+        raise ValueError("Only DataFrames, Series and sparse matrices can be stored as artifacts.")
+
+    known = known_artifact(value)
+    if known is not None and artifact_id in (None, known['artifact_id']):
+        return known
+
+    view = known_rows(value)
+    if view is not None and artifact_id is None:
+        handle = _save_rows(*view, value.shape, _stored_fingerprint(value))
+        if handle is not None:
+            remember_artifact(value, handle)
+            return handle
+
+    prune_artifacts(min_interval=getattr(settings, 'ARTIFACT_PRUNE_INTERVAL', 3600))
+    owner = artifact_owner() if artifact_id is None else None
+    artifact_id = artifact_id or uuid.uuid4().hex
+    directory = artifact_path(artifact_id)
+    # Write to a temporary directory first so readers never see a partial artifact
+    staging = f"{directory}.tmp-{uuid.uuid4().hex}"
+    os.makedirs(staging)
+
+    if frame is None:
+        meta = _write_sparse(staging, kind, value)
+    else:
+        meta = _write_frame(staging, kind, frame, value.shape)
+    meta['fingerprint'] = _stored_fingerprint(value)
+    meta['owner'] = owner
+    with open(os.path.join(staging, 'meta.json'), 'w') as f:
+        json.dump(meta, f)
+
+    try:
+        os.rename(staging, directory)
+    except OSError:
+        # Another writer stored the same artifact first
+        shutil.rmtree(staging, ignore_errors=True)
+        meta = read_artifact_meta(artifact_id)
+
+    handle = artifact_handle(artifact_id, meta)
+    remember_artifact(value, handle)
+    return handle
+
+
+def _save_rows(parent, positions, shape, fingerprint):
+    """
+    Stores rows of parent as the parent's artifact plus their positions, or returns None
+    when the parent is itself stored as rows of another artifact.
+    """
+    parent_handle = save_artifact(parent)
+    if 'rows' in parent_handle:
+        return None
+    if not isinstance(positions, pd.Series):
+        positions = pd.Series(np.asarray(positions), name='position')
+    rows_handle = save_artifact(positions)
+    return {
+        **parent_handle,
+        'rows': rows_handle['artifact_id'],
+        'shape': list(shape),
+        'fingerprint': fingerprint,
+    }
+
+
+def _write_frame(directory, kind, frame, shape):
+    columns = [
+        _write_column(directory, f"c{position}", frame.iloc[:, position])
+        for position in range(frame.shape[1])
+    ]
+    if isinstance(frame.index, pd.RangeIndex):
+        index = {'format': 'range', 'start': frame.index.start,
+                 'stop': frame.index.stop, 'step': frame.index.step}
+    else:
+        index = _write_column(directory, "index", pd.Series(frame.index.array))
+
+    return {
+        'kind': kind,
+        'names': [_json_name(name) for name in frame.columns],
+        'index_name': _json_name(frame.index.name),
+        'columns': columns,
+        'index': index,
+        'shape': list(shape),
+        'dtypes': {str(name): str(dtype) for name, dtype in frame.dtypes.items()},
+    }
+
+
+def _write_sparse(directory, kind, matrix):
+    matrix = matrix.tocsr()
+    for name in ('data', 'indices', 'indptr'):
+        np.save(os.path.join(directory, f"{name}.npy"), getattr(matrix, name))
+    return {
+        'kind': kind,
+        'names': [],
+        'shape': list(matrix.shape),
+        'dtypes': {},
+        'dtype': str(matrix.dtype),
+        'nnz': int(matrix.nnz),
+    }
+
+
+def open_artifact(handle, columns=None):
+    """
+    Opens a stored artifact. Column files are memory-mapped read-only, so the returned
+    DataFrame, Series or sparse matrix shares memory with the page cache instead of copying it.
+
+    Args:
+        handle (dict | str): Handle returned by save_artifact, or its artifact_id. Handles
+            with 'rows' select those row positions of the parent artifact.
+        columns (list): Optional subset of columns to open; other column files are not read.
+            Not supported for sparse matrices.
+
+    Returns:
+        pd.DataFrame | pd.Series | scipy.sparse matrix
+
+    Raises:
+        ValueError: If the artifact or one of the requested columns does not exist, or the
+        artifact belongs to another user than the current artifact_owner.
+    """
+    artifact_id = handle['artifact_id'] if is_artifact_handle(handle) else handle
+    if is_artifact_handle(handle) and handle.get('rows'):
+        # Row view of a parent artifact, e.g. the training rows of a split
+        parent = open_artifact(artifact_id, columns=columns)
+        positions = open_artifact(handle['rows'])
+        rows = positions.to_numpy()
+        value = freeze(parent[rows] if sparse.issparse(parent) else parent.iloc[rows])
+        remember_rows(value, parent, positions)
+        remember_derived(value, parent, ('rows', content_hash(positions)))
+        if columns is None:
+            remember_artifact(value, handle)
+        return value
+
+    meta = read_artifact_meta(artifact_id)
+    directory = artifact_path(artifact_id)
+
+    if meta['kind'] in SPARSE_KINDS:
+        if columns is not None:
+            raise ValueError("Sparse artifacts cannot be opened by column.")
+        arrays = [np.load(os.path.join(directory, f"{name}.npy"), mmap_mode='r')
+                  for name in ('data', 'indices', 'indptr')]
+        matrix_class = sparse.csr_array if meta['kind'] == 'csr_array' else sparse.csr_matrix
+        value = matrix_class(tuple(arrays), shape=tuple(meta['shape']), copy=False)
+        _restore_fingerprint(value, artifact_id, meta)
+        remember_artifact(value, artifact_handle(artifact_id, meta))
+        return value
+
+    positions = list(range(len(meta['names'])))
+    if columns is not None:
+        missing = [column for column in columns if column not in meta['names']]
+        if missing:
+            raise ValueError(f"Missing columns: {missing}")
+        positions = [meta['names'].index(column) for column in columns]
+
+    if meta['index']['format'] == 'range':
+        index = pd.RangeIndex(meta['index']['start'], meta['index']['stop'],
+                              meta['index']['step'], name=meta['index_name'])
+    else:
+        index = pd.Index(_read_column(directory, meta['index']), name=meta['index_name'], copy=False)
+    data = {
+        position: _read_column(directory, meta['columns'][position])
+        for position in positions
+    }
+    frame = pd.DataFrame(data, index=index, copy=False)
+    frame.columns = [meta['names'][position] for position in positions]
+
+    value = frame.iloc[:, 0] if meta['kind'] == 'Series' else frame
+    _restore_fingerprint(value, artifact_id, meta, columns)
+    if columns is None:
+        remember_artifact(value, artifact_handle(artifact_id, meta))
+    return value
+
+
+def artifact_exists(artifact_id):
+    return os.path.exists(os.path.join(artifact_path(artifact_id), 'meta.json'))
+
+
+_known_artifacts = {}
+_known_lock = threading.RLock()  # forget callbacks can run while it is held
+
+
+def remember_artifact(value, handle):
+    """
+    Records that an in-memory table is stored as the given artifact, so serializing it
+    again returns the existing handle instead of writing a copy.
+    """
+    key = id(value)
+
+    def forget(_):
+        with _known_lock:
+            _known_artifacts.pop(key, None)
+
+    with _known_lock:
+        _known_artifacts[key] = (weakref.ref(value, forget), handle)
+
+
+class RowView:
+    """
+    Rows of a table selected by position, e.g. the training rows of a split, holding only
+    the positions until a node reads them (see materialize). Storing a view stores the
+    parent artifact and the positions, without copying the rows.
+
+    Args:
+        parent (pd.DataFrame | pd.Series | scipy.sparse matrix): Table the rows are taken from.
+        positions (pd.Series): Row positions in parent.
+        nan_free (bool): Whether the rows are known to have (no) missing values.
+    """
+
+    def __init__(self, parent, positions, nan_free=None):
+        self.parent = parent
+        self.positions = positions
+        self.nan_free = nan_free
+
+    @property
+    def shape(self):
+        return (len(self.positions),) + tuple(self.parent.shape[1:])
+
+    def __len__(self):
+        return len(self.positions)
+
+    def materialize(self):
+        """
+        Copies the rows out of the parent into a read-only table, recorded as rows of
+        the parent with a fingerprint derived from it (see remember_rows, remember_derived).
+        """
+        rows = np.asarray(self.positions)
+        value = freeze(self.parent[rows] if sparse.issparse(self.parent) else self.parent.iloc[rows])
+        remember_rows(value, self.parent, self.positions)
+        remember_derived(value, self.parent, ['rows', content_hash(self.positions)], nan_free=self.nan_free)
+        return value
+
+    def fingerprint(self):
+        """The fingerprint the materialized rows get, as stored with their artifact."""
+        parent_hash = _known_hash(self.parent)
+        return {
+            'nan_free': True if self.nan_free is None and known_clean(self.parent) else self.nan_free,
+            'hash': derived_hash(parent_hash, ['rows', content_hash(self.positions)]) if parent_hash else None,
+        }
+
+
+def materialize(value):
+    """Returns the rows selected by a RowView as a table; other values are returned as they are."""
+    return value.materialize() if isinstance(value, RowView) else value
+
+
+_known_rows = {}
+
+
+def remember_rows(value, parent, positions):
+    """
+    Records that value holds the given row positions of parent (value = parent.iloc[positions]),
+    so it can be stored as the parent artifact plus a row index instead of a copy of the data.
+    Passing the same positions Series for several tables stores the positions once.
+    """
+    key = id(value)
+
+    def forget(_):
+        with _known_lock:
+            _known_rows.pop(key, None)
+
+    with _known_lock:
+        _known_rows[key] = (weakref.ref(value, forget), parent, positions)
+
+
+def known_rows(value):
+    with _known_lock:
+        entry = _known_rows.get(id(value))
+    if entry is not None and entry[0]() is value:
+        return entry[1], entry[2]
+    return None
+
+
+def remember_copy(value, original):
+    """
+    Records what is known about original (its artifact, row view and fingerprint) for
+    value, a copy sharing its data, e.g. a shallow copy of a cached table.
+    """
+    handle = known_artifact(original)
+    if handle is not None:
+        remember_artifact(value, handle)
+    view = known_rows(original)
+    if view is not None:
+        remember_rows(value, *view)
+    fingerprint = known_fingerprint(original)
+    if fingerprint is not None:
+        remember_fingerprint(value, nan_free=fingerprint['nan_free'], content_hash=fingerprint['hash'])
+    return value
+
+
+def known_artifact(value):
+    with _known_lock:
+        entry = _known_artifacts.get(id(value))
+    if entry is not None and entry[0]() is value:
+        return entry[1]
+    return None
+
+
+_known_fingerprints = {}
+
+
+def remember_fingerprint(value, nan_free=None, content_hash=None):
+    """
+    Records the validation fingerprint of a table, vector or matrix produced inside the
+    backend, so services can trust it instead of scanning the data again:
+
+    - shape and dtypes, as recorded
+    - nan_free: True or False once the value was checked for missing values, else None
+    - hash: identifies the content (equal hashes mean equal content), else None
+
+    Facts already known about the value are kept when only some are given. Only values
+    whose data is read-only are fingerprinted: memory-mapped artifacts and outputs passed
+    through freeze. The fingerprint also records their data buffers and is only trusted
+    while the value still holds them, so replacing a column (or pandas copying data on
+    write) invalidates it. Fingerprints are stored with the value's artifact and restored
+    when it is opened.
+
+    Returns:
+        dict: The fingerprint, which is not recorded when value's data is writeable.
+    """
+    previous = known_fingerprint(value) or {}
+    fingerprint = {
+        'shape': list(value.shape),
+        'dtypes': _fingerprint_dtypes(value),
+        'nan_free': previous.get('nan_free') if nan_free is None else bool(nan_free),
+        'hash': content_hash or previous.get('hash'),
+    }
+    buffers = _read_only_buffers(value)
+    if buffers is None:
+        return fingerprint
+    key = id(value)
+
+    def forget(_):
+        with _known_lock:
+            _known_fingerprints.pop(key, None)
+
+    with _known_lock:
+        _known_fingerprints[key] = (weakref.ref(value, forget), fingerprint, buffers)
+    return fingerprint
+
+
+def known_fingerprint(value):
+    with _known_lock:
+        entry = _known_fingerprints.get(id(value))
+    if entry is None or entry[0]() is not value or entry[1]['shape'] != list(value.shape):
+        return None
+    if _read_only_buffers(value) != entry[2]:
+        return None
+    return entry[1]
+
+
+def freeze(value):
+    """
+    Returns value with its data read-only, without copying it, so its fingerprint can be
+    recorded (see remember_fingerprint). Tables and arrays become read-only views; CSR
+    matrices are made read-only in place, so only pass matrices the caller created.
+    Tables with columns that are neither numpy- nor Arrow-backed (e.g. categoricals)
+    are returned unchanged.
+    """
+    if _read_only_buffers(value) is not None:
+        return value
+    if isinstance(value, np.ndarray):
+        return _read_only_view(value)
+    if sparse.issparse(value) and value.format == 'csr':
+        for array in (value.data, value.indices, value.indptr):
+            array.flags.writeable = False
+        return value
+    if isinstance(value, pd.Series):
+        array = _column_array(value)
+        if not isinstance(array, np.ndarray):
+            return value
+        return pd.Series(_read_only_view(array), index=value.index, name=value.name, copy=False).__finalize__(value)
+    if isinstance(value, pd.DataFrame):
+        arrays = [_column_array(value.iloc[:, position]) for position in range(value.shape[1])]
+        if any(array is None for array in arrays):
+            return value
+        data = {
+            position: _read_only_view(array) if isinstance(array, np.ndarray) else value.iloc[:, position]
+            for position, array in enumerate(arrays)
+        }
+        frame = pd.DataFrame(data, index=value.index, copy=False)
+        frame.columns = value.columns
+        return frame.__finalize__(value)
+    return value
+
+
+def _read_only_view(array):
+    view = array.view()
+    view.flags.writeable = False
+    return view
+
+
+def _column_array(series):
+    """
+    The numpy array holding a column's values, its Arrow array for Arrow-backed columns
+    (whose buffers are immutable), or None for other extension types.
+    """
+    if isinstance(series.dtype, np.dtype):
+        return np.asarray(series.array)
+    if isinstance(series.array, pd.arrays.ArrowExtensionArray):
+        return series.array.__arrow_array__()
+    return None
+
+
+def _read_only_buffers(value):
+    """Addresses of value's data buffers, or None when some of its data can be written to."""
+    if isinstance(value, np.ndarray):
+        arrays = [value]
+    elif sparse.issparse(value) and value.format == 'csr':
+        arrays = [value.data, value.indices, value.indptr]
+    elif isinstance(value, pd.Series):
+        arrays = [_column_array(value)]
+    elif isinstance(value, pd.DataFrame):
+        arrays = [_column_array(value.iloc[:, position]) for position in range(value.shape[1])]
+    else:
+        return None
+
+    buffers = []
+    for array in arrays:
+        if isinstance(array, np.ndarray):
+            if array.flags.writeable:
+                return None
+            buffers.append(array.__array_interface__['data'][0])
+        elif array is not None:
+            buffers.extend(buffer.address for chunk in array.chunks for buffer in chunk.buffers() if buffer is not None)
+        else:
+            return None
+    return tuple(buffers)
+
+
+def remember_clean(value):
+    """Records that a value was validated to contain no missing values."""
+    return remember_fingerprint(value, nan_free=True)
+
+
+def known_clean(value):
+    fingerprint = known_fingerprint(value)
+    return fingerprint is not None and fingerprint['nan_free'] is True
+
+
+def remember_derived(value, parent, operation, nan_free=None):
+    """
+    Records the fingerprint of a value computed from parent by a deterministic operation
+    (e.g. a row or column selection), without reading either of them: its hash combines
+    the parent's hash, when known, with the operation, and it is NaN-free when the parent
+    is, unless nan_free says otherwise.
+
+    Args:
+        value: Derived table, vector or matrix.
+        parent: Table it was computed from.
+        operation (tuple): JSON-serializable description of the operation and its options.
+        nan_free (bool): Whether value is known to have (no) missing values.
+    """
+    if nan_free is None and known_clean(parent):
+        nan_free = True
+    parent_hash = _known_hash(parent)
+    return remember_fingerprint(
+        value, nan_free=nan_free,
+        content_hash=derived_hash(parent_hash, operation) if parent_hash else None,
+    )
+
+
+def is_rows_of_derived(value, parent, operation):
+    """
+    Whether the recorded fingerprints show that value holds rows (see remember_rows) of
+    what operation computed from parent, e.g. the training rows of columns selected from
+    a dataset. Neither table is read; values of unknown origin are never vouched for.
+    """
+    parent_hash = _known_hash(parent)
+    view = known_rows(value)
+    if parent_hash is None or view is None:
+        return False
+    source, positions = view
+    source_hash = _known_hash(source)
+    return (source_hash == derived_hash(parent_hash, operation)
+            and _known_hash(value) == derived_hash(source_hash, ['rows', content_hash(positions)]))
+
+
+def derived_hash(parent_hash, operation):
+    source = json.dumps([parent_hash, operation], default=str, sort_keys=True)
+    return hashlib.sha256(source.encode()).hexdigest()[:32]
+
+
+def content_hash(value):
+    """
+    Returns the content hash of a table, vector or matrix: from its fingerprint or its
+    artifact when known, otherwise by hashing its values once.
+    """
+    digest = _known_hash(value)
+    if digest is None:
+        digest = hashlib.sha256()
+        if sparse.issparse(value):
+            matrix = value.tocsr()
+            digest.update(str(['sparse', matrix.shape, str(matrix.dtype)]).encode())
+            for array in (matrix.indptr, matrix.indices, matrix.data):
+                digest.update(np.ascontiguousarray(array).tobytes())
+        elif isinstance(value, (pd.DataFrame, pd.Series)):
+            digest.update(str([_fingerprint_dtypes(value), value.shape]).encode())
+            digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+        else:
+            array = np.ascontiguousarray(value)
+            digest.update(str([array.dtype, array.shape]).encode())
+            digest.update(array.tobytes())
+        digest = digest.hexdigest()[:32]
+    remember_fingerprint(value, content_hash=digest)
+    return digest
+
+
+def _known_hash(value):
+    fingerprint = known_fingerprint(value)
+    if fingerprint is not None and fingerprint['hash']:
+        return fingerprint['hash']
+    handle = known_artifact(value)
+    if handle is not None:
+        # Artifacts are never modified, so their id identifies their content
+        return derived_hash(handle['artifact_id'], ['rows', handle.get('rows')])
+    return None
+
+
+def _fingerprint_dtypes(value):
+    if isinstance(value, pd.DataFrame):
+        return {str(name): str(dtype) for name, dtype in value.dtypes.items()}
+    if isinstance(value, pd.Series):
+        return {str(value.name): str(value.dtype)}
+    return {'values': str(value.dtype)}
+
+
+def _stored_fingerprint(value):
+    fingerprint = known_fingerprint(value)
+    if fingerprint is None:
+        return {'nan_free': None, 'hash': None}
+    return {'nan_free': fingerprint['nan_free'], 'hash': fingerprint['hash']}
+
+
+def _restore_fingerprint(value, artifact_id, meta, columns=None):
+    stored = meta.get('fingerprint') or {}
+    source_hash = stored.get('hash') or derived_hash(artifact_id, ['rows', None])
+    if columns is not None:
+        source_hash = derived_hash(source_hash, ['columns', list(columns)])
+    remember_fingerprint(value, nan_free=stored.get('nan_free'), content_hash=source_hash)
+
+
+def read_artifact_meta(artifact_id):
+    """
+    Reads an artifact's metadata, marking it as used for prune_artifacts.
+
+    Raises:
+        ValueError: If the artifact does not exist or belongs to another user than the
+        current artifact_owner; the two are not told apart.
+    """
+    path = os.path.join(artifact_path(artifact_id), 'meta.json')
+    try:
+        with open(path) as f:
+            meta = json.load(f)
+    except FileNotFoundError:
+        raise ValueError(f"Artifact not found: {artifact_id}")
+
+    owner = artifact_owner()
+    if meta.get('owner') is not None and owner is not None and meta['owner'] != owner:
+        raise ValueError(f"Artifact not found: {artifact_id}")
+    _mark_used(path)
+    return meta
+
+
+def _mark_used(path):
+    # Only touched once an hour, so reads stay reads
+    try:
+        if os.stat(path).st_mtime < time.time() - 3600:
+            os.utime(path)
+    except OSError:
+        pass
+
+
+_last_prune = 0.0
+_prune_lock = threading.Lock()
+
+
+def prune_artifacts(max_age=None, min_interval=0):
+    """
+    Deletes artifacts not opened or stored for max_age seconds, and staging directories
+    of writes that did not finish. Artifacts derived from a file (e.g. columnar copies)
+    are stored again when next needed.
+
+    Args:
+        max_age (float): Defaults to settings.ARTIFACT_TTL (seven days).
+        min_interval (float): Skip pruning if this process pruned less than this many
+            seconds ago.
+
+    Returns:
+        int: Number of artifacts deleted.
+    """
+    global _last_prune
+    with _prune_lock:
+        now = time.time()
+        if now - _last_prune < min_interval:
+            return 0
+        _last_prune = now
+
+    max_age = getattr(settings, 'ARTIFACT_TTL', 7 * 86400) if max_age is None else max_age
+    root = artifact_root()
+    try:
+        entries = os.listdir(root)
+    except FileNotFoundError:
+        return 0
+
+    deleted = 0
+    for name in entries:
+        directory = os.path.join(root, name)
+        if '.tmp-' in name:
+            path = directory
+        elif re.fullmatch(r'[0-9a-f]{32}', name):
+            path = os.path.join(directory, 'meta.json')
+        else:
+            continue
+        try:
+            expired = os.stat(path).st_mtime < now - max_age
+        except FileNotFoundError:
+            continue
+        if expired:
+            shutil.rmtree(directory, ignore_errors=True)
+            deleted += '.tmp-' not in name
+    return deleted
+
+
+def artifact_handle(artifact_id, meta):
+    return {
+        'artifact_id': artifact_id,
+        'kind': meta['kind'],
+        'shape': meta['shape'],
+        'columns': meta['names'],
+        'dtypes': meta['dtypes'],
+        'fingerprint': meta.get('fingerprint') or {'nan_free': None, 'hash': None},
+    }
+
+
+def delete_artifact(artifact_id):
+    shutil.rmtree(artifact_path(artifact_id), ignore_errors=True)
+
+
+def _json_name(name):
+    if isinstance(name, np.generic):
+        return name.item()
+    return name if name is None or isinstance(name, (str, int, float, bool)) else str(name)
+
+
+def _write_column(directory, name, series):
+    dtype = series.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        np.save(os.path.join(directory, f"{name}.npy"), series.cat.codes.to_numpy())
+        return {'file': f"{name}.npy", 'format': 'categorical',
+                'categories': series.cat.categories.tolist(), 'ordered': bool(dtype.ordered)}
+    if isinstance(dtype, np.dtype) and dtype.kind in 'biufcmM':
+        np.save(os.path.join(directory, f"{name}.npy"), series.to_numpy())
+        return {'file': f"{name}.npy", 'format': 'npy'}
+
+    strings = _arrow_strings(series)
+    if strings is not None:
+        # An uncompressed Arrow IPC (Feather) file, memory-mapped when opened
+        import pyarrow
+        table = pyarrow.table({'values': strings})
+        with pyarrow.OSFile(os.path.join(directory, f"{name}.arrow"), 'wb') as sink:
+            with pyarrow.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        return {'file': f"{name}.arrow", 'format': 'arrow', 'dtype': str(dtype)}
+
+    values = series.astype(object).where(series.notna(), None).tolist()
+    with open(os.path.join(directory, f"{name}.json"), 'w') as f:
+        json.dump(values, f, default=str)
+    return {'file': f"{name}.json", 'format': 'json', 'dtype': str(dtype)}
+
+
+def _arrow_strings(series):
+    """
+    The values of a string or object column as an Arrow string array, or None when
+    pyarrow is not installed or the column holds values other than strings.
+    """
+    try:
+        import pyarrow
+    except ImportError:
+        return None
+    try:
+        array = pyarrow.array(series, from_pandas=True)
+    except (pyarrow.ArrowException, TypeError, ValueError):
+        return None
+    if not (pyarrow.types.is_string(array.type) or pyarrow.types.is_large_string(array.type)):
+        return None
+    return array
+
+
+def _read_column(directory, column):
+    path = os.path.join(directory, column['file'])
+    if column['format'] == 'npy':
+        return np.load(path, mmap_mode='r')
+    if column['format'] == 'categorical':
+        codes = np.load(path, mmap_mode='r')
+        return pd.Categorical.from_codes(codes, categories=column['categories'], ordered=column['ordered'])
+    if column['format'] == 'arrow':
+        import pyarrow
+        values = pyarrow.ipc.open_file(pyarrow.memory_map(path)).read_all().column(0).to_pandas()
+        # Object columns of strings are kept Arrow-backed, as pandas reads them anyway
+        if column['dtype'] not in ('object', str(values.dtype)):
+            values = values.astype(column['dtype'])
+        return values.array
+    with open(path) as f:
+        values = json.load(f)
+    try:
+        return pd.array(values, dtype=column['dtype'])
+    except (TypeError, ValueError):
+        return pd.array(values, dtype=object)
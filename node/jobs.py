@@ -0,0 +1,285 @@
+import json
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from node.artifacts import artifacts_owned_by
+from utils.outputs import serialize_outputs
+
+QUEUED = 'queued'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+
+
+def execute_node_job(payload):
+    """Runs a node's execute method; payload is {'node_type': str, 'payload': dict}."""
+    from node.models import BaseNode
+
+    node_classes = {cls.__name__: cls for cls in BaseNode.__subclasses__()}
+    node_class = node_classes.get(payload['node_type'])
+    if node_class is None:
+        raise ValueError(f"Unknown node type: {payload['node_type']}")
+    return serialize_outputs(node_class.execute(payload['payload']))
+
+
+def run_workspace_job(payload):
+    """Runs a workspace graph; payload is {'workspace_id', 'use_cache', 'max_workers', 'sample'}."""
+    from project.models import Workspace
+    from project.services.executor import run_workspace
+
+    workspace = Workspace.objects.get(pk=payload['workspace_id'])
+    return run_workspace(
+        workspace,
+        use_cache=payload.get('use_cache', True),
+        max_workers=payload.get('max_workers'),
+        sample=payload.get('sample'),
+    )
+
+
+JOB_HANDLERS = {
+    'node.execute': execute_node_job,
+    'workspace.run': run_workspace_job,
+}
+
+
+def new_job(kind, payload, user_id):
+    if kind not in JOB_HANDLERS:
+        raise ValueError(f"Unknown job kind: {kind}")
+    return {
+        'id': uuid.uuid4().hex,
+        'kind': kind,
+        'status': QUEUED,
+        'user_id': user_id,
+        'payload': payload,
+        'result': None,
+        'error': None,
+        'created_at': timezone.now().isoformat(),
+        'started_at': None,
+        'finished_at': None,
+    }
+
+
+def run_job(job):
+    """
+    Executes a job in place, recording its status, result or error and timestamps. The
+    job stores and opens artifacts as the user who submitted it.
+    """
+    job['status'] = RUNNING
+    job['started_at'] = timezone.now().isoformat()
+    try:
+        with artifacts_owned_by(job['user_id']):
+            job['result'] = JOB_HANDLERS[job['kind']](job['payload'])
+        job['status'] = SUCCEEDED
+    except Exception as e:
+        job['error'] = str(e) or traceback.format_exc(limit=1)
+        job['status'] = FAILED
+    finally:
+        job['finished_at'] = timezone.now().isoformat()
+    return job
+
+
+class DatabaseJobQueue:
+    """
+    Job queue stored in the database (node.models.Job), used when no Redis is configured.
+
+    Every web process runs jobs on a small thread pool outside the request thread, and
+    any process can report their status, so it works with several gunicorn workers.
+    Queued jobs are claimed atomically; jobs left queued by a process that stopped are
+    picked up by the next job run anywhere, or by `manage.py run_jobs`. With workers=0
+    jobs are only run by `manage.py run_jobs`.
+    """
+
+    def __init__(self, workers=2, result_ttl=86400, timeout=6 * 3600):
+        self.result_ttl = result_ttl
+        self.timeout = timeout
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='job') if workers else None
+
+    def submit(self, job):
+        from node.models import Job
+
+        self.prune()
+        Job.objects.create(
+            id=job['id'], kind=job['kind'], status=QUEUED, user_id=job['user_id'],
+            payload=job['payload'], created_at=parse_datetime(job['created_at']),
+        )
+        if self._pool is not None:
+            self._pool.submit(self._drain)
+        return job
+
+    def _drain(self):
+        try:
+            while self.work_once(timeout=0) is not None:
+                pass
+        finally:
+            connection.close()
+
+    def get(self, job_id):
+        from node.models import Job
+
+        row = Job.objects.filter(pk=job_id).first()
+        return job_record(row) if row is not None else None
+
+    def work_once(self, timeout=5):
+        """
+        Claims the oldest queued job and runs it, waiting up to timeout seconds for one.
+        Returns the job, or None if there was none.
+        """
+        from node.models import Job
+
+        deadline = time.monotonic() + timeout
+        while True:
+            for job_id in Job.objects.filter(status=QUEUED).order_by('created_at').values_list('id', flat=True)[:10]:
+                # Claimed by whichever process flips it from queued first
+                if Job.objects.filter(pk=job_id, status=QUEUED).update(status=RUNNING, started_at=timezone.now()):
+                    job = run_job(job_record(Job.objects.get(pk=job_id)))
+                    Job.objects.filter(pk=job_id).update(
+                        status=job['status'], result=job['result'], error=job['error'],
+                        finished_at=parse_datetime(job['finished_at']),
+                    )
+                    return job
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(min(1.0, max(deadline - time.monotonic(), 0)))
+
+    def prune(self):
+        """
+        Deletes finished jobs older than result_ttl seconds and fails jobs running for
+        longer than timeout seconds, whose process has stopped.
+        """
+        from node.models import Job
+
+        now = timezone.now()
+        Job.objects.filter(
+            status__in=[SUCCEEDED, FAILED], finished_at__lt=now - timedelta(seconds=self.result_ttl)
+        ).delete()
+        Job.objects.filter(status=RUNNING, started_at__lt=now - timedelta(seconds=self.timeout)).update(
+            status=FAILED, error="The job did not finish; its worker stopped.", finished_at=now,
+        )
+
+
+def job_record(row):
+    """Job record (as run by run_job) of a node.models.Job row."""
+    return {
+        'id': row.id,
+        'kind': row.kind,
+        'status': row.status,
+        'user_id': row.user_id,
+        'payload': row.payload,
+        'result': row.result,
+        'error': row.error,
+        'created_at': row.created_at.isoformat(),
+        'started_at': row.started_at.isoformat() if row.started_at else None,
+        'finished_at': row.finished_at.isoformat() if row.finished_at else None,
+    }
+
+
+class RedisJobQueue:
+    """
+    Redis-backed job queue using the django-redis connection. Jobs are stored as JSON
+    under job:<id> and their IDs pushed to a list that `manage.py run_jobs` workers consume.
+    """
+
+    queue_key = 'jobs:queue'
+
+    def __init__(self, result_ttl=86400):
+        from django_redis import get_redis_connection
+
+        self.result_ttl = result_ttl
+        self.redis = get_redis_connection('default')
+
+    def _job_key(self, job_id):
+        return f"job:{job_id}"
+
+    def _save(self, job):
+        self.redis.set(self._job_key(job['id']), json.dumps(job), ex=self.result_ttl)
+
+    def submit(self, job):
+        self._save(job)
+        self.redis.rpush(self.queue_key, job['id'])
+        return job
+
+    def get(self, job_id):
+        data = self.redis.get(self._job_key(job_id))
+        return json.loads(data) if data is not None else None
+
+    def work_once(self, timeout=5):
+        """
+        Pops one job from the queue and runs it. Returns the job, or None on timeout.
+        """
+        item = self.redis.blpop([self.queue_key], timeout=timeout)
+        if item is None:
+            return None
+        job = self.get(item[1].decode() if isinstance(item[1], bytes) else item[1])
+        if job is None:
+            return None
+        job['status'] = RUNNING
+        self._save(job)
+        run_job(job)
+        self._save(job)
+        return job
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_job_queue():
+    """Returns the job queue configured by settings.JOB_QUEUE."""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            config = getattr(settings, 'JOB_QUEUE', {})
+            backend = config.get('BACKEND', 'database')
+            if backend == 'redis':
+                if not getattr(settings, 'REDIS_URL', None):
+                    raise ImproperlyConfigured("JOB_QUEUE_BACKEND=redis requires REDIS_URL to be set.")
+                _queue = RedisJobQueue(result_ttl=config.get('RESULT_TTL', 86400))
+            elif backend in ('database', 'local'):
+                _queue = DatabaseJobQueue(
+                    workers=config.get('WORKERS', 2),
+                    result_ttl=config.get('RESULT_TTL', 86400),
+                    timeout=config.get('TIMEOUT', 6 * 3600),
+                )
+            else:
+                raise ImproperlyConfigured(f"Unknown JOB_QUEUE backend: {backend}")
+        return _queue
+
+
+def submit_job(kind, payload, user):
+    """
+    Queues a job and returns its record.
+
+    Args:
+        kind (str): One of JOB_HANDLERS.
+        payload (dict): JSON-serializable job arguments.
+        user: User submitting the job; only they can read its status.
+
+    Returns:
+        dict: The job record, including its 'id'.
+    """
+    job = new_job(kind, payload, user.id)
+    get_job_queue().submit(job)
+    return job_status(job)
+
+
+def get_job(job_id, user):
+    """Returns the status record of a job submitted by user, or None."""
+    job = get_job_queue().get(job_id)
+    if job is None or job['user_id'] != user.id:
+        return None
+    return job_status(job)
+
+
+def job_status(job):
+    """Public view of a job record, without its payload and owner."""
+    return {key: value for key, value in job.items() if key not in ('payload', 'user_id')}
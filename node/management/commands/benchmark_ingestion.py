@@ -0,0 +1,153 @@
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from django.core.management.base import BaseCommand, CommandError
+
+from node.services.input.dataset import CSV_ENGINES, csv_engine, read_csv_file
+
+FLOAT_COLUMNS = [f"x{i}" for i in range(6)]
+INT_COLUMNS = ["count", "year"]
+CATEGORIES = ["north", "south", "east", "west", "central", "coastal", "mountain", "island"]
+
+# dtype hints matching the synthetic data
+DTYPE_HINTS = {
+    "id": "int64",
+    **{column: "float64" for column in FLOAT_COLUMNS},
+    "count": "int32",
+    "year": "int16",
+    "region": "category",
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks CSV ingestion engines on synthetic datasets, reporting rows/sec and "
+        "peak RSS per engine, with and without dtype hints, and the engine that parsed the file."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows', type=int, nargs='+', default=[10_000, 100_000, 1_000_000, 10_000_000],
+            help="Dataset sizes to benchmark.",
+        )
+        parser.add_argument(
+            '--engines', nargs='+', choices=CSV_ENGINES,
+            help="Engines to benchmark. Defaults to every installed engine.",
+        )
+        parser.add_argument('--repeat', type=int, default=1, help="Runs per measurement; the fastest is reported.")
+        parser.add_argument(
+            '--dir', help="Directory for the synthetic CSV files, which are reused across runs. "
+                          "Defaults to a temporary directory.",
+        )
+
+    def handle(self, *args, **options):
+        engines = options['engines'] or available_engines()
+        for engine in engines:
+            try:
+                csv_engine(engine)
+            except ValueError as e:
+                raise CommandError(str(e))
+
+        directory = options['dir'] or tempfile.mkdtemp(prefix='ingestion-benchmark-')
+        os.makedirs(directory, exist_ok=True)
+
+        self.stdout.write(f"{'rows':>10}  {'engine':<8} {'used':<8} {'dtypes':<8} {'seconds':>8} {'rows/sec':>12} "
+                          f"{'peak RSS MB':>12} {'added MB':>9}")
+        for n_rows in options['rows']:
+            file_path = synthetic_csv(directory, n_rows)
+            for engine in engines:
+                for hinted in (False, True):
+                    runs = [measure(file_path, engine, DTYPE_HINTS if hinted else None)
+                            for _ in range(options['repeat'])]
+                    best = min(runs, key=lambda run: run['seconds'])
+                    self.stdout.write(
+                        f"{n_rows:>10}  {engine:<8} {best['engine']:<8} {'hinted' if hinted else 'inferred':<8} "
+                        f"{best['seconds']:>8.3f} {n_rows / best['seconds']:>12,.0f} "
+                        f"{best['peak_rss_mb']:>12.1f} {best['added_mb']:>9.1f}"
+                    )
+
+
+def available_engines():
+    engines = []
+    for engine in CSV_ENGINES:
+        try:
+            engines.append(csv_engine(engine))
+        except ValueError:
+            pass
+    return engines
+
+
+def synthetic_csv(directory, n_rows, chunksize=1_000_000, seed=0):
+    """
+    Writes a synthetic CSV with an id, float, integer and categorical columns, in chunks
+    so generating large files needs little memory. Existing files are reused.
+    """
+    file_path = os.path.join(directory, f"synthetic-{n_rows}.csv")
+    if os.path.exists(file_path):
+        return file_path
+
+    rng = np.random.default_rng(seed)
+    staging = f"{file_path}.tmp"
+    for start in range(0, n_rows, chunksize):
+        size = min(chunksize, n_rows - start)
+        chunk = pd.DataFrame({
+            "id": np.arange(start, start + size),
+            **{column: rng.normal(size=size).round(6) for column in FLOAT_COLUMNS},
+            "count": rng.integers(0, 1000, size=size),
+            "year": rng.integers(1990, 2025, size=size),
+            "region": rng.choice(CATEGORIES, size=size),
+        })
+        chunk.to_csv(staging, mode="a", header=start == 0, index=False)
+    os.replace(staging, file_path)
+    return file_path
+
+
+def measure(file_path, engine, dtypes):
+    """
+    Loads file_path in a fresh child process so every measurement has its own peak RSS.
+
+    Returns:
+        dict: {'seconds', 'engine', 'peak_rss_mb', 'added_mb'} where engine is the one that
+        parsed the file and added_mb is the peak RSS above the child's RSS before loading.
+    """
+    context = multiprocessing.get_context('fork')
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_load, args=(sender, file_path, engine, dtypes))
+    process.start()
+    sender.close()
+    result = receiver.recv()
+    process.join()
+    if 'error' in result:
+        raise CommandError(f"{engine} failed on {file_path}: {result['error']}")
+    return result
+
+
+def _load(sender, file_path, engine, dtypes):
+    try:
+        baseline = _current_rss_mb()
+        started = time.perf_counter()
+        df = read_csv_file(file_path, dtypes=dtypes, engine=engine)
+        seconds = time.perf_counter() - started
+        # ru_maxrss is in kilobytes on Linux
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        sender.send({
+            'seconds': seconds,
+            'rows': len(df),
+            'engine': df.attrs.get('csv_engine', engine),
+            'peak_rss_mb': peak,
+            'added_mb': peak - baseline,
+        })
+    except Exception as e:
+        sender.send({'error': str(e)})
+    finally:
+        sender.close()
+
+
+def _current_rss_mb():
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 ** 2
@@ -0,0 +1,157 @@
+import multiprocessing
+import os
+import resource
+import time
+
+import numpy as np
+import pandas as pd
+from django.core.management.base import BaseCommand, CommandError
+from scipy import sparse
+
+from node.services.model.linear_regression import SOLVERS, linear_regression
+from node.services.sparse import contains_nan
+
+# Solver every other one is compared with
+REFERENCE_SOLVER = 'lstsq'
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks the LinearRegression solvers on synthetic data of several shapes, reporting "
+        "fit time, peak RSS and the coefficient error relative to scikit-learn's lstsq solver."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--shapes', nargs='+', default=['10000x10', '100000x10', '1000000x10', '100000x100', '10000x1000'],
+            help="Data shapes as ROWSxFEATURES.",
+        )
+        parser.add_argument(
+            '--solvers', nargs='+', choices=SOLVERS,
+            help="Solvers to benchmark. Defaults to all of them.",
+        )
+        parser.add_argument(
+            '--density', type=float,
+            help="Benchmark sparse CSR features with this fraction of non-zero values "
+                 "(only the solvers that accept sparse features are run).",
+        )
+        parser.add_argument('--targets', type=int, default=1, help="Number of target columns.")
+        parser.add_argument('--repeat', type=int, default=1, help="Runs per measurement; the fastest is reported.")
+
+    def handle(self, *args, **options):
+        try:
+            shapes = [parse_shape(shape) for shape in options['shapes']]
+        except ValueError as e:
+            raise CommandError(str(e))
+        solvers = options['solvers'] or list(SOLVERS)
+        if options['density'] is not None:
+            solvers = [solver for solver in solvers if solver not in ('cholesky', 'qr')]
+        if REFERENCE_SOLVER not in solvers:
+            solvers = [REFERENCE_SOLVER] + solvers
+
+        self.stdout.write(f"{'rows':>10} {'features':>8}  {'solver':<8} {'used':<8} {'seconds':>8} "
+                          f"{'peak RSS MB':>12} {'added MB':>9} {'coef error':>11}")
+        for n_rows, n_features in shapes:
+            X, y = synthetic_problem(n_rows, n_features, options['targets'], options['density'])
+            # Validated once here, so the forked fits time the solvers rather than the NaN scans
+            contains_nan(X), contains_nan(y)
+            reference = None
+            for solver in sorted(solvers, key=lambda name: name != REFERENCE_SOLVER):
+                runs = [measure(X, y, solver) for _ in range(options['repeat'])]
+                best = min(runs, key=lambda run: run['seconds'])
+                if reference is None:
+                    reference = best['coef']
+                error = np.linalg.norm(best['coef'] - reference) / max(np.linalg.norm(reference), np.finfo(float).tiny)
+                self.stdout.write(
+                    f"{n_rows:>10} {n_features:>8}  {solver:<8} {best['solver']:<8} {best['seconds']:>8.3f} "
+                    f"{best['peak_rss_mb']:>12.1f} {best['added_mb']:>9.1f} {error:>11.1e}"
+                )
+
+
+def parse_shape(shape):
+    try:
+        n_rows, n_features = (int(size) for size in shape.lower().split('x'))
+    except ValueError:
+        raise ValueError(f"Invalid shape '{shape}'; use ROWSxFEATURES, e.g. 100000x10.")
+    if n_rows < 1 or n_features < 1:
+        raise ValueError(f"Invalid shape '{shape}'; sizes must be positive.")
+    return n_rows, n_features
+
+
+def synthetic_problem(n_rows, n_features, n_targets=1, density=None, seed=0):
+    """
+    Builds features with uneven scales and offsets, and targets that are a noisy linear
+    function of them. Sparse features (when density is given) are neither offset nor scaled.
+
+    Returns:
+        tuple: (X, y) with X a DataFrame or CSR matrix and y a Series or a DataFrame of n_targets columns.
+    """
+    rng = np.random.default_rng(seed)
+    if density is None:
+        values = rng.normal(size=(n_rows, n_features))
+        values *= rng.uniform(0.1, 10, n_features)
+        values += rng.uniform(-100, 100, n_features)
+        X = pd.DataFrame(values, columns=[f"x{i}" for i in range(n_features)], copy=False)
+    else:
+        # Built directly: sparse.random samples positions among all n_rows * n_features cells
+        per_row = max(1, round(density * n_features))
+        X = sparse.csr_matrix(
+            (rng.normal(size=n_rows * per_row), rng.integers(0, n_features, n_rows * per_row),
+             np.arange(0, n_rows * per_row + 1, per_row)),
+            shape=(n_rows, n_features),
+        )
+        X.sum_duplicates()
+
+    coef = rng.normal(size=(n_features, n_targets))
+    Y = X @ coef + 1.0 + rng.normal(scale=0.1, size=(n_rows, n_targets))
+    Y = np.asarray(Y)
+    if n_targets == 1:
+        return X, pd.Series(Y[:, 0], name='y')
+    return X, pd.DataFrame(Y, columns=[f"y{i}" for i in range(n_targets)])
+
+
+def measure(X, y, solver):
+    """
+    Fits in a forked child process so every measurement has its own peak RSS; the data
+    is shared with the child rather than copied.
+
+    Returns:
+        dict: {'seconds', 'solver', 'coef', 'peak_rss_mb', 'added_mb'} where solver is the one
+        actually used and added_mb is the peak RSS above the child's RSS before fitting.
+    """
+    context = multiprocessing.get_context('fork')
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_fit, args=(sender, X, y, solver))
+    process.start()
+    sender.close()
+    result = receiver.recv()
+    process.join()
+    if 'error' in result:
+        raise CommandError(f"{solver} failed on {X.shape[0]}x{X.shape[1]}: {result['error']}")
+    return result
+
+
+def _fit(sender, X, y, solver):
+    try:
+        baseline = _current_rss_mb()
+        started = time.perf_counter()
+        model = linear_regression(X, y, solver=solver)
+        seconds = time.perf_counter() - started
+        # ru_maxrss is in kilobytes on Linux
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        sender.send({
+            'seconds': seconds,
+            'solver': model.solver_,
+            'coef': np.asarray(model.coef_),
+            'peak_rss_mb': peak,
+            'added_mb': peak - baseline,
+        })
+    except Exception as e:
+        sender.send({'error': str(e)})
+    finally:
+        sender.close()
+
+
+def _current_rss_mb():
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 ** 2
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from node.artifacts import prune_artifacts
+
+
+class Command(BaseCommand):
+    help = "Deletes stored artifacts that were not used for ARTIFACT_TTL seconds."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--max-age', type=float, help="Seconds since last use; defaults to ARTIFACT_TTL.")
+
+    def handle(self, *args, **options):
+        deleted = prune_artifacts(max_age=options['max_age'])
+        self.stdout.write(f"Deleted {deleted} artifacts.")
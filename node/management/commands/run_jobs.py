@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from node.jobs import get_job_queue
+
+
+class Command(BaseCommand):
+    help = "Runs queued node and workspace jobs from the Redis or database job queue."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help="Exit after the queue is empty.")
+        parser.add_argument('--timeout', type=int, default=5, help="Seconds to wait for a job.")
+
+    def handle(self, *args, **options):
+        queue = get_job_queue()
+
+        self.stdout.write("Waiting for jobs...")
+        while True:
+            close_old_connections()
+            job = queue.work_once(timeout=options['timeout'])
+            if job is None:
+                if options['once']:
+                    break
+                continue
+            self.stdout.write(f"{job['id']} {job['kind']} {job['status']}")
@@ -0,0 +1,24 @@
+from node.artifacts import artifacts_owned_by
+
+
+class ArtifactOwnerMiddleware:
+    """
+    Stores the artifacts of a request for its user and lets it open only theirs.
+
+    The user is read when an artifact is stored or opened rather than here, as API views
+    authenticate requests (JWT, token) after the middleware has run.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with artifacts_owned_by(lambda: _user_id(request)):
+            return self.get_response(request)
+
+
+def _user_id(request):
+    user = getattr(request, 'user', None)
+    if user is None or not user.is_authenticated:
+        return None
+    return user.id
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-18 07:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('node', '0005_alter_add2int_sum'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='traintestsplit',
+            name='random_state',
+            field=models.IntegerField(blank=True, help_text='Seed of the split; drawn on first run if empty', null=True),
+        ),
+        migrations.AddField(
+            model_name='traintestsplit',
+            name='stratify',
+            field=models.BooleanField(default=False),
+        ),
+    ]
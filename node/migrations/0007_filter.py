@@ -0,0 +1,29 @@
+# Generated by Django 5.2.7 on 2026-10-18 07:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('node', '0006_traintestsplit_random_state_traintestsplit_stratify'),
+        ('project', '0002_workspace_edges'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Filter',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('position_x', models.FloatField(default=0.0, help_text='X position in canvas')),
+                ('position_y', models.FloatField(default=0.0, help_text='Y position in canvas')),
+                ('conditions', models.TextField()),
+                ('rows', models.IntegerField()),
+                ('workspace', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='filter_nodes', to='project.workspace')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
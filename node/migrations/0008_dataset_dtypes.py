@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 07:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('node', '0007_filter'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dataset',
+            name='dtypes',
+            field=models.TextField(blank=True, default=''),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-18 07:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('node', '0008_dataset_dtypes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dataset',
+            name='profile',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='dataset',
+            name='profile_key',
+            field=models.CharField(blank=True, default='', max_length=32),
+        ),
+    ]
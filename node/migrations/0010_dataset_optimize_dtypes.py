@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 07:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('node', '0009_dataset_profile_dataset_profile_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dataset',
+            name='optimize_dtypes',
+            field=models.BooleanField(default=False, help_text='Downcast numbers and categorize strings after loading'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.7 on 2026-10-18 07:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('node', '0010_dataset_optimize_dtypes'),
+        ('project', '0002_workspace_edges'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HashEncoding',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('position_x', models.FloatField(default=0.0, help_text='X position in canvas')),
+                ('position_y', models.FloatField(default=0.0, help_text='Y position in canvas')),
+                ('columns', models.TextField(blank=True, default='')),
+                ('n_buckets', models.IntegerField(default=1048576)),
+                ('n_features', models.IntegerField()),
+                ('workspace', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='hash_encoding_nodes', to='project.workspace')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
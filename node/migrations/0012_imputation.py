@@ -0,0 +1,32 @@
+# Generated by Django 5.2.7 on 2026-10-18 07:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('node', '0011_hashencoding'),
+        ('project', '0002_workspace_edges'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Imputation',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('position_x', models.FloatField(default=0.0, help_text='X position in canvas')),
+                ('position_y', models.FloatField(default=0.0, help_text='Y position in canvas')),
+                ('strategy', models.CharField(default='mean', max_length=10)),
+                ('columns', models.TextField(blank=True, default='')),
+                ('fill_value', models.TextField(blank=True, default='')),
+                ('rows', models.IntegerField()),
+                ('missing_values', models.IntegerField(default=0)),
+                ('workspace', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='imputation_nodes', to='project.workspace')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-18 07:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('node', '0012_imputation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='featureselection',
+            name='target_columns',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.AddField(
+            model_name='linearregression',
+            name='n_targets',
+            field=models.IntegerField(default=1),
+        ),
+    ]
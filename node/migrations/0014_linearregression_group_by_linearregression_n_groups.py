@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-18 07:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('node', '0013_featureselection_target_columns_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='linearregression',
+            name='group_by',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='linearregression',
+            name='n_groups',
+            field=models.IntegerField(default=0),
+        ),
+    ]
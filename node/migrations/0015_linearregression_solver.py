@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 07:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('node', '0014_linearregression_group_by_linearregression_n_groups'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='linearregression',
+            name='solver',
+            field=models.CharField(default='auto', max_length=10),
+        ),
+    ]
@@ -0,0 +1,278 @@
+import hashlib
+import os
+import re
+import threading
+import uuid
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+from django.conf import settings
+
+from node.artifacts import artifact_owner, content_hash
+from node.services.model.grouped_regression import GroupedLinearModel
+from node.services.model.linear_regression import build_linear_model
+
+
+def registry_root():
+    return getattr(settings, 'MODEL_REGISTRY_ROOT', os.path.join(settings.MEDIA_ROOT, 'models'))
+
+
+def is_model_handle(value):
+    return isinstance(value, dict) and 'model_id' in value
+
+
+def training_data_hash(X_train, y_train, fit_intercept=True, group_by=None, solver='auto'):
+    """
+    Hashes the training data and options a model was fitted on. Data with a validation
+    fingerprint is not read again (see node.artifacts.content_hash).
+
+    Returns:
+        str: 32-character hex digest.
+    """
+    digest = hashlib.sha256()
+    digest.update(str(fit_intercept).encode())
+    if group_by:
+        digest.update(f"group_by:{group_by}".encode())
+    if solver != 'auto':
+        # Solvers may differ slightly (SGD is approximate), so each keeps its own model
+        digest.update(f"solver:{solver}".encode())
+    for value in (X_train, y_train):
+        digest.update(content_hash(value).encode())
+    return digest.hexdigest()[:32]
+
+
+def file_data_hash(file_path, feature_columns, target_column, fit_intercept=True):
+    """
+    Identifies training data streamed from a file by its path, modification time,
+    size and the columns used, without reading it.
+
+    Returns:
+        str: 32-character hex digest.
+    """
+    stat = os.stat(file_path)
+    source = [os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size,
+              list(feature_columns), target_column, bool(fit_intercept)]
+    return hashlib.sha256(str(source).encode()).hexdigest()[:32]
+
+
+def model_path(model_id):
+    match = re.fullmatch(r'(\d+)-([0-9a-f]{32})', str(model_id))
+    if not match:
+        raise ValueError(f"Invalid model id: {model_id}")
+    node_id, data_hash = match.groups()
+    return os.path.join(registry_root(), node_id, f"{data_hash}.npz")
+
+
+def save_model(node_id, model, data_hash, owner=None):
+    """
+    Stores a fitted linear model as its coefficients, intercept and feature names.
+    Grouped models are stored in the same file, with the stacked coefficients of all
+    groups next to their keys. Models the node trained earlier are superseded and
+    only the latest few are kept; see prune_models.
+
+    Args:
+        node_id (int): ID of the LinearRegression node that trained the model.
+        model (LinearRegression | GroupedLinearModel): Fitted linear model.
+        data_hash (str): training_data_hash of the data the model was fitted on.
+        owner (int): ID of the user the model belongs to (the owner of the node's
+            workspace). Other users cannot load it; see load_model.
+
+    Returns:
+        dict: Handle {'model_id', 'node_id', 'data_hash', 'feature_names'}.
+    """
+    model_id = f"{node_id}-{data_hash}"
+    path = model_path(model_id)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    feature_names = getattr(model, 'feature_names_in_', None)
+    target_names = getattr(model, 'target_names_', None)
+    arrays = {}
+    if isinstance(model, GroupedLinearModel):
+        arrays = {'group_column': np.asarray(model.group_column), 'groups': model.groups_, 'counts': model.counts_}
+    staging = f"{path}.tmp-{uuid.uuid4().hex}.npz"
+    np.savez(
+        staging,
+        coef=np.asarray(model.coef_, dtype=np.float64),
+        intercept=np.asarray(model.intercept_, dtype=np.float64),
+        fit_intercept=np.asarray(model.fit_intercept),
+        feature_names=np.asarray([] if feature_names is None else [str(name) for name in feature_names]),
+        target_names=np.asarray([] if target_names is None else [str(name) for name in target_names]),
+        owner=np.asarray(-1 if owner is None else int(owner)),
+        **arrays,
+    )
+    os.replace(staging, path)
+
+    with open(os.path.join(os.path.dirname(path), 'latest'), 'w') as f:
+        f.write(data_hash)
+    prune_models(os.path.dirname(path))
+
+    handle = model_handle(model_id, feature_names)
+    _loaded.put(model_id, (model, owner))
+    remember_model(model, handle)
+    return handle
+
+
+def prune_models(directory):
+    """
+    Deletes the oldest models of a node beyond settings.MODEL_REGISTRY_MODELS_PER_NODE.
+
+    A few superseded models are kept so handles still held by cached outputs or
+    running jobs (e.g. a Predict node downstream) stay loadable for a while.
+    """
+    keep = max(getattr(settings, 'MODEL_REGISTRY_MODELS_PER_NODE', 3), 1)
+    models = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            # Staging files of saves in progress are left alone
+            if re.fullmatch(r'[0-9a-f]{32}\.npz', entry.name):
+                try:
+                    models.append((entry.stat().st_mtime_ns, entry.path))
+                except FileNotFoundError:
+                    continue
+    models.sort(reverse=True)
+    for _, path in models[keep:]:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def load_model(handle):
+    """
+    Loads a stored model, from the in-process LRU when it was used recently.
+
+    Within a user's request or job (see node.artifacts.artifact_owner), models saved
+    for another user are not found, so their coefficients cannot be read through the
+    handle or the node ID.
+
+    Args:
+        handle (dict | str): Handle returned by save_model, its model_id, or
+            {'node_id': id} for the latest model trained by a node.
+
+    Returns:
+        LinearRegression | GroupedLinearModel: Fitted model ready for predict().
+
+    Raises:
+        ValueError: If the model does not exist or belongs to another user.
+    """
+    if isinstance(handle, dict):
+        model_id = handle.get('model_id') or latest_model_id(handle.get('node_id'))
+    else:
+        model_id = handle
+
+    entry = _loaded.get(model_id)
+    if entry is None:
+        entry = read_model(model_id)
+        _loaded.put(model_id, entry)
+    model, owner = entry
+
+    user = artifact_owner()
+    if owner is not None and user is not None and owner != user:
+        raise ValueError(f"Model not found: {model_id}")
+    remember_model(model, model_handle(model_id, getattr(model, 'feature_names_in_', None)))
+    return model
+
+
+def read_model(model_id):
+    """
+    Reads a stored model from its file.
+
+    Returns:
+        tuple: (model, ID of its owner or None)
+    """
+    try:
+        with np.load(model_path(model_id), allow_pickle=False) as stored:
+            # Models stored before target names were kept have no such array
+            target_names = stored['target_names'].tolist() if 'target_names' in stored else None
+            if 'groups' in stored:
+                model = GroupedLinearModel(
+                    str(stored['group_column']),
+                    stored['groups'],
+                    stored['coef'],
+                    stored['intercept'],
+                    stored['counts'],
+                    fit_intercept=bool(stored['fit_intercept']),
+                    feature_names=stored['feature_names'].tolist(),
+                    target_names=target_names,
+                )
+            else:
+                model = build_linear_model(
+                    stored['coef'],
+                    stored['intercept'],
+                    fit_intercept=bool(stored['fit_intercept']),
+                    feature_names=stored['feature_names'].tolist(),
+                    target_names=target_names,
+                )
+            # Models stored before owners were recorded belong to no one
+            owner = int(stored['owner']) if 'owner' in stored else -1
+    except FileNotFoundError:
+        raise ValueError(f"Model not found: {model_id}")
+    return model, None if owner < 0 else owner
+
+
+def latest_model_id(node_id):
+    try:
+        with open(os.path.join(registry_root(), str(int(node_id)), 'latest')) as f:
+            return f"{int(node_id)}-{f.read().strip()}"
+    except (TypeError, ValueError, FileNotFoundError):
+        raise ValueError(f"No trained model found for node id={node_id}")
+
+
+def model_handle(model_id, feature_names):
+    node_id, data_hash = model_id.split('-')
+    return {
+        'model_id': model_id,
+        'node_id': int(node_id),
+        'data_hash': data_hash,
+        'feature_names': [] if feature_names is None else [str(name) for name in feature_names],
+    }
+
+
+class LoadedModels:
+    """Small LRU of models loaded from the registry, with the IDs of their owners."""
+
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self._models = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, model_id):
+        with self._lock:
+            entry = self._models.get(model_id)
+            if entry is not None:
+                self._models.move_to_end(model_id)
+            return entry
+
+    def put(self, model_id, entry):
+        with self._lock:
+            self._models[model_id] = entry
+            self._models.move_to_end(model_id)
+            while len(self._models) > self.max_entries:
+                self._models.popitem(last=False)
+
+
+_loaded = LoadedModels(max_entries=getattr(settings, 'MODEL_REGISTRY_CACHE_SIZE', 64))
+
+_known_models = {}
+_known_lock = threading.RLock()
+
+
+def remember_model(model, handle):
+    """Records the registry handle of an in-memory model so responses can return it."""
+    key = id(model)
+
+    def forget(_):
+        with _known_lock:
+            _known_models.pop(key, None)
+
+    with _known_lock:
+        _known_models[key] = (weakref.ref(model, forget), handle)
+
+
+def known_model(model):
+    with _known_lock:
+        entry = _known_models.get(id(model))
+    if entry is not None and entry[0]() is model:
+        return entry[1]
+    return None
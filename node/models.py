@@ -1,5 +1,8 @@
+from django.conf import settings
 from django.db import models
 
+from node.artifacts import is_artifact_handle, materialize, open_artifact
+
 class BaseNode(models.Model):
     """
     Abstract base model for all nodes.
@@ -13,9 +16,81 @@ class BaseNode(models.Model):
     def execute(payload):
         raise NotImplementedError("Subclasses must override the execute method.")
 
+    @classmethod
+    def extract_params(cls, payload):
+        """
+        Extracts the node inputs from a payload.
+
+        Keys are expected as I_<NodeType>_<param> (e.g. I_LinearRegression_X_train),
+        which keeps parameter names containing underscores intact. Other I_ keys
+        fall back to their last underscore-separated token.
+
+        Artifact handles returned by earlier executions (e.g. {"artifact_id": ...})
+        are opened and passed to the node as DataFrames or Series, and row views (e.g.
+        the outputs of a split) as the rows they select.
+        """
+        prefix = f"I_{cls.__name__}_"
+        params = {}
+        for key, value in payload.items():
+            if is_artifact_handle(value):
+                value = open_artifact(value)
+            value = materialize(value)
+            if key.startswith(prefix):
+                params[key[len(prefix):]] = value
+            elif key.startswith("I_"):
+                params.setdefault(key.split("_")[-1], value)
+        return params
+
+    def get_inputs(self):
+        """
+        Returns the inputs stored on this node, used when the node is run as part
+        of a workspace graph. Inputs wired through edges take precedence.
+        """
+        return {}
+
+    # Outputs holding a table that can be loaded with only the columns and rows used downstream
+    table_outputs = ()
+
+    def get_required_columns(self, input_name, output_columns=None):
+        """
+        Returns the columns this node reads from the table wired into input_name,
+        or None if it may use any of them. output_columns are the columns read from
+        this node's own table_outputs, for nodes that pass a table through.
+        """
+        return None
+
+    def get_row_filter(self, input_name):
+        """
+        Returns the conditions rows of the table wired into input_name must satisfy
+        to be used by this node (see node.services.preprocessing.filter), or None.
+        """
+        return None
+
     class Meta:
         abstract = True
 
+
+class Job(models.Model):
+    """
+    Record of an asynchronously executed node or workspace run (see node.jobs), stored in
+    the database so every web and worker process can run it and report its status.
+    """
+    STATUSES = ['queued', 'running', 'succeeded', 'failed']
+
+    id = models.CharField(primary_key=True, max_length=32)
+    kind = models.CharField(max_length=50)
+    status = models.CharField(max_length=10, choices=[(s, s) for s in STATUSES], default='queued')
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='jobs')
+    payload = models.JSONField(default=dict)
+    result = models.JSONField(blank=True, null=True)
+    error = models.TextField(blank=True, null=True)
+    created_at = models.DateTimeField()
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['status', 'created_at'])]
+
 from .modules.arithmetic.add2int import Add2Int
 from .modules.input.integer import Integer
 from .modules.input.dataset import Dataset
@@ -24,4 +99,7 @@ from .modules.evaluation.accuracy import Accuracy
 from .modules.evaluation.predict import Predict
 from .modules.model.linear_regression import LinearRegression
 from .modules.preprocessing.feature_selection import FeatureSelection
-from .modules.preprocessing.train_test_split import TrainTestSplit
\ No newline at end of file
+from .modules.preprocessing.train_test_split import TrainTestSplit
+from .modules.preprocessing.filter import Filter
+from .modules.preprocessing.hash_encoding import HashEncoding
+from .modules.preprocessing.imputation import Imputation
@@ -1,5 +1,6 @@
 from django.db import models
 from node.models import BaseNode
+import pandas as pd
 
 from node.services.evaluation.accuracy import accuracy_metric
 
@@ -12,15 +13,14 @@ class Accuracy(BaseNode):
     metric_type = models.CharField(max_length=10)
     metric_value = models.FloatField()
 
+    def get_inputs(self):
+        return {'metric_type': self.metric_type}
+
     @staticmethod
     def execute(payload):
         # Extract metadata and parameters
         metadata = payload.get("metadata", {})
-        params = {
-            key.split("_")[-1]: value
-            for key, value in payload.items()
-            if key.startswith("I_")
-        }
+        params = Accuracy.extract_params(payload)
 
         # Calculate the accuracy metric
         result = accuracy_metric(
@@ -28,6 +28,11 @@ class Accuracy(BaseNode):
             y_pred=params.get('y_pred'),
             metric_type=params.get('metric_type', 'r2')
         )
+        metric_values = None
+        if isinstance(result, pd.Series):
+            # Multi-target: store the average, return every target's value
+            metric_values = {target: float(value) for target, value in result.items()}
+            result = float(result.mean())
 
         # Check if we're updating or creating
         instance_id = metadata.get("id")
@@ -56,5 +61,7 @@ class Accuracy(BaseNode):
             field.name: getattr(accuracy_instance, field.name)
             for field in accuracy_instance._meta.fields
         }
+        if metric_values is not None:
+            data['metric_values'] = metric_values
 
         return data
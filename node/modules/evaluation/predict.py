@@ -3,6 +3,7 @@ from node.models import BaseNode
 import pandas as pd
 
 from node.services.evaluation.predict import predict as make_prediction
+from node.model_registry import load_model
 
 class Predict(BaseNode):
     workspace = models.ForeignKey(
@@ -17,15 +18,16 @@ class Predict(BaseNode):
     def execute(payload):
         # Extract metadata and parameters
         metadata = payload.get("metadata", {})
-        params = {
-            key.split("_")[-1]: value
-            for key, value in payload.items()
-            if key.startswith("I_")
-        }
+        params = Predict.extract_params(payload)
+
+        # Load stored models from a handle ({"model_id": ...} or {"node_id": ...})
+        model = params.get('model')
+        if isinstance(model, dict):
+            model = load_model(model)
 
         # Make predictions
         result = make_prediction(
-            model=params.get('model'),
+            model=model,
             X=params.get('X')
         )
 
@@ -61,8 +63,8 @@ class Predict(BaseNode):
         }
 
         # Add predictions to response
-        data['predictions'] = predictions.to_dict()
+        data['predictions'] = predictions
         if prediction_probs is not None:
-            data['prediction_probs'] = prediction_probs.to_dict()
+            data['prediction_probs'] = prediction_probs
 
         return data
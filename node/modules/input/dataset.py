@@ -1,8 +1,19 @@
 from django.db import models
 from node.models import BaseNode
+import json
 import pandas as pd
 
-from node.services.input.dataset import dataset as load_dataset
+from node.artifacts import derived_hash, freeze, remember_fingerprint
+from node.services.input.sample import validate_sample
+
+from node.services.input.dataset import (
+    columnar_copy_id,
+    dataset as load_dataset,
+    dataset_columns,
+    filtered_dataset as load_filtered_dataset,
+    optimize_dtypes as optimize_dataset_dtypes,
+    sampled_dataset as load_sampled_dataset,
+)
 
 class Dataset(BaseNode):
     workspace = models.ForeignKey(
@@ -13,19 +24,55 @@ class Dataset(BaseNode):
     file_path = models.CharField(max_length=255)
     rows = models.IntegerField()
     columns = models.IntegerField()
+    dtypes = models.TextField(blank=True, default="")  # JSON {column: dtype} parsing hints
+    profile = models.JSONField(blank=True, null=True)  # Column statistics, see dataset_profile
+    profile_key = models.CharField(max_length=32, blank=True, default="")  # File version profiled
+    optimize_dtypes = models.BooleanField(default=False, help_text="Downcast numbers and categorize strings after loading")
+
+    table_outputs = ('data',)
+
+    def get_inputs(self):
+        inputs = {'file_path': self.file_path, 'optimize_dtypes': self.optimize_dtypes}
+        if self.dtypes:
+            inputs['dtypes'] = json.loads(self.dtypes)
+        return inputs
 
     @staticmethod
     def execute(payload):
         # Extract metadata and parameters
         metadata = payload.get("metadata", {})
-        params = {
-            key.split("_")[-1]: value
-            for key, value in payload.items()
-            if key.startswith("I_")
-        }
+        params = Dataset.extract_params(payload)
+
+        # Load the dataset, only keeping the columns and rows used downstream when they are known
+        usecols = params.get('usecols')
+        dtypes = params.get('dtypes') or {}
+        sample = validate_sample(params['sample']) if params.get('sample') else None
+        if params.get('filters'):
+            df, n_rows = load_filtered_dataset(
+                params.get('file_path'), params.get('filters'), usecols=usecols, dtypes=dtypes, sample=sample
+            )
+        elif sample:
+            # Preview runs work on a deterministic sample of the rows, the others are never loaded
+            df, n_rows = load_sampled_dataset(
+                params.get('file_path'), sample, usecols=usecols, dtypes=dtypes, engine=params.get('engine')
+            )
+        else:
+            df = load_dataset(params.get('file_path'), usecols=usecols, dtypes=dtypes, engine=params.get('engine'))
+            n_rows = df.shape[0]
+        n_columns = len(dataset_columns(params.get('file_path'))) if usecols is not None else df.shape[1]
+
+        # Optionally shrink the loaded data; explicit dtype hints are kept as given
+        memory = None
+        if params.get('optimize_dtypes'):
+            df, memory = optimize_dataset_dtypes(df, skip=list(dtypes))
 
-        # Load the dataset
-        df = load_dataset(params.get('file_path'))
+        # Identify the loaded table by its source file version and load options, so
+        # downstream nodes can fingerprint what they derive from it without hashing it
+        df = freeze(df)
+        remember_fingerprint(df, content_hash=derived_hash(
+            columnar_copy_id(params.get('file_path')),
+            ['dataset', usecols, dtypes, params.get('filters'), sample, bool(params.get('optimize_dtypes'))]
+        ))
 
         # Check if we're updating or creating
         instance_id = metadata.get("id")
@@ -34,22 +81,28 @@ class Dataset(BaseNode):
             try:
                 dataset_instance = Dataset.objects.get(id=instance_id)
                 dataset_instance.file_path = params.get('file_path')
-                dataset_instance.rows = df.shape[0]
-                dataset_instance.columns = df.shape[1]
+                dataset_instance.rows = n_rows
+                dataset_instance.columns = n_columns
+                dataset_instance.dtypes = json.dumps(dtypes) if dtypes else ""
+                dataset_instance.optimize_dtypes = bool(params.get('optimize_dtypes'))
                 dataset_instance.save()
             except Dataset.DoesNotExist:
                 # Fallback: if object not found, create a new one
                 dataset_instance = Dataset.objects.create(
                     file_path=params.get('file_path'),
-                    rows=df.shape[0],
-                    columns=df.shape[1]
+                    rows=n_rows,
+                    columns=n_columns,
+                    dtypes=json.dumps(dtypes) if dtypes else "",
+                    optimize_dtypes=bool(params.get('optimize_dtypes'))
                 )
         else:
             # Create new object
             dataset_instance = Dataset.objects.create(
                 file_path=params.get('file_path'),
-                rows=df.shape[0],
-                columns=df.shape[1]
+                rows=n_rows,
+                columns=n_columns,
+                dtypes=json.dumps(dtypes) if dtypes else "",
+                optimize_dtypes=bool(params.get('optimize_dtypes'))
             )
 
         # Serialize all fields dynamically
@@ -57,8 +110,13 @@ class Dataset(BaseNode):
             field.name: getattr(dataset_instance, field.name)
             for field in dataset_instance._meta.fields
         }
+        data['dtypes'] = dtypes  # Convert back to dict
+        if memory is not None:
+            data['memory'] = memory  # Bytes before and after optimize_dtypes
+        if sample:
+            data['sample'] = {**sample, 'sampled_rows': df.shape[0]}
 
         # Add the DataFrame to the response
-        data['data'] = df.to_dict(orient='records')
+        data['data'] = df
 
         return data
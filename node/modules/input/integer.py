@@ -12,16 +12,15 @@ class Integer(BaseNode):
     def __str__(self):
         return str(self.number)
 
+    def get_inputs(self):
+        return {'number': self.number}
+
     @staticmethod
     def execute(payload):
         # Extract metadata and parameters
         metadata = payload.get("metadata", {})
 
-        params = {
-            key.split("_")[-1]: value
-            for key, value in metadata.items()
-            if key.startswith("I_")
-        }
+        params = Integer.extract_params(metadata)
 
         # Extract the number parameter
         number = params.get("number")
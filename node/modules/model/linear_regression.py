@@ -1,7 +1,18 @@
 from django.db import models
 from node.models import BaseNode
+import hashlib
+import numpy as np
+import pandas as pd
 
-from node.services.model.linear_regression import linear_regression as train_linear_regression
+from node.services.model.linear_regression import (
+    SOLVERS,
+    linear_regression as train_linear_regression,
+    linear_regression_chunked as train_linear_regression_chunked,
+)
+from node.services.model.gram import cached_gram_statistics
+from node.services.model.grouped_regression import GroupedLinearModel, grouped_linear_regression
+from node.artifacts import is_rows_of_derived
+from node.model_registry import file_data_hash, save_model, training_data_hash
 
 class LinearRegression(BaseNode):
     workspace = models.ForeignKey(
@@ -11,23 +22,80 @@ class LinearRegression(BaseNode):
     )
     fit_intercept = models.BooleanField(default=True)
     n_features = models.IntegerField()
+    n_targets = models.IntegerField(default=1)
+    group_by = models.CharField(max_length=255, blank=True, default='')  # Key column; one model is fitted per value
+    n_groups = models.IntegerField(default=0)
+    solver = models.CharField(max_length=10, default='auto')  # auto, cholesky, qr, lstsq or sgd
     
+    def get_inputs(self):
+        return {'fit_intercept': self.fit_intercept, 'group_by': self.group_by, 'solver': self.solver}
+
     @staticmethod
     def execute(payload):
         # Extract metadata and parameters
         metadata = payload.get("metadata", {})
-        params = {
-            key.split("_")[-1]: value
-            for key, value in payload.items()
-            if key.startswith("I_")
-        }
+        params = LinearRegression.extract_params(payload)
 
-        # Train the model
-        model = train_linear_regression(
-            X_train=params.get('X_train'),
-            y_train=params.get('y_train'),
-            fit_intercept=params.get('fit_intercept', True)
-        )
+        # Train the model, streaming the source file in chunks when no in-memory data is given
+        group_by = params.get('group_by') or ''
+        solver = params.get('solver') or 'auto'
+        if solver not in SOLVERS:
+            raise ValueError(f"Unsupported solver '{solver}'. Use one of {list(SOLVERS)}.")
+        # Fits from cached statistics solve the normal equations, so they are only used
+        # when the solver is left to choose or is Cholesky. Streamed and grouped fits
+        # have their own solvers.
+        normal_equations = solver in ('auto', 'cholesky')
+        gram_fit = None if group_by or not normal_equations else fit_from_gram(params)
+        if group_by:
+            # One model per value of the group_by column of X_train, stored in one artifact
+            model = grouped_linear_regression(
+                X_train=params.get('X_train'),
+                y_train=params.get('y_train'),
+                group_column=group_by,
+                fit_intercept=params.get('fit_intercept', True)
+            )
+            data_hash = training_data_hash(
+                params.get('X_train'),
+                params.get('y_train'),
+                params.get('fit_intercept', True),
+                group_by=group_by
+            )
+        elif params.get('X_train') is None and params.get('file_path'):
+            model = train_linear_regression_chunked(
+                file_path=params.get('file_path'),
+                feature_columns=params.get('feature_columns'),
+                target_column=params.get('target_column'),
+                fit_intercept=params.get('fit_intercept', True),
+                chunksize=int(params.get('chunksize', 100_000))
+            )
+            data_hash = file_data_hash(
+                params.get('file_path'),
+                params.get('feature_columns'),
+                params.get('target_column'),
+                params.get('fit_intercept', True)
+            )
+        elif gram_fit is not None:
+            # Solved from cached statistics of the full dataset's training rows, so
+            # changing the selected features does not touch the rows again
+            model, data_hash = gram_fit
+        else:
+            model = train_linear_regression(
+                X_train=params.get('X_train'),
+                y_train=params.get('y_train'),
+                fit_intercept=params.get('fit_intercept', True),
+                solver=solver
+            )
+            data_hash = training_data_hash(
+                params.get('X_train'),
+                params.get('y_train'),
+                params.get('fit_intercept', True),
+                solver=solver
+            )
+        n_features = model.n_features_in_
+        grouped = isinstance(model, GroupedLinearModel)
+        n_groups = model.n_groups if grouped else 0
+        coef_ndim = model.coef_.ndim - 1 if grouped else model.coef_.ndim
+        n_targets = model.coef_.shape[-2] if coef_ndim == 2 else 1
 
         # Check if we're updating or creating
         instance_id = metadata.get("id")
@@ -36,21 +104,37 @@ class LinearRegression(BaseNode):
             try:
                 lr_instance = LinearRegression.objects.get(id=instance_id)
                 lr_instance.fit_intercept = params.get('fit_intercept', True)
-                lr_instance.n_features = params.get('X_train').shape[1]
+                lr_instance.n_features = n_features
+                lr_instance.n_targets = n_targets
+                lr_instance.group_by = group_by
+                lr_instance.n_groups = n_groups
+                lr_instance.solver = solver
                 lr_instance.save()
             except LinearRegression.DoesNotExist:
                 # Fallback: if object not found, create a new one
                 lr_instance = LinearRegression.objects.create(
                     fit_intercept=params.get('fit_intercept', True),
-                    n_features=params.get('X_train').shape[1]
+                    n_features=n_features,
+                    n_targets=n_targets,
+                    group_by=group_by,
+                    n_groups=n_groups,
+                    solver=solver
                 )
         else:
             # Create new object
             lr_instance = LinearRegression.objects.create(
                 fit_intercept=params.get('fit_intercept', True),
-                n_features=params.get('X_train').shape[1]
+                n_features=n_features,
+                n_targets=n_targets,
+                group_by=group_by,
+                n_groups=n_groups,
+                solver=solver
             )
 
+        # Store the trained model so Predict can load it by its handle, for the workspace owner only
+        owner = lr_instance.workspace.user_id if lr_instance.workspace_id else None
+        save_model(lr_instance.id, model, data_hash, owner=owner)
+
         # Serialize all fields dynamically
         data = {
             field.name: getattr(lr_instance, field.name)
@@ -58,8 +142,59 @@ class LinearRegression(BaseNode):
         }
 
         # Add model parameters to response
-        data['coefficients'] = model.coef_.tolist()
-        data['intercept'] = float(model.intercept_) if model.fit_intercept else 0.0
-        data['model'] = model  # The trained model object
+        if grouped:
+            # Returned as a table with one row per group (and target), intercepts included
+            data['coefficients'] = model.coefficients_frame()
+        elif model.coef_.ndim == 2:
+            data['coefficients'] = model.coef_.tolist()
+            # One row of coefficients and one intercept per target
+            data['intercept'] = np.ravel(model.intercept_).tolist() if model.fit_intercept else [0.0] * n_targets
+            data['targets'] = [str(name) for name in getattr(model, 'target_names_', [])]
+        else:
+            data['coefficients'] = model.coef_.tolist()
+            data['intercept'] = float(model.intercept_) if model.fit_intercept else 0.0
+        data['solver_used'] = getattr(model, 'solver_', 'normal_equations')
+        data['model'] = model  # The trained model object, returned as its registry handle
 
         return data
+
+
+def fit_from_gram(params):
+    """
+    Fits the model from the cached Gram statistics of the full dataset (the optional
+    'dataframe' input) restricted to the rows of X_train.
+
+    Only used when X_train and y_train are known to be rows of columns selected from
+    that dataframe (by FeatureSelection and TrainTestSplit, see is_rows_of_derived):
+    matching column names and index labels alone do not prove the values are the same.
+
+    Returns:
+        tuple: (model, data_hash), or None when X_train/y_train are not numeric,
+        NaN-free columns selected from the given dataframe.
+    """
+    dataframe, X_train, y_train = params.get('dataframe'), params.get('X_train'), params.get('y_train')
+    if not isinstance(dataframe, pd.DataFrame):
+        return None
+    if not isinstance(X_train, pd.DataFrame) or not isinstance(y_train, (pd.Series, pd.DataFrame)):
+        return None
+    if not X_train.index.equals(y_train.index) or not dataframe.index.is_unique:
+        return None
+    # A DataFrame of targets is solved as one multi-target model
+    target = list(y_train.columns) if isinstance(y_train, pd.DataFrame) else y_train.name
+    columns = list(X_train.columns) + (target if isinstance(target, list) else [target])
+    if any(column not in dataframe.columns for column in columns):
+        return None
+    if not (is_rows_of_derived(X_train, dataframe, ['columns', list(X_train.columns)])
+            and is_rows_of_derived(y_train, dataframe, ['column', target])):
+        return None
+
+    stats, stats_key = cached_gram_statistics(dataframe, X_train.index)
+    if not stats.covers(columns):
+        return None
+
+    fit_intercept = params.get('fit_intercept', True)
+    model = stats.solve(list(X_train.columns), target, fit_intercept=fit_intercept)
+    data_hash = hashlib.sha256(
+        str([stats_key, list(X_train.columns), target, fit_intercept]).encode()
+    ).hexdigest()[:32]
+    return model, data_hash
@@ -12,15 +12,14 @@ class Text(BaseNode):
     def __str__(self):
         return str(self.text)
 
+    def get_inputs(self):
+        return {'text': self.text} if self.text is not None else {}
+
     @staticmethod
     def execute(payload):
         # Extract metadata and parameters
         metadata = payload.get("metadata", {})
-        params = {
-            key.split("_")[-1]: value
-            for key, value in payload.items()
-            if key.startswith("I_")
-        }
+        params = Text.extract_params(payload)
 
         # Extract the text parameter
         text = params.get("text")
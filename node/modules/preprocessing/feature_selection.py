@@ -13,21 +13,35 @@ class FeatureSelection(BaseNode):
     target_column = models.CharField(max_length=255)
     n_features = models.IntegerField()
     feature_columns = models.TextField()  # JSON list of feature columns
+    target_columns = models.TextField(blank=True, default='')  # JSON list of target columns for multi-target models
+
+    def get_inputs(self):
+        return {
+            'target_column': self.target_column,
+            'target_columns': json.loads(self.target_columns) if self.target_columns else [],
+            'feature_columns': json.loads(self.feature_columns) if self.feature_columns else [],
+        }
+
+    def get_required_columns(self, input_name, output_columns=None):
+        if input_name != 'dataframe':
+            return None
+        inputs = self.get_inputs()
+        return inputs['feature_columns'] + (inputs['target_columns'] or [self.target_column])
 
     @staticmethod
     def execute(payload):
         # Extract metadata and parameters
         metadata = payload.get("metadata", {})
-        params = {
-            key.split("_")[-1]: value
-            for key, value in payload.items()
-            if key.startswith("I_")
-        }
+        params = FeatureSelection.extract_params(payload)
 
-        # Select features
+        # Select features; a list of target columns gives a multi-target y
+        target_columns = params.get('target_columns') or []
+        if not isinstance(target_columns, list):
+            raise ValueError("target_columns must be a list.")
+        target_column = target_columns[0] if target_columns else params.get('target_column')
         result = select_features(
             dataframe=params.get('dataframe'),
-            target_column=params.get('target_column'),
+            target_column=target_columns or target_column,
             feature_columns=params.get('feature_columns')
         )
 
@@ -37,21 +51,24 @@ class FeatureSelection(BaseNode):
             # Update existing object
             try:
                 fs_instance = FeatureSelection.objects.get(id=instance_id)
-                fs_instance.target_column = params.get('target_column')
+                fs_instance.target_column = target_column
+                fs_instance.target_columns = json.dumps(target_columns) if target_columns else ''
                 fs_instance.n_features = len(params.get('feature_columns'))
                 fs_instance.feature_columns = json.dumps(params.get('feature_columns'))
                 fs_instance.save()
             except FeatureSelection.DoesNotExist:
                 # Fallback: if object not found, create a new one
                 fs_instance = FeatureSelection.objects.create(
-                    target_column=params.get('target_column'),
+                    target_column=target_column,
+                    target_columns=json.dumps(target_columns) if target_columns else '',
                     n_features=len(params.get('feature_columns')),
                     feature_columns=json.dumps(params.get('feature_columns'))
                 )
         else:
             # Create new object
             fs_instance = FeatureSelection.objects.create(
-                target_column=params.get('target_column'),
+                target_column=target_column,
+                target_columns=json.dumps(target_columns) if target_columns else '',
                 n_features=len(params.get('feature_columns')),
                 feature_columns=json.dumps(params.get('feature_columns'))
             )
@@ -66,5 +83,6 @@ class FeatureSelection(BaseNode):
         data['X'] = result['X']
         data['y'] = result['y']
         data['feature_columns'] = json.loads(data['feature_columns'])  # Convert back to list
+        data['target_columns'] = target_columns
 
         return data
@@ -0,0 +1,76 @@
+from django.db import models
+from node.models import BaseNode
+import json
+
+from node.services.preprocessing.filter import condition_columns, filter_rows
+
+class Filter(BaseNode):
+    workspace = models.ForeignKey(
+        'project.Workspace',
+        on_delete=models.CASCADE,
+        related_name='filter_nodes'
+    )
+    conditions = models.TextField()  # JSON list of {"column", "op", "value"} conditions
+    rows = models.IntegerField()
+
+    table_outputs = ('data',)
+
+    def get_inputs(self):
+        return {'conditions': json.loads(self.conditions) if self.conditions else []}
+
+    def get_required_columns(self, input_name, output_columns=None):
+        if input_name != 'dataframe' or output_columns is None:
+            return None
+        return list(output_columns) + condition_columns(self.get_inputs()['conditions'])
+
+    def get_row_filter(self, input_name):
+        if input_name != 'dataframe':
+            return None
+        return self.get_inputs()['conditions'] or None
+
+    @staticmethod
+    def execute(payload):
+        # Extract metadata and parameters
+        metadata = payload.get("metadata", {})
+        params = Filter.extract_params(payload)
+
+        # Filter rows
+        conditions = params.get('conditions') or []
+        result = filter_rows(
+            dataframe=params.get('dataframe'),
+            conditions=conditions
+        )
+
+        # Check if we're updating or creating
+        instance_id = metadata.get("id")
+        if instance_id:
+            # Update existing object
+            try:
+                filter_instance = Filter.objects.get(id=instance_id)
+                filter_instance.conditions = json.dumps(conditions)
+                filter_instance.rows = result['rows']
+                filter_instance.save()
+            except Filter.DoesNotExist:
+                # Fallback: if object not found, create a new one
+                filter_instance = Filter.objects.create(
+                    conditions=json.dumps(conditions),
+                    rows=result['rows']
+                )
+        else:
+            # Create new object
+            filter_instance = Filter.objects.create(
+                conditions=json.dumps(conditions),
+                rows=result['rows']
+            )
+
+        # Serialize all fields dynamically
+        data = {
+            field.name: getattr(filter_instance, field.name)
+            for field in filter_instance._meta.fields
+        }
+
+        # Add filtered rows to response
+        data['data'] = result['data']
+        data['conditions'] = json.loads(data['conditions'])  # Convert back to list
+
+        return data
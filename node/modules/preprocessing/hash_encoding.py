@@ -0,0 +1,73 @@
+from django.db import models
+from node.models import BaseNode
+import json
+
+from node.services.preprocessing.hash_encoding import hash_encode
+
+class HashEncoding(BaseNode):
+    workspace = models.ForeignKey(
+        'project.Workspace',
+        on_delete=models.CASCADE,
+        related_name='hash_encoding_nodes'
+    )
+    columns = models.TextField(blank=True, default='')  # JSON list of hashed columns; empty hashes every non-numeric column
+    n_buckets = models.IntegerField(default=2 ** 20)
+    n_features = models.IntegerField()
+
+    def get_inputs(self):
+        return {
+            'columns': json.loads(self.columns) if self.columns else [],
+            'n_buckets': self.n_buckets,
+        }
+
+    @staticmethod
+    def execute(payload):
+        # Extract metadata and parameters
+        metadata = payload.get("metadata", {})
+        params = HashEncoding.extract_params(payload)
+
+        # Encode categorical columns into sparse hashed features
+        result = hash_encode(
+            X=params.get('X'),
+            columns=params.get('columns') or None,
+            n_buckets=params.get('n_buckets', 2 ** 20),
+            chunksize=int(params.get('chunksize', 100_000))
+        )
+
+        # Check if we're updating or creating
+        instance_id = metadata.get("id")
+        if instance_id:
+            # Update existing object
+            try:
+                encoding_instance = HashEncoding.objects.get(id=instance_id)
+                encoding_instance.columns = json.dumps(result['columns'])
+                encoding_instance.n_buckets = params.get('n_buckets', 2 ** 20)
+                encoding_instance.n_features = result['n_features']
+                encoding_instance.save()
+            except HashEncoding.DoesNotExist:
+                # Fallback: if object not found, create a new one
+                encoding_instance = HashEncoding.objects.create(
+                    columns=json.dumps(result['columns']),
+                    n_buckets=params.get('n_buckets', 2 ** 20),
+                    n_features=result['n_features']
+                )
+        else:
+            # Create new object
+            encoding_instance = HashEncoding.objects.create(
+                columns=json.dumps(result['columns']),
+                n_buckets=params.get('n_buckets', 2 ** 20),
+                n_features=result['n_features']
+            )
+
+        # Serialize all fields dynamically
+        data = {
+            field.name: getattr(encoding_instance, field.name)
+            for field in encoding_instance._meta.fields
+        }
+
+        # Add the sparse features to response
+        data['X'] = result['X']
+        data['columns'] = result['columns']
+        data['numeric_columns'] = result['numeric_columns']
+
+        return data
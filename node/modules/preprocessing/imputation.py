@@ -0,0 +1,106 @@
+from django.db import models
+from node.models import BaseNode
+import json
+
+from node.services.preprocessing.imputation import impute
+
+class Imputation(BaseNode):
+    workspace = models.ForeignKey(
+        'project.Workspace',
+        on_delete=models.CASCADE,
+        related_name='imputation_nodes'
+    )
+    strategy = models.CharField(max_length=10, default='mean')  # mean, median, constant or drop
+    columns = models.TextField(blank=True, default='')  # JSON list of handled columns; empty handles every column
+    fill_value = models.TextField(blank=True, default='')  # JSON value used by the constant strategy
+    rows = models.IntegerField()
+    missing_values = models.IntegerField(default=0)
+
+    table_outputs = ('data',)
+
+    def get_inputs(self):
+        return {
+            'strategy': self.strategy,
+            'columns': json.loads(self.columns) if self.columns else [],
+            'fill_value': json.loads(self.fill_value) if self.fill_value else None,
+        }
+
+    def get_required_columns(self, input_name, output_columns=None):
+        if input_name != 'dataframe' or output_columns is None:
+            return None
+        columns = self.get_inputs()['columns']
+        if not columns:
+            # Every column is handled, and rows may be dropped for a value missing in any of them
+            return None if self.strategy == 'drop' else list(output_columns)
+        # The handled columns are read even when nothing downstream reads them
+        return list(output_columns) + columns
+
+    def get_row_filter(self, input_name):
+        columns = self.get_inputs()['columns']
+        if input_name != 'dataframe' or self.strategy != 'drop' or not columns:
+            return None
+        return [{'column': column, 'op': 'not null'} for column in columns]
+
+    @staticmethod
+    def execute(payload):
+        # Extract metadata and parameters
+        metadata = payload.get("metadata", {})
+        params = Imputation.extract_params(payload)
+
+        # Fill or drop missing values
+        strategy = params.get('strategy', 'mean')
+        columns = params.get('columns') or []
+        fill_value = params.get('fill_value')
+        result = impute(
+            dataframe=params.get('dataframe'),
+            strategy=strategy,
+            columns=columns,
+            fill_value=fill_value
+        )
+        missing_values = sum(result['missing'].values())
+
+        # Check if we're updating or creating
+        instance_id = metadata.get("id")
+        if instance_id:
+            # Update existing object
+            try:
+                imputation_instance = Imputation.objects.get(id=instance_id)
+                imputation_instance.strategy = strategy
+                imputation_instance.columns = json.dumps(columns)
+                imputation_instance.fill_value = json.dumps(fill_value) if fill_value is not None else ''
+                imputation_instance.rows = result['rows']
+                imputation_instance.missing_values = missing_values
+                imputation_instance.save()
+            except Imputation.DoesNotExist:
+                # Fallback: if object not found, create a new one
+                imputation_instance = Imputation.objects.create(
+                    strategy=strategy,
+                    columns=json.dumps(columns),
+                    fill_value=json.dumps(fill_value) if fill_value is not None else '',
+                    rows=result['rows'],
+                    missing_values=missing_values
+                )
+        else:
+            # Create new object
+            imputation_instance = Imputation.objects.create(
+                strategy=strategy,
+                columns=json.dumps(columns),
+                fill_value=json.dumps(fill_value) if fill_value is not None else '',
+                rows=result['rows'],
+                missing_values=missing_values
+            )
+
+        # Serialize all fields dynamically
+        data = {
+            field.name: getattr(imputation_instance, field.name)
+            for field in imputation_instance._meta.fields
+        }
+
+        # Add the cleaned rows to response
+        data['data'] = result['data']
+        data['columns'] = columns
+        data['fill_value'] = fill_value
+        data['missing'] = result['missing']
+        data['clean'] = result['clean']
+
+        return data
@@ -12,22 +12,25 @@ class TrainTestSplit(BaseNode):
     test_size = models.FloatField(default=0.2)
     train_samples = models.IntegerField()
     test_samples = models.IntegerField()
+    random_state = models.IntegerField(blank=True, null=True, help_text="Seed of the split; drawn on first run if empty")
+    stratify = models.BooleanField(default=False)
+
+    def get_inputs(self):
+        return {'test_size': self.test_size, 'random_state': self.random_state, 'stratify': self.stratify}
 
     @staticmethod
     def execute(payload):
         # Extract metadata and parameters
         metadata = payload.get("metadata", {})
-        params = {
-            key.split("_")[-1]: value
-            for key, value in payload.items()
-            if key.startswith("I_")
-        }
+        params = TrainTestSplit.extract_params(payload)
 
         # Perform train-test split
         result = split_data(
             X=params.get('X'),
             y=params.get('y'),
-            test_size=params.get('test_size', 0.2)
+            test_size=params.get('test_size', 0.2),
+            random_state=params.get('random_state'),
+            stratify=params.get('stratify', False)
         )
 
         # Check if we're updating or creating
@@ -37,22 +40,28 @@ class TrainTestSplit(BaseNode):
             try:
                 tts_instance = TrainTestSplit.objects.get(id=instance_id)
                 tts_instance.test_size = params.get('test_size', 0.2)
-                tts_instance.train_samples = len(result['X_train'])
-                tts_instance.test_samples = len(result['X_test'])
+                tts_instance.train_samples = len(result['y_train'])
+                tts_instance.test_samples = len(result['y_test'])
+                tts_instance.random_state = result['random_state']
+                tts_instance.stratify = params.get('stratify', False)
                 tts_instance.save()
             except TrainTestSplit.DoesNotExist:
                 # Fallback: if object not found, create a new one
                 tts_instance = TrainTestSplit.objects.create(
                     test_size=params.get('test_size', 0.2),
-                    train_samples=len(result['X_train']),
-                    test_samples=len(result['X_test'])
+                    train_samples=len(result['y_train']),
+                    test_samples=len(result['y_test']),
+                    random_state=result['random_state'],
+                    stratify=params.get('stratify', False)
                 )
         else:
             # Create new object
             tts_instance = TrainTestSplit.objects.create(
                 test_size=params.get('test_size', 0.2),
-                train_samples=len(result['X_train']),
-                test_samples=len(result['X_test'])
+                train_samples=len(result['y_train']),
+                test_samples=len(result['y_test']),
+                random_state=result['random_state'],
+                stratify=params.get('stratify', False)
             )
 
         # Serialize all fields dynamically
@@ -62,6 +71,6 @@ class TrainTestSplit(BaseNode):
         }
 
         # Add split datasets to response
-        data.update(result)  # Adds X_train, X_test, y_train, y_test to response
+        data.update(result)  # Adds X_train, X_test, y_train, y_test and the split indices to response
 
         return data
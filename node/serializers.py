@@ -5,6 +5,9 @@ from node.modules.output.text import Text
 from node.modules.input.dataset import Dataset
 from node.modules.preprocessing.feature_selection import FeatureSelection
 from node.modules.preprocessing.train_test_split import TrainTestSplit
+from node.modules.preprocessing.filter import Filter
+from node.modules.preprocessing.hash_encoding import HashEncoding
+from node.modules.preprocessing.imputation import Imputation
 from node.modules.model.linear_regression import LinearRegression
 from node.modules.evaluation.predict import Predict
 from node.modules.evaluation.accuracy import Accuracy
@@ -30,6 +33,10 @@ class DatasetSerializer(serializers.ModelSerializer):
     class Meta:
         model = Dataset
         fields = "__all__"
+        extra_kwargs = {
+            'profile': {'read_only': True},
+            'profile_key': {'read_only': True},
+        }
 
 
 class FeatureSelectionSerializer(serializers.ModelSerializer):
@@ -44,6 +51,24 @@ class TrainTestSplitSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
+class FilterSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Filter
+        fields = "__all__"
+
+
+class HashEncodingSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = HashEncoding
+        fields = "__all__"
+
+
+class ImputationSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Imputation
+        fields = "__all__"
+
+
 class LinearRegressionSerializer(serializers.ModelSerializer):
     class Meta:
         model = LinearRegression
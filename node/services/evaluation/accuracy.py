@@ -5,19 +5,25 @@ from sklearn.metrics import (
     accuracy_score, precision_score, recall_score, f1_score
 )
 
-def accuracy_metric(y_true: pd.Series, y_pred: pd.Series, metric_type: str):
+from node.services.sparse import contains_nan, to_vector
+
+def accuracy_metric(y_true, y_pred, metric_type: str):
     """
     Calculates a specific evaluation metric based on metric_type.
 
     Args:
-        y_true (pd.Series): True values.
-        y_pred (pd.Series): Predicted values.
+        y_true (pd.Series | pd.DataFrame): True values. 1-dimensional arrays and
+                            single-column sparse matrices are accepted as well.
+                            A DataFrame holds one column per target.
+        y_pred (pd.Series | pd.DataFrame): Predicted values, in the same forms as
+                            y_true and with as many targets.
         metric_type (str): Type of metric to calculate. 
                            Options: ['r2', 'mse', 'rmse', 'mae', 
                                      'accuracy', 'precision', 'recall', 'f1']
 
     Returns:
-        float: Computed metric value.
+        float: Computed metric value. For multi-target inputs, a pd.Series with
+        the metric of each target, computed in one pass over all targets.
 
     Raises:
         ValueError: If inputs are invalid or metric_type is unsupported.
@@ -25,11 +31,13 @@ def accuracy_metric(y_true: pd.Series, y_pred: pd.Series, metric_type: str):
 
     if y_true is None or y_pred is None:
         raise ValueError("Both y_true and y_pred must be provided.")
-    if not isinstance(y_true, pd.Series) or not isinstance(y_pred, pd.Series):
-        raise ValueError("Both y_true and y_pred must be pandas Series.")
+    if isinstance(y_true, pd.DataFrame) or isinstance(y_pred, pd.DataFrame):
+        return multi_target_metric(y_true, y_pred, metric_type)
+    y_true = to_vector(y_true, "y_true")
+    y_pred = to_vector(y_pred, "y_pred")
     if len(y_true) != len(y_pred):
         raise ValueError("y_true and y_pred must have the same length.")
-    if y_true.isna().any() or y_pred.isna().any():
+    if contains_nan(y_true) or contains_nan(y_pred):
         raise ValueError("Input data contains NaN values.")
 
     metric_type = metric_type.lower()
@@ -45,3 +53,37 @@ def accuracy_metric(y_true: pd.Series, y_pred: pd.Series, metric_type: str):
 
     else:
         raise ValueError(f"Unsupported metric type: {metric_type}")
+
+
+def multi_target_metric(y_true, y_pred, metric_type: str) -> pd.Series:
+    """
+    Calculates a regression metric for every target of multi-target values; see
+    accuracy_metric.
+
+    Raises:
+        ValueError: If the inputs are not DataFrames of the same shape or the
+        metric is unsupported.
+    """
+    if not isinstance(y_true, pd.DataFrame) or not isinstance(y_pred, pd.DataFrame):
+        raise ValueError("Multi-target y_true and y_pred must both be DataFrames.")
+    if y_true.shape != y_pred.shape:
+        raise ValueError("y_true and y_pred must have the same length and number of targets.")
+    if contains_nan(y_true) or contains_nan(y_pred):
+        raise ValueError("Input data contains NaN values.")
+
+    metric_type = metric_type.lower()
+    true_values = y_true.to_numpy(dtype=np.float64)
+    pred_values = y_pred.to_numpy(dtype=np.float64)
+
+    if metric_type == "r2":
+        values = r2_score(true_values, pred_values, multioutput="raw_values")
+    elif metric_type == "mse":
+        values = mean_squared_error(true_values, pred_values, multioutput="raw_values")
+    elif metric_type == "rmse":
+        values = np.sqrt(mean_squared_error(true_values, pred_values, multioutput="raw_values"))
+    elif metric_type == "mae":
+        values = mean_absolute_error(true_values, pred_values, multioutput="raw_values")
+    else:
+        raise ValueError(f"Unsupported metric type: {metric_type}")
+
+    return pd.Series(values, index=[str(column) for column in y_true.columns], name=metric_type)
@@ -2,17 +2,21 @@ import pandas as pd
 import numpy as np
 from typing import Any, Dict
 
-def predict(model: Any, X: pd.DataFrame) -> Dict[str, Any]:
+from node.services.sparse import contains_nan, is_sparse_matrix, to_csr
+
+def predict(model: Any, X) -> Dict[str, Any]:
     """
     Generates predictions using any trained scikit-learn compatible model.
     
     Args:
         model: Trained scikit-learn model (supports both regression and classification).
-        X (pd.DataFrame): Feature DataFrame for prediction.
+        X (pd.DataFrame | scipy.sparse matrix): Features for prediction; sparse
+            matrices are passed to the model without being densified.
     
     Returns:
         dict: {
-            'predictions': pd.Series,
+            'predictions': pd.Series, or a pd.DataFrame with one column per
+                target for multi-target models,
             'prediction_probs': Optional[pd.DataFrame]
         }
     
@@ -23,9 +27,11 @@ def predict(model: Any, X: pd.DataFrame) -> Dict[str, Any]:
     # ✅ Validation
     if model is None:
         raise ValueError("A trained model must be provided.")
-    if X is None or not isinstance(X, pd.DataFrame):
-        raise ValueError("Input X must be a pandas DataFrame.")
-    if X.isna().any().any():
+    if is_sparse_matrix(X):
+        X = to_csr(X)
+    elif X is None or not isinstance(X, pd.DataFrame):
+        raise ValueError("Input X must be a pandas DataFrame or a sparse matrix.")
+    if contains_nan(X):
         raise ValueError("Input features contain NaN values.")
 
     # ✅ Predictions
@@ -34,7 +40,13 @@ def predict(model: Any, X: pd.DataFrame) -> Dict[str, Any]:
     except Exception as e:
         raise ValueError(f"Model prediction failed: {e}")
 
-    y_pred_series = pd.Series(y_pred, name="Predictions")
+    if np.ndim(y_pred) == 2:
+        names = getattr(model, "target_names_", None)
+        if names is None or len(names) != y_pred.shape[1]:
+            names = [f"Prediction_{i}" for i in range(y_pred.shape[1])]
+        y_pred_series = pd.DataFrame(y_pred, columns=list(names))
+    else:
+        y_pred_series = pd.Series(y_pred, name="Predictions")
 
     # ✅ If classification model supports probabilities
     y_prob = None
@@ -1,19 +1,57 @@
 import pandas as pd
+import numpy as np
+import hashlib
+import importlib.util
+import json
 import os
 
-def dataset(file_path: str) -> dict:
+from django.conf import settings
+
+from node.artifacts import (
+    artifact_exists,
+    artifact_handle,
+    open_artifact,
+    read_artifact_meta,
+    save_artifact,
+)
+from node.services.input.sample import ChunkSampler, sample_keys, sample_positions, validate_sample
+from node.services.preprocessing.filter import condition_columns, row_mask, validate_conditions
+
+CSV_ENGINES = ('c', 'pyarrow')
+
+
+DATASET_FORMATS = {
+    '.csv': 'csv',
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+    '.feather': 'feather',
+    '.arrow': 'feather',
+}
+
+
+def dataset(file_path: str, usecols: list = None, dtypes: dict = None, engine: str = None) -> dict:
     """
-    Uploads and validates a CSV dataset file.
+    Uploads and validates a dataset file: CSV, Parquet (.parquet, .pq) or Feather/Arrow
+    IPC (.feather, .arrow).
+
+    CSV files are converted to a columnar copy the first time they are loaded (see
+    columnar_copy), so later loads memory-map the binary copy instead of parsing text.
     
     Args:
-        file_path (str): Path to the CSV file.
+        file_path (str): Path to the dataset file.
+        usecols (list): Optional columns to load; the others are not read. Names missing
+            from the file are ignored.
+        dtypes (dict): Optional {column: dtype} hints (e.g. {"age": "int32", "city":
+            "category"}), which skip type inference for those columns.
+        engine (str): CSV parser, "c", "pyarrow" or "auto". Defaults to
+            settings.DATASET_CSV_ENGINE (see csv_engine).
         
     Returns:
         pd.DataFrame: The loaded dataset
     
     Raises:
         FileNotFoundError: If the file doesn't exist.
-        ValueError: If the file is not a valid CSV or cannot be read.
+        ValueError: If the file type is not supported or the file cannot be read.
     """
     
     # ✅ Check if file exists
@@ -21,13 +59,564 @@ def dataset(file_path: str) -> dict:
         raise FileNotFoundError(f"File not found: {file_path}")
         
     # ✅ Validate file extension
-    if not file_path.lower().endswith(".csv"):
-        raise ValueError("Only CSV files are supported.")
-    
+    file_format = dataset_format(file_path)
+
+    # ✅ Read binary formats directly
+    if file_format != 'csv':
+        return read_columnar_file(file_path, file_format, usecols=usecols, dtypes=dtypes)
+
+    # ✅ Load CSV files from their columnar copy, parsed with the hints on first load
+    if getattr(settings, 'DATASET_CSV_SIDECAR', True):
+        handle = columnar_copy(file_path, engine=engine, dtypes=dtypes)
+        columns = None
+        if usecols is not None:
+            wanted = set(usecols)
+            columns = [col for col in handle['columns'] if col in wanted]
+        return with_dtype_hints(open_artifact(handle, columns=columns), dtypes)
+
+    return read_csv_file(file_path, usecols=usecols, dtypes=dtypes, engine=engine)
+
+
+def dataset_format(file_path: str) -> str:
+    """
+    Returns the format of a dataset file from its extension: "csv", "parquet" or "feather".
+
+    Raises:
+        ValueError: If the file type is not supported.
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension not in DATASET_FORMATS:
+        raise ValueError(
+            f"Unsupported file type '{extension}'. Use CSV, Parquet (.parquet, .pq) "
+            "or Feather/Arrow (.feather, .arrow) files."
+        )
+    return DATASET_FORMATS[extension]
+
+
+def read_csv_file(file_path: str, usecols: list = None, dtypes: dict = None, engine: str = None) -> pd.DataFrame:
+    """
+    Parses a CSV file with the configured engine (see dataset for the arguments). The
+    engine that parsed the file is recorded in the returned DataFrame's attrs['csv_engine'].
+
+    Raises:
+        ValueError: If the file cannot be read.
+    """
+    engine = csv_engine(engine)
+
+    # ✅ Read only the requested columns that exist in the file
+    if usecols is not None or dtypes:
+        header = dataset_columns(file_path)
+        if usecols is not None:
+            wanted = set(usecols)
+            usecols = [col for col in header if col in wanted]
+        dtypes = dtype_hints(dtypes, usecols if usecols is not None else header)
+
     # ✅ Read CSV file safely
     try:
-        df = pd.read_csv(file_path)
+        if engine == 'pyarrow':
+            df = read_csv_arrow(file_path, usecols=usecols, dtypes=dtypes)
+        else:
+            df = pd.read_csv(file_path, usecols=usecols, dtype=dtypes or None, engine=engine)
     except Exception as e:
-        raise ValueError(f"Error reading CSV file: {e}")
-    
+        if engine == 'c':
+            raise ValueError(f"Error reading CSV file: {e}")
+        # pyarrow is stricter than the C parser (e.g. about ragged rows), so retry with it
+        engine = 'c'
+        try:
+            df = pd.read_csv(file_path, usecols=usecols, dtype=dtypes or None, engine=engine)
+        except Exception as e:
+            raise ValueError(f"Error reading CSV file: {e}")
+
+    df.attrs['csv_engine'] = engine
     return df
+
+
+def read_csv_arrow(file_path: str, usecols: list = None, dtypes: dict = None) -> pd.DataFrame:
+    """
+    Parses a CSV file with pyarrow's multithreaded reader. Hinted columns are parsed as
+    the Arrow type of their hint (see arrow_column_type) instead of being cast after
+    type inference, so e.g. a "str" hint keeps the leading zeros of "00123".
+
+    Args:
+        file_path (str): Path to the CSV file.
+        usecols (list): Optional columns to read, all present in the file.
+        dtypes (dict): Optional {column: dtype} hints, validated by dtype_hints.
+    """
+    import pyarrow.csv
+
+    options = {'strings_can_be_null': True}  # Empty strings are missing, as for the C parser
+    if usecols is not None:
+        options['include_columns'] = usecols
+    column_types = {}
+    for col, dtype in (dtypes or {}).items():
+        arrow_type = arrow_column_type(dtype)
+        if arrow_type is not None:
+            column_types[col] = arrow_type
+    if column_types:
+        options['column_types'] = column_types
+
+    table = pyarrow.csv.read_csv(file_path, convert_options=pyarrow.csv.ConvertOptions(**options))
+    return with_dtype_hints(table.to_pandas(), dtypes)
+
+
+def arrow_column_type(dtype):
+    """
+    Arrow type a CSV column hinted with a pandas dtype is parsed as: strings for string,
+    object and categorical hints, the matching type for numbers, booleans and datetimes
+    (nullable ones included), or None to let pyarrow infer it and cast it afterwards.
+    """
+    import pyarrow
+
+    if isinstance(dtype, pd.CategoricalDtype) or dtype.kind in 'OSU':
+        return pyarrow.string()
+    numpy_dtype = getattr(dtype, 'numpy_dtype', dtype)
+    if isinstance(numpy_dtype, np.dtype) and numpy_dtype.kind in 'biufM':
+        return pyarrow.from_numpy_dtype(numpy_dtype)
+    return None
+
+
+def read_columnar_file(file_path: str, file_format: str, usecols: list = None, dtypes: dict = None) -> pd.DataFrame:
+    """
+    Reads a Parquet or Feather/Arrow file, only reading the requested columns.
+
+    Raises:
+        ValueError: If pyarrow is not installed or the file cannot be read.
+    """
+    if importlib.util.find_spec('pyarrow') is None:
+        raise ValueError("Reading Parquet and Feather files requires the pyarrow package.")
+    if usecols is not None:
+        wanted = set(usecols)
+        usecols = [col for col in dataset_columns(file_path) if col in wanted]
+
+    try:
+        if file_format == 'parquet':
+            df = pd.read_parquet(file_path, columns=usecols)
+        else:
+            df = pd.read_feather(file_path, columns=usecols)
+    except Exception as e:
+        raise ValueError(f"Error reading {file_format} file: {e}")
+    return with_dtype_hints(df, dtypes)
+
+
+def with_dtype_hints(df: pd.DataFrame, dtypes: dict) -> pd.DataFrame:
+    """Casts the columns of an already loaded dataset to their hinted dtypes."""
+    hints = {col: dtype for col, dtype in dtype_hints(dtypes, df.columns).items() if df[col].dtype != dtype}
+    return df.astype(hints) if hints else df
+
+
+def optimize_dtypes(df: pd.DataFrame, max_category_ratio: float = 0.5, skip: list = ()) -> tuple:
+    """
+    Shrinks a loaded dataset's memory: integers are downcast to the smallest integer
+    type holding their range, floats to float32 when that loses no precision, and
+    string columns with few distinct values become categoricals.
+
+    Args:
+        df (pd.DataFrame): Loaded dataset.
+        max_category_ratio (float): Strings are converted to categoricals when their
+            number of distinct values is at most this fraction of the rows.
+        skip (list): Columns to leave unchanged, e.g. those with explicit dtype hints.
+
+    Returns:
+        tuple: (optimized DataFrame, {'bytes_before', 'bytes_after',
+        'columns': {column: {'from', 'to'}}} for the converted columns)
+    """
+    casts = {}
+    for col in df.columns:
+        if col in skip:
+            continue
+        series = df[col]
+        dtype = series.dtype
+        kind = getattr(dtype, 'kind', 'O')
+        if kind == 'i' and len(series):
+            lowest, highest = series.min(), series.max()
+            for candidate in (np.int8, np.int16, np.int32):
+                info = np.iinfo(candidate)
+                if info.min <= lowest and highest <= info.max:
+                    casts[col] = np.dtype(candidate)
+                    break
+        elif kind == 'f' and dtype.itemsize > 4:
+            values = series.to_numpy()
+            if np.array_equal(values.astype(np.float32).astype(dtype), values, equal_nan=True):
+                casts[col] = np.dtype(np.float32)
+        elif pd.api.types.is_string_dtype(dtype) and not isinstance(dtype, pd.CategoricalDtype) and len(series):
+            if series.nunique(dropna=True) <= max_category_ratio * len(series):
+                casts[col] = 'category'
+
+    bytes_before = int(df.memory_usage(index=True, deep=True).sum())
+    optimized = df.astype(casts) if casts else df
+    return optimized, {
+        'bytes_before': bytes_before,
+        'bytes_after': int(optimized.memory_usage(index=True, deep=True).sum()),
+        'columns': {
+            str(col): {'from': str(df[col].dtype), 'to': str(optimized[col].dtype)}
+            for col in casts
+        },
+    }
+
+
+def csv_engine(engine: str = None) -> str:
+    """
+    Resolves the CSV parser to use. "auto" selects pyarrow's multithreaded reader when
+    pyarrow is installed and falls back to the single-threaded pandas C parser. Both
+    apply dtype hints while parsing (see read_csv_arrow).
+
+    Args:
+        engine (str): "auto", "c" or "pyarrow". Defaults to settings.DATASET_CSV_ENGINE.
+
+    Raises:
+        ValueError: If the engine is unknown or pyarrow is requested but not installed.
+    """
+    engine = engine or getattr(settings, 'DATASET_CSV_ENGINE', 'auto')
+    if engine not in ('auto', *CSV_ENGINES):
+        raise ValueError(f"Unknown CSV engine '{engine}'. Use one of {['auto', *CSV_ENGINES]}.")
+    pyarrow_installed = importlib.util.find_spec('pyarrow') is not None
+    if engine == 'auto':
+        return 'pyarrow' if pyarrow_installed else 'c'
+    if engine == 'pyarrow' and not pyarrow_installed:
+        raise ValueError("The pyarrow CSV engine requires the pyarrow package.")
+    return engine
+
+
+def dtype_hints(dtypes: dict, columns: list) -> dict:
+    """
+    Validates {column: dtype} hints and keeps those for the given columns.
+
+    Raises:
+        ValueError: If dtypes is not a dict or a dtype is not understood by pandas.
+    """
+    if not dtypes:
+        return {}
+    if not isinstance(dtypes, dict):
+        raise ValueError("dtypes must be a mapping of column names to dtypes.")
+    hints = {}
+    for column, dtype in dtypes.items():
+        try:
+            dtype = pd.api.types.pandas_dtype(dtype)
+        except TypeError:
+            raise ValueError(f"Invalid dtype '{dtype}' for column '{column}'.")
+        if column in columns:
+            hints[column] = dtype
+    return hints
+
+
+def filtered_dataset(file_path: str, filters: list, usecols: list = None,
+                     dtypes: dict = None, sample: dict = None, chunksize: int = 100_000) -> tuple:
+    """
+    Loads the rows of a dataset that match any of the given filters.
+
+    A CSV file without a columnar copy yet is parsed chunksize rows at a time and each
+    chunk is filtered before the next one is read, so rows that do not match are never
+    held in memory all together. Columnar copies and binary formats are filtered on
+    the filter columns alone before the other columns are read.
+
+    Args:
+        file_path (str): Path to the dataset file.
+        filters (list): Lists of conditions as accepted by filter_rows. A row is kept if it
+            satisfies all conditions of at least one list.
+        usecols (list): Optional columns to return. Columns used by the filters are
+            parsed either way.
+        dtypes (dict): Optional {column: dtype} hints, as for dataset.
+        sample (dict): Optional sample of the matching rows to keep, see sample_rows. Rows
+            are sampled by their row number in the file, and chunked reads keep a bounded
+            reservoir instead of all matching rows.
+        chunksize (int): Number of rows parsed at a time.
+
+    Returns:
+        tuple: (DataFrame of the matching (sampled) rows with their row numbers in the file (or
+        stored index) as index, total number of rows in the file)
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist.
+        ValueError: If the file cannot be read or a filter is invalid.
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"File not found: {file_path}")
+    file_format = dataset_format(file_path)
+    if not isinstance(filters, list) or not filters:
+        raise ValueError("filters must be a non-empty list of condition lists.")
+    for conditions in filters:
+        validate_conditions(conditions)
+
+    header = dataset_columns(file_path)
+    filter_columns = [col for conditions in filters for col in condition_columns(conditions)]
+    missing = [col for col in filter_columns if col not in header]
+    if missing:
+        raise ValueError(f"Missing filter columns: {missing}")
+    wanted = set(header if usecols is None else usecols)
+    keep = [col for col in header if col in wanted]
+    parse = [col for col in header if col in wanted or col in filter_columns]
+    copy_id = columnar_copy_id(file_path, dtypes)
+    dtypes = dtype_hints(dtypes, parse)
+    if sample is not None:
+        sample = validate_sample(sample)
+
+    if file_format != 'csv' or artifact_exists(copy_id):
+        if file_format == 'csv':
+            frame = open_artifact(copy_id, columns=parse)
+        else:
+            frame = read_columnar_file(file_path, file_format, usecols=parse)
+        mask = np.zeros(len(frame), dtype=bool)
+        for conditions in filters:
+            mask |= row_mask(frame, conditions)
+        positions = np.flatnonzero(mask)
+        if sample is not None:
+            positions = positions[sample_positions(sample_keys(positions, sample['seed']), sample)]
+        return with_dtype_hints(frame.iloc[positions][keep], dtypes), len(frame)
+
+    chunks = []
+    sampler = ChunkSampler(sample) if sample is not None else None
+    total_rows = 0
+    try:
+        # Chunked reading needs the C parser
+        reader = pd.read_csv(file_path, usecols=parse, dtype=dtypes or None, chunksize=chunksize)
+        for chunk in reader:
+            mask = np.zeros(len(chunk), dtype=bool)
+            for conditions in filters:
+                mask |= row_mask(chunk, conditions)
+            if sampler is not None:
+                sampler.add(chunk.loc[mask, keep], total_rows + np.flatnonzero(mask))
+            else:
+                chunks.append(chunk.loc[mask, keep])
+            total_rows += len(chunk)
+    except ValueError:
+        raise
+    except Exception as e:
+        raise ValueError(f"Error reading CSV file: {e}")
+
+    if sampler is not None:
+        df = sampler.result(columns=keep)
+    else:
+        df = pd.concat(chunks) if chunks else pd.DataFrame(columns=keep)
+    # Chunks can disagree on categories, so restore the hinted dtypes
+    df = df.astype({col: dtype for col, dtype in dtypes.items() if col in keep})
+    return df, total_rows
+
+
+def sampled_dataset(file_path: str, sample: dict, usecols: list = None, dtypes: dict = None,
+                    engine: str = None, chunksize: int = 100_000) -> tuple:
+    """
+    Loads a deterministic sample of a dataset's rows (see sample_rows) without holding
+    the rows left out of it in memory.
+
+    CSV files are sampled by position from their memory-mapped columnar copy, so only
+    the sampled rows are copied out of it. Without columnar copies, CSV files are parsed
+    and Parquet and Feather files read chunksize rows at a time, each chunk sampled
+    before the next one is read; {'rows': k} samples keep a bounded reservoir.
+
+    Args:
+        file_path (str): Path to the dataset file.
+        sample (dict): Sample specification, see validate_sample.
+        usecols (list): Optional columns to load. Names missing from the file are ignored.
+        dtypes (dict): Optional {column: dtype} hints, as for dataset.
+        engine (str): CSV parser used to create the columnar copy; see csv_engine.
+        chunksize (int): Number of rows read at a time without a columnar copy.
+
+    Returns:
+        tuple: (DataFrame of the sampled rows with their row numbers in the file as
+        index, total number of rows in the file)
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist.
+        ValueError: If the file cannot be read or the sample is invalid.
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"File not found: {file_path}")
+    file_format = dataset_format(file_path)
+    sample = validate_sample(sample)
+    header = dataset_columns(file_path)
+    wanted = set(header if usecols is None else usecols)
+    keep = [col for col in header if col in wanted]
+
+    if file_format == 'csv' and getattr(settings, 'DATASET_CSV_SIDECAR', True):
+        handle = columnar_copy(file_path, engine=engine, dtypes=dtypes)
+        total_rows = handle['shape'][0]
+        positions = sample_positions(sample_keys(np.arange(total_rows), sample['seed']), sample)
+        df = open_artifact(handle, columns=keep).iloc[positions]
+        return with_dtype_hints(df, dtypes), total_rows
+
+    hints = dtype_hints(dtypes, keep)
+    sampler = ChunkSampler(sample)
+    total_rows = 0
+    try:
+        for chunk in read_chunks(file_path, file_format, keep, hints, chunksize):
+            chunk.index = pd.RangeIndex(total_rows, total_rows + len(chunk))
+            sampler.add(chunk, chunk.index)
+            total_rows += len(chunk)
+    except ValueError:
+        raise
+    except Exception as e:
+        raise ValueError(f"Error reading {file_format} file: {e}")
+    # Chunks can disagree on categories, so restore the hinted dtypes
+    return sampler.result(columns=keep).astype(hints), total_rows
+
+
+def read_chunks(file_path: str, file_format: str, columns: list, dtypes: dict = None, chunksize: int = 100_000):
+    """
+    Yields the given columns of a dataset file as DataFrames of at most chunksize rows:
+    CSV files are parsed by the C parser, Parquet files read by row batch and Feather
+    files by record batch.
+    """
+    if file_format == 'csv':
+        yield from pd.read_csv(file_path, usecols=columns, dtype=dtypes or None, chunksize=chunksize)
+        return
+    if importlib.util.find_spec('pyarrow') is None:
+        raise ValueError("Reading Parquet and Feather files requires the pyarrow package.")
+    import pyarrow
+    import pyarrow.parquet
+
+    if file_format == 'parquet':
+        batches = pyarrow.parquet.ParquetFile(file_path).iter_batches(batch_size=chunksize, columns=columns)
+    else:
+        reader = pyarrow.ipc.open_file(pyarrow.memory_map(file_path))
+        batches = (
+            batch.select(columns).slice(start, chunksize)
+            for batch in (reader.get_batch(i) for i in range(reader.num_record_batches))
+            for start in range(0, batch.num_rows, chunksize)
+        )
+    for batch in batches:
+        yield with_dtype_hints(batch.to_pandas(), dtypes)
+
+
+def dataset_columns(file_path: str) -> list:
+    """
+    Returns the column names of a dataset by parsing only the CSV header or reading
+    the Parquet/Feather schema.
+
+    Raises:
+        ValueError: If the file cannot be read.
+    """
+    file_format = dataset_format(file_path)
+    if file_format == 'csv':
+        try:
+            return pd.read_csv(file_path, nrows=0).columns.tolist()
+        except Exception as e:
+            raise ValueError(f"Error reading CSV file: {e}")
+
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ValueError("Reading Parquet and Feather files requires the pyarrow package.")
+    try:
+        if file_format == 'parquet':
+            schema = pyarrow.parquet.read_schema(file_path)
+        else:
+            with pyarrow.memory_map(file_path) as source:
+                schema = pyarrow.ipc.open_file(source).schema
+    except Exception as e:
+        raise ValueError(f"Error reading {file_format} file: {e}")
+    # Columns holding a stored pandas index are not dataset columns
+    index_columns = (schema.pandas_metadata or {}).get('index_columns', [])
+    return [name for name in schema.names if name not in index_columns]
+
+
+def columnar_copy_id(file_path: str, dtypes: dict = None) -> str:
+    """
+    Artifact id of a file's columnar copy, derived from its path, modification time and
+    size, and the dtype hints it is parsed with (see columnar_copy).
+    """
+    stat = os.stat(file_path)
+    source = f"{os.path.abspath(file_path)}:{stat.st_mtime_ns}:{stat.st_size}"
+    hints = dtype_hints(dtypes, dataset_columns(file_path)) if dtypes else {}
+    if hints:
+        source += ":" + json.dumps({str(col): str(dtype) for col, dtype in sorted(hints.items())})
+    return hashlib.sha256(source.encode()).hexdigest()[:32]
+
+
+def columnar_copy(file_path: str, engine: str = None, dtypes: dict = None) -> dict:
+    """
+    Returns a columnar copy of a dataset, creating it on first use.
+
+    The copy is an artifact keyed by the file's path, modification time and size,
+    so it is rebuilt when the file changes. Its columns are memory-mapped when opened.
+    A CSV file is parsed with the dtype hints given, as casting parsed values cannot
+    restore what parsing dropped (e.g. the leading zeros of "00123" read as a number),
+    so each set of hints has its own copy.
+
+    Args:
+        file_path (str): Path to the dataset file.
+        engine (str): CSV parser used to create the copy; see csv_engine.
+        dtypes (dict): Optional {column: dtype} hints, as for dataset.
+
+    Returns:
+        dict: Artifact handle of the columnar copy.
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist.
+        ValueError: If the file type is not supported or the file cannot be read.
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"File not found: {file_path}")
+
+    file_format = dataset_format(file_path)
+    artifact_id = columnar_copy_id(file_path, dtypes)
+    if artifact_exists(artifact_id):
+        return artifact_handle(artifact_id, read_artifact_meta(artifact_id))
+
+    if file_format == 'csv':
+        df = read_csv_file(file_path, dtypes=dtypes, engine=engine)
+    else:
+        df = read_columnar_file(file_path, file_format)
+    return save_artifact(df, artifact_id=artifact_id)
+
+
+def dataset_preview(file_path: str, offset: int = 0, limit: int = 100, columns: list = None,
+                    sort_by: str = None, ascending: bool = True, dtypes: dict = None) -> dict:
+    """
+    Returns one page of a dataset in columnar form.
+
+    Only the requested columns (plus the sort column) are read from the columnar copy,
+    and only the requested rows are converted to Python values.
+
+    Args:
+        file_path (str): Path to the dataset file.
+        offset (int): Index of the first row to return.
+        limit (int): Maximum number of rows to return.
+        columns (list): Columns to return. Defaults to all columns.
+        sort_by (str): Optional column to sort by before paginating.
+        ascending (bool): Sort order. Default is True.
+        dtypes (dict): Optional {column: dtype} hints the dataset is parsed with, as for dataset.
+
+    Returns:
+        dict: {
+            'total_rows': int,
+            'offset': int,
+            'limit': int,
+            'columns': list,
+            'dtypes': dict,
+            'data': {column: list of values}
+        }
+
+    Raises:
+        ValueError: If pagination parameters or column names are invalid.
+    """
+    if offset < 0 or limit < 0:
+        raise ValueError("offset and limit must be non-negative.")
+
+    handle = columnar_copy(file_path, dtypes=dtypes)
+    columns = columns or handle['columns']
+    missing = [col for col in columns + ([sort_by] if sort_by else []) if col not in handle['columns']]
+    if missing:
+        raise ValueError(f"Missing columns: {missing}")
+
+    total_rows = handle['shape'][0]
+    if sort_by:
+        order = open_artifact(handle, columns=[sort_by])[sort_by].reset_index(drop=True)
+        positions = order.sort_values(ascending=ascending, kind='stable').index.to_numpy()
+        positions = positions[offset:offset + limit]
+    else:
+        positions = np.arange(min(offset, total_rows), min(offset + limit, total_rows))
+
+    page = open_artifact(handle, columns=columns).iloc[positions]
+
+    return {
+        'total_rows': total_rows,
+        'offset': offset,
+        'limit': limit,
+        'columns': columns,
+        'dtypes': {col: handle['dtypes'][col] for col in columns},
+        'data': {
+            col: page[col].astype(object).where(page[col].notna(), None).tolist()
+            for col in columns
+        },
+    }
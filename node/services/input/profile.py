@@ -0,0 +1,114 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+from node.artifacts import open_artifact
+from node.services.input.dataset import columnar_copy, columnar_copy_id
+
+
+def dataset_profile(file_path: str, top_k: int = 10, distinct_k: int = 1024, dtypes: dict = None) -> dict:
+    """
+    Profiles every column of a dataset in a single vectorized pass over its columnar copy.
+
+    Args:
+        file_path (str): Path to the dataset file.
+        top_k (int): Number of most frequent values reported for non-numeric columns.
+        distinct_k (int): Sketch size of the distinct-count estimate; columns with fewer
+            distinct values are counted exactly, others within about 1/sqrt(distinct_k).
+        dtypes (dict): Optional {column: dtype} hints the dataset is parsed with, as for dataset.
+
+    Returns:
+        dict: {
+            'profile_key': key of the file version profiled (see columnar_copy_id),
+            'rows': int,
+            'columns': [{'name', 'dtype', 'count', 'nulls', 'distinct', 'distinct_exact',
+                         'min', 'max', 'mean', 'std', 'top'}]
+        }
+        Statistics that do not apply to a column's type are None.
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist.
+        ValueError: If the file cannot be read.
+    """
+    handle = columnar_copy(file_path, dtypes=dtypes)
+    df = open_artifact(handle)
+    return {
+        'profile_key': columnar_copy_id(file_path, dtypes),
+        'rows': len(df),
+        'columns': [column_profile(df[col], top_k, distinct_k) for col in df.columns],
+    }
+
+
+def column_profile(series: pd.Series, top_k: int = 10, distinct_k: int = 1024) -> dict:
+    """Statistics of one column; see dataset_profile."""
+    missing = series.isna().to_numpy()
+    present = series[~missing] if missing.any() else series
+    distinct, exact = estimate_distinct(present, distinct_k)
+    profile = {
+        'name': series.name,
+        'dtype': str(series.dtype),
+        'count': len(present),
+        'nulls': int(missing.sum()),
+        'distinct': distinct,
+        'distinct_exact': exact,
+        'min': None,
+        'max': None,
+        'mean': None,
+        'std': None,
+        'top': None,
+    }
+
+    kind = getattr(series.dtype, 'kind', 'O')
+    if kind in 'iuf' and len(present):
+        values = present.to_numpy()
+        finite = values[np.isfinite(values)] if kind == 'f' else values
+        profile['min'] = _json_value(values.min())
+        profile['max'] = _json_value(values.max())
+        if len(finite):
+            profile['mean'] = _json_value(finite.mean(dtype=np.float64))
+            profile['std'] = _json_value(finite.std(dtype=np.float64, ddof=1)) if len(finite) > 1 else None
+    elif kind == 'M' and len(present):
+        profile['min'] = present.min().isoformat()
+        profile['max'] = present.max().isoformat()
+    elif kind not in 'iufmM':
+        counts = present.value_counts(sort=True).head(top_k)
+        profile['top'] = [
+            {'value': _json_value(value), 'count': int(count)}
+            for value, count in counts.items()
+        ]
+    return profile
+
+
+def estimate_distinct(series: pd.Series, k: int = 1024) -> tuple:
+    """
+    Estimates the number of distinct values with a k-minimum-values sketch over 64-bit
+    value hashes, which needs one hashing pass and a partial sort instead of a full sort
+    or hash table of all values.
+
+    Returns:
+        tuple: (estimate, exact) where exact is True when the column has fewer than k
+        distinct values and the count is exact.
+    """
+    if len(series) == 0:
+        return 0, True
+    hashes = pd.util.hash_array(series.to_numpy())
+    m = min(k, len(hashes))
+    while True:
+        smallest = np.unique(np.partition(hashes, m - 1)[:m])
+        if len(smallest) >= k:
+            # The k-th smallest of n uniform hashes is about k / n of the hash range
+            return int(round((k - 1) / (float(smallest[k - 1]) / 2.0 ** 64))), False
+        if m == len(hashes):
+            return len(smallest), True
+        m = min(m * 4, len(hashes))
+
+
+def _json_value(value):
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
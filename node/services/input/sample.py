@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+
+
+def validate_sample(sample) -> dict:
+    """
+    Normalizes a sample specification: {'rows': int} or {'fraction': float}, with an
+    optional 'seed' (default 0). A bare integer means {'rows': sample}.
+
+    Raises:
+        ValueError: If the specification is invalid.
+    """
+    if isinstance(sample, bool):
+        raise ValueError("sample must be {'rows': int} or {'fraction': float}.")
+    if isinstance(sample, int):
+        sample = {'rows': sample}
+    if not isinstance(sample, dict) or ('rows' in sample) == ('fraction' in sample):
+        raise ValueError("sample must be {'rows': int} or {'fraction': float}.")
+    try:
+        seed = int(sample.get('seed', 0))
+    except (TypeError, ValueError):
+        raise ValueError("sample seed must be an integer.")
+    if seed < 0:
+        raise ValueError("sample seed must be non-negative.")
+
+    if 'rows' in sample:
+        rows = sample['rows']
+        if isinstance(rows, bool) or not isinstance(rows, int) or rows <= 0:
+            raise ValueError("sample rows must be a positive integer.")
+        return {'rows': rows, 'seed': seed}
+    fraction = sample['fraction']
+    if isinstance(fraction, bool) or not isinstance(fraction, (int, float)) or not 0 < fraction <= 1:
+        raise ValueError("sample fraction must be in (0, 1].")
+    return {'fraction': float(fraction), 'seed': seed}
+
+
+def sample_keys(row_numbers, seed: int = 0) -> np.ndarray:
+    """
+    Pseudo-random 64-bit keys of rows (splitmix64 of the row number and seed). A row's key
+    only depends on its row number, so the same rows are sampled however the data is read.
+    """
+    # uint64 arithmetic wraps around, which is intended
+    with np.errstate(over='ignore'):
+        x = np.asarray(row_numbers, dtype=np.uint64) + np.uint64(seed) * _GOLDEN + _GOLDEN
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def sample_rows(df: pd.DataFrame, sample: dict, row_numbers=None) -> pd.DataFrame:
+    """
+    Returns a deterministic sample of a DataFrame's rows, in their original order.
+
+    With {'rows': k} the k rows with the smallest keys are kept (a bottom-k reservoir);
+    with {'fraction': f} every row whose key falls in the lowest fraction f of the key range.
+
+    Args:
+        df (pd.DataFrame): Rows to sample from.
+        sample (dict): Sample specification, see validate_sample.
+        row_numbers (array): Row numbers of df's rows in the source file. Defaults to
+            their positions.
+    """
+    sample = validate_sample(sample)
+    row_numbers = np.arange(len(df)) if row_numbers is None else np.asarray(row_numbers)
+    return df.iloc[sample_positions(sample_keys(row_numbers, sample['seed']), sample)]
+
+
+def sample_positions(keys: np.ndarray, sample: dict) -> np.ndarray:
+    """Sorted positions of the sampled keys; see sample_rows."""
+    if 'fraction' in sample:
+        if sample['fraction'] >= 1:
+            return np.arange(len(keys))
+        return np.flatnonzero(keys < np.uint64(sample['fraction'] * 2.0 ** 64))
+    if len(keys) <= sample['rows']:
+        return np.arange(len(keys))
+    return np.sort(np.argpartition(keys, sample['rows'] - 1)[:sample['rows']])
+
+
+class ChunkSampler:
+    """
+    Samples a stream of DataFrame chunks with bounded memory: only the current sample
+    (at most k rows for {'rows': k}) and one chunk are held at a time. The result equals
+    sample_rows on the concatenated chunks.
+    """
+
+    def __init__(self, sample: dict):
+        self.sample = validate_sample(sample)
+        self._chunks = []
+        self._keys = []
+
+    def add(self, chunk: pd.DataFrame, row_numbers):
+        keys = sample_keys(row_numbers, self.sample['seed'])
+        if 'fraction' in self.sample:
+            positions = sample_positions(keys, self.sample)
+            self._chunks.append(chunk.iloc[positions])
+            self._keys.append(keys[positions])
+            return
+        self._chunks.append(chunk)
+        self._keys.append(keys)
+        kept = pd.concat(self._chunks)
+        keys = np.concatenate(self._keys)
+        positions = sample_positions(keys, self.sample)
+        self._chunks, self._keys = [kept.iloc[positions]], [keys[positions]]
+
+    def result(self, columns=None) -> pd.DataFrame:
+        if not self._chunks:
+            return pd.DataFrame(columns=columns)
+        return pd.concat(self._chunks)
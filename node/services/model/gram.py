@@ -0,0 +1,152 @@
+import hashlib
+import itertools
+import threading
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from node.artifacts import known_artifact
+from node.services.model.linear_regression import (
+    build_linear_model,
+    chunk_moments,
+    merge_moments,
+    solve_normal_equations,
+)
+
+
+class GramStatistics:
+    """
+    Sufficient statistics of a linear regression over a fixed set of rows:
+    row count, column means and centered cross-products of every numeric column.
+    """
+
+    def __init__(self, columns, n, mean, cross):
+        self.columns = list(columns)
+        self.n = n
+        self.mean = mean
+        self.cross = cross
+        self._positions = {column: position for position, column in enumerate(self.columns)}
+
+    def covers(self, columns):
+        return all(column in self._positions for column in columns)
+
+    def solve(self, feature_columns, target_column, fit_intercept=True):
+        """
+        Fits a linear regression of target_column on feature_columns from the
+        statistics alone, in O(k³) for k features. A list of target columns is
+        fitted as one multi-target model.
+
+        Returns:
+            LinearRegression: Fitted model.
+        """
+        multi = isinstance(target_column, list)
+        targets = target_column if multi else [target_column]
+        positions = [self._positions[column] for column in list(feature_columns) + targets]
+        mean = self.mean[positions]
+        cross = self.cross[np.ix_(positions, positions)]
+        if not fit_intercept:
+            cross = cross + self.n * np.outer(mean, mean)
+        coef, intercept = solve_normal_equations(mean, cross, fit_intercept, n_targets=len(targets) if multi else None)
+        return build_linear_model(coef, intercept, fit_intercept, list(feature_columns),
+                                  target_names=targets if multi else [target_column])
+
+
+def gram_statistics(dataframe: pd.DataFrame, rows: pd.Index = None, chunksize: int = 100_000):
+    """
+    Computes GramStatistics over all numeric columns of a DataFrame without NaN values.
+
+    Args:
+        dataframe (pd.DataFrame): Full dataset.
+        rows (pd.Index): Optional labels of the rows to use (e.g. the training split).
+        chunksize (int): Rows processed at a time, which bounds the temporary memory.
+
+    Returns:
+        GramStatistics
+    """
+    numeric = dataframe.select_dtypes(include=[np.number, 'bool'])
+    columns = [column for column in numeric.columns if not numeric[column].isna().any()]
+    numeric = numeric[columns]
+    positions = np.arange(len(numeric)) if rows is None else numeric.index.get_indexer(rows)
+    if (positions < 0).any():
+        raise ValueError("Rows are not part of the dataframe.")
+
+    stats = None
+    for start in range(0, len(positions), chunksize):
+        Z = numeric.iloc[positions[start:start + chunksize]].to_numpy(dtype=np.float64)
+        stats = merge_moments(stats, chunk_moments(Z))
+    if stats is None:
+        raise ValueError("The dataset contains no rows.")
+    return GramStatistics(columns, *stats)
+
+
+class GramCache:
+    """Small LRU of GramStatistics keyed by (dataset, rows)."""
+
+    def __init__(self, max_entries=32):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            stats = self._entries.get(key)
+            if stats is not None:
+                self._entries.move_to_end(key)
+            return stats
+
+    def put(self, key, stats):
+        with self._lock:
+            self._entries[key] = stats
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+_cache = GramCache()
+_frame_refs = {}
+_frame_lock = threading.RLock()
+_frame_counter = itertools.count()
+
+
+def dataset_identity(dataframe: pd.DataFrame):
+    """
+    Identifies a dataset without reading it: by its artifact id when it was loaded from
+    one, otherwise by the in-memory object for as long as it is alive.
+    """
+    handle = known_artifact(dataframe)
+    if handle is not None:
+        return f"artifact:{handle['artifact_id']}"
+
+    key = id(dataframe)
+    with _frame_lock:
+        entry = _frame_refs.get(key)
+        if entry is None or entry[0]() is not dataframe:
+            def forget(_):
+                with _frame_lock:
+                    _frame_refs.pop(key, None)
+            entry = (weakref.ref(dataframe, forget), f"object:{next(_frame_counter)}")
+            _frame_refs[key] = entry
+    return entry[1]
+
+
+def rows_identity(rows: pd.Index):
+    if rows is None:
+        return "all"
+    return hashlib.sha256(pd.util.hash_pandas_object(rows, index=False).to_numpy().tobytes()).hexdigest()
+
+
+def cached_gram_statistics(dataframe: pd.DataFrame, rows: pd.Index = None):
+    """
+    Returns the GramStatistics of a dataset's rows, computing them on first use.
+
+    Returns:
+        tuple: (GramStatistics, key) where key identifies the dataset and rows.
+    """
+    key = f"{dataset_identity(dataframe)}:{rows_identity(rows)}"
+    stats = _cache.get(key)
+    if stats is None:
+        stats = gram_statistics(dataframe, rows)
+        _cache.put(key, stats)
+    return stats, key
@@ -0,0 +1,270 @@
+import os
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+
+from node.services.sparse import contains_nan, is_sparse_matrix
+
+# Below this many training rows the groups are fitted in-process, as starting and
+# feeding worker processes costs more than the fit itself
+PARALLEL_MIN_ROWS = 200_000
+
+# Singular values below this fraction of the largest are treated as zero, as by
+# sklearn's LinearRegression (tol=1e-6)
+SINGULAR_VALUE_CUTOFF = 1e-6
+
+
+def grouped_linear_regression(X_train: pd.DataFrame, y_train, group_column: str,
+                              fit_intercept: bool = True, max_workers: int = None):
+    """
+    Trains one linear regression per value of a key column (a store, region, segment...).
+
+    Rows are sorted by group once; the normal-equation statistics of every group are
+    then computed block by block and all well-conditioned groups of a block are solved
+    in one batched solve, so thousands of small models train in a single pass. Groups
+    whose features are (nearly) collinear, or that have fewer rows than features, are
+    solved by least squares on their own centered rows instead, as the normal equations
+    square the condition number. Large inputs are split into blocks of whole groups and
+    fitted across a process pool. Each group's fit matches sklearn's LinearRegression on
+    that group's rows, including the minimum-norm solution of rank-deficient groups.
+
+    Args:
+        X_train (pd.DataFrame): Training features, including the group column, which is
+            used as the key and not as a feature.
+        y_train (pd.Series | pd.DataFrame): Training target values, one column per target.
+        group_column (str): Column of X_train whose values define the groups.
+        fit_intercept (bool): Whether to fit the intercept terms. Default is True.
+        max_workers (int): Worker processes, capped at and defaulting to
+            settings.GROUPED_TRAINING_MAX_WORKERS and the number of CPUs.
+
+    Returns:
+        GroupedLinearModel: Fitted model holding the coefficients of every group.
+
+    Raises:
+        ValueError: If inputs are missing or invalid, the group column is missing or has
+        missing keys, or the data contains NaN values.
+    """
+    if X_train is None or y_train is None:
+        raise ValueError("Both X_train and y_train must be provided.")
+    if is_sparse_matrix(X_train) or not isinstance(X_train, pd.DataFrame):
+        raise ValueError("Grouped training needs X_train as a DataFrame containing the group column.")
+    if not isinstance(y_train, (pd.Series, pd.DataFrame)):
+        raise ValueError("y_train must be a Series or DataFrame.")
+    if group_column not in X_train.columns:
+        raise ValueError(f"Group column '{group_column}' not found in X_train.")
+    if len(X_train) != len(y_train):
+        raise ValueError("Number of samples in X_train and y_train must match.")
+    if len(X_train) == 0:
+        raise ValueError("The dataset contains no rows.")
+
+    feature_names = [column for column in X_train.columns if column != group_column]
+    if not feature_names:
+        raise ValueError("Grouped training needs at least one feature besides the group column.")
+    if contains_nan(X_train) or contains_nan(y_train):
+        raise ValueError("Input data contains NaN values.")
+
+    codes, groups = pd.factorize(X_train[group_column], sort=True)
+    multi = isinstance(y_train, pd.DataFrame)
+    Y = y_train.to_numpy(dtype=np.float64)
+    Z = np.column_stack([X_train[feature_names].to_numpy(dtype=np.float64), Y.reshape(len(Y), -1)])
+
+    # Rows of a group become contiguous; starts[i] is the first row of group i
+    order = np.argsort(codes, kind='stable')
+    Z = Z[order]
+    counts = np.bincount(codes, minlength=len(groups))
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+
+    k = len(feature_names)
+    blocks = group_blocks(counts, worker_count(len(Z), len(groups), max_workers))
+    if len(blocks) == 1:
+        coef, intercept = solve_groups(Z, starts, counts, k, fit_intercept)
+    else:
+        pool = process_pool(len(blocks))
+        futures = [
+            pool.submit(solve_groups, Z[starts[first]:starts[last - 1] + counts[last - 1]],
+                        starts[first:last] - starts[first], counts[first:last], k, fit_intercept)
+            for first, last in blocks
+        ]
+        solved = [future.result() for future in futures]
+        coef = np.concatenate([block[0] for block in solved])
+        intercept = np.concatenate([block[1] for block in solved])
+
+    if not multi:
+        coef, intercept = coef[:, 0, :], intercept[:, 0]
+    target_names = [str(column) for column in y_train.columns] if multi else None
+    return GroupedLinearModel(group_column, group_keys(groups), coef, intercept, counts,
+                              fit_intercept, feature_names, target_names)
+
+
+def solve_groups(Z: np.ndarray, starts: np.ndarray, counts: np.ndarray, k: int, fit_intercept: bool = True):
+    """
+    Fits every group of a block of rows sorted by group; see grouped_linear_regression.
+    The first k columns of Z are the features and the remaining ones the targets.
+
+    Returns:
+        tuple: (coef, intercept) of shapes (groups, targets, k) and (groups, targets).
+    """
+    n_groups, p = len(counts), Z.shape[1]
+    means = np.zeros((n_groups, p))
+    if fit_intercept:
+        means = np.add.reduceat(Z, starts, axis=0) / counts[:, None]
+        # Centered on the mean of each row's own group
+        D = Z - np.repeat(means, counts, axis=0)
+    else:
+        D = Z
+
+    # Sums of the products of column i with every later column, over the rows of each
+    # group at once; one pass per column keeps the temporary at the size of the block
+    cross = np.empty((n_groups, p, p))
+    for i in range(p):
+        cross[:, i, i:] = np.add.reduceat(D[:, i:i + 1] * D[:, i:], starts, axis=0)
+        cross[:, i:, i] = cross[:, i, i:]
+
+    # The normal equations lose about log10(cond(X)²) digits, so they are only solved
+    # (all groups at once) while that leaves at least half of the float64 precision
+    XtX, XtY = cross[:, :k, :k], cross[:, :k, k:]
+    eigenvalues = np.linalg.eigvalsh(XtX)
+    well_conditioned = eigenvalues[:, 0] > eigenvalues[:, -1] * np.sqrt(np.finfo(np.float64).eps)
+    coef = np.empty((n_groups, p - k, k))
+    if well_conditioned.any():
+        coef[well_conditioned] = np.swapaxes(
+            np.linalg.solve(XtX[well_conditioned], XtY[well_conditioned]), 1, 2
+        )
+    for group in np.flatnonzero(~well_conditioned):
+        # Minimum-norm least squares on the rows themselves, with the singular value
+        # cutoff of sklearn's LinearRegression (its default tol)
+        rows = D[starts[group]:starts[group] + counts[group]]
+        coef[group] = np.linalg.lstsq(rows[:, :k], rows[:, k:], rcond=SINGULAR_VALUE_CUTOFF)[0].T
+    intercept = means[:, k:] - np.einsum('gtk,gk->gt', coef, means[:, :k])
+    return coef, intercept
+
+
+def group_blocks(counts: np.ndarray, n_blocks: int) -> list:
+    """Splits groups into up to n_blocks contiguous (first, last) ranges of similar row counts."""
+    if n_blocks <= 1:
+        return [(0, len(counts))]
+    bounds = np.searchsorted(np.cumsum(counts), np.linspace(0, counts.sum(), n_blocks + 1)[1:-1])
+    edges = np.unique(np.concatenate([[0], np.minimum(bounds + 1, len(counts)), [len(counts)]]))
+    return [(int(first), int(last)) for first, last in zip(edges[:-1], edges[1:])]
+
+
+def worker_count(n_rows: int, n_groups: int, max_workers: int = None) -> int:
+    limit = getattr(settings, 'GROUPED_TRAINING_MAX_WORKERS', 4)
+    workers = min(limit, max_workers or limit, os.cpu_count() or 1, n_groups)
+    if n_rows < PARALLEL_MIN_ROWS:
+        return 1
+    return max(workers, 1)
+
+
+_pool = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def process_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Returns the shared worker pool, started on first use and kept for later fits.
+    Workers are spawned rather than forked, as the server process runs threads.
+    """
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers < workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+            _pool_workers = workers
+        return _pool
+
+
+def group_keys(groups) -> np.ndarray:
+    """
+    Group keys as a plain numpy array that can be stored without pickling: numbers and
+    booleans keep their dtype, anything else is stored as strings.
+    """
+    keys = np.asarray(groups)
+    if keys.dtype.kind in 'biuf':
+        return keys
+    return keys.astype(str)
+
+
+class GroupedLinearModel:
+    """
+    One linear model per group, stored compactly as stacked coefficient arrays.
+
+    Attributes:
+        group_column (str): Column holding the group keys.
+        groups_ (np.ndarray): Sorted group keys.
+        coef_ (np.ndarray): Coefficients of shape (groups, n_features), or
+            (groups, n_targets, n_features) for multi-target models.
+        intercept_ (np.ndarray): Intercepts of shape (groups,) or (groups, n_targets).
+        counts_ (np.ndarray): Training rows of each group.
+    """
+
+    def __init__(self, group_column, groups, coef, intercept, counts, fit_intercept=True,
+                 feature_names=None, target_names=None):
+        self.group_column = str(group_column)
+        self.groups_ = np.asarray(groups)
+        self.coef_ = np.asarray(coef, dtype=np.float64)
+        self.intercept_ = np.asarray(intercept, dtype=np.float64)
+        self.counts_ = np.asarray(counts, dtype=np.int64)
+        self.fit_intercept = bool(fit_intercept)
+        self.n_features_in_ = self.coef_.shape[-1]
+        if feature_names is not None and len(feature_names):
+            self.feature_names_in_ = np.asarray([str(name) for name in feature_names], dtype=object)
+        if target_names is not None and len(target_names):
+            self.target_names_ = np.asarray(target_names, dtype=object)
+
+    @property
+    def n_groups(self):
+        return len(self.groups_)
+
+    def predict(self, X: pd.DataFrame) -> np.ndarray:
+        """
+        Predicts every row with the model of its group.
+
+        Raises:
+            ValueError: If X lacks the group or feature columns, or has groups that
+            were not seen in training.
+        """
+        if not isinstance(X, pd.DataFrame) or self.group_column not in X.columns:
+            raise ValueError(f"X must be a DataFrame with the group column '{self.group_column}'.")
+        feature_names = list(getattr(self, 'feature_names_in_', []))
+        missing = [column for column in feature_names if column not in X.columns]
+        if missing:
+            raise ValueError(f"Missing feature columns: {missing}")
+
+        keys = X[self.group_column]
+        if self.groups_.dtype.kind == 'U':
+            keys = keys.astype(str)
+        positions = pd.Index(self.groups_).get_indexer(keys)
+        unseen = positions < 0
+        if unseen.any():
+            raise ValueError(f"Groups not seen in training: {pd.unique(keys[unseen])[:10].tolist()}")
+
+        features = X[feature_names].to_numpy(dtype=np.float64)
+        coef = self.coef_[positions]
+        if coef.ndim == 3:
+            return np.einsum('ntk,nk->nt', coef, features) + self.intercept_[positions]
+        return np.einsum('nk,nk->n', coef, features) + self.intercept_[positions]
+
+    def coefficients_frame(self) -> pd.DataFrame:
+        """Per-group coefficients as a table: one row per group (and target)."""
+        feature_names = list(getattr(self, 'feature_names_in_', range(self.n_features_in_)))
+        if self.coef_.ndim == 3:
+            n_targets = self.coef_.shape[1]
+            targets = list(getattr(self, 'target_names_', range(n_targets)))
+            frame = pd.DataFrame(self.coef_.reshape(-1, self.n_features_in_), columns=feature_names)
+            frame.insert(0, 'target', np.tile(np.asarray(targets, dtype=str), self.n_groups))
+            frame.insert(0, self.group_column, np.repeat(self.groups_, n_targets))
+            frame['intercept'] = self.intercept_.ravel()
+            frame['rows'] = np.repeat(self.counts_, n_targets)
+            return frame
+        frame = pd.DataFrame(self.coef_, columns=feature_names)
+        frame.insert(0, self.group_column, self.groups_)
+        frame['intercept'] = self.intercept_
+        frame['rows'] = self.counts_
+        return frame
@@ -1,35 +1,457 @@
 from sklearn.linear_model import LinearRegression
+import numpy as np
 import pandas as pd
+import os
+from scipy import linalg
+from scipy.linalg import lapack
 
-def linear_regression(X_train: pd.DataFrame, y_train: pd.Series, fit_intercept: bool = True):
+from node.services.sparse import contains_nan, is_sparse_matrix, to_csr
+
+# 'lstsq' is scikit-learn's own solver (an SVD-based least-squares solve, LSQR for sparse features)
+SOLVERS = ('auto', 'cholesky', 'qr', 'lstsq', 'sgd')
+
+# Thresholds of the 'auto' solver, from `manage.py benchmark_solvers`. Cholesky on the
+# normal equations is the fastest dense solver (4-5x faster than lstsq from 10k x 10 to
+# 1M x 20) while the p x p Gram matrix is small, but squares the condition number of X,
+# so 'auto' only uses it when that is clearly safe:
+# - at least CHOLESKY_MIN_ROWS_PER_FEATURE rows per feature (n >> p), and
+# - a condition number of the Gram matrix, with its diagonal scaled to ones, of at most
+#   AUTO_CHOLESKY_MAX_CONDITION (cond(X) <= 1e3), so the solve keeps about 10 of the 16
+#   significant digits. Otherwise the fit is redone with lstsq.
+# Minibatch SGD is several times slower than the direct solvers but needs no p x p
+# matrix, so it is only picked for data too large for them. Everything else uses lstsq.
+CHOLESKY_MAX_FEATURES = 2_000
+CHOLESKY_MIN_ROWS_PER_FEATURE = 100
+AUTO_CHOLESKY_MAX_CONDITION = 1e6
+SGD_MIN_CELLS = 2_000_000_000
+
+# Values per row chunk of the Cholesky solver, which bounds its temporary memory
+CHUNK_VALUES = 4_000_000
+
+def linear_regression(X_train, y_train, fit_intercept: bool = True, solver: str = 'auto'):
     """
     Trains a Linear Regression model on the given dataset.
 
+    The least-squares problem is solved by one of SOLVERS:
+
+    - 'cholesky': normal equations built in row chunks and solved by a Cholesky
+      factorization. Fastest for n >> p, memory O(p²); falls back to 'lstsq' when the
+      features are (nearly) collinear, as squaring X's condition number loses precision.
+    - 'qr': Householder QR of the centered features. More accurate than 'cholesky' on
+      ill-conditioned data, at the cost of a centered copy of X; falls back to 'lstsq'
+      for rank-deficient features.
+    - 'lstsq': scikit-learn's solver, SVD-based (LSQR for sparse features); the reference.
+    - 'sgd': minibatch stochastic gradient descent on standardized features, with
+      iterate averaging. Approximate, but memory and time per epoch are O(n·p) with no
+      p x p matrix, for data too large for a direct solve.
+    - 'auto': 'lstsq', unless the shape of X calls for 'sgd' or makes 'cholesky'
+      clearly safe (see choose_solver and AUTO_CHOLESKY_MAX_CONDITION).
+
+    Several targets given as a DataFrame are fitted together, in a single least-squares
+    solve against the 2-D target matrix, so X is factorized once for all of them.
+
+    Every solver works in float64: features stored in smaller types (e.g. float32 after
+    optimize_dtypes) are converted first, as scikit-learn would otherwise solve float32
+    data in float32.
+
+    Sparse features are fitted without densifying them (scikit-learn solves sparse
+    problems iteratively with LSQR, centering implicitly when fitting the intercept).
+
     Args:
-        X_train (pd.DataFrame): Training features.
-        y_train (pd.Series): Training target values.
+        X_train (pd.DataFrame | scipy.sparse matrix): Training features.
+        y_train (pd.Series | pd.DataFrame): Training target values, one column per target.
         fit_intercept (bool): Whether to fit the intercept term. Default is True.
+        solver (str): One of SOLVERS. Default is 'auto'.
 
     Returns:
-        dict: Dictionary containing trained model, coefficients, intercept, and R² score.
+        LinearRegression: Fitted model, with the solver that was used as solver_.
 
     Raises:
-        ValueError: If input data is missing, dimensions mismatch, or contains NaN values.
+        ValueError: If input data is missing, dimensions mismatch, contains NaN values,
+        or the solver is unknown or does not support sparse features.
     """
     if X_train is None or y_train is None:
         raise ValueError("Both X_train and y_train must be provided.")
 
-    if not isinstance(X_train, pd.DataFrame) or not isinstance(y_train, pd.Series):
-        raise ValueError("X_train must be a DataFrame and y_train must be a Series.")
+    if is_sparse_matrix(X_train):
+        X_train = to_csr(X_train)
+    if not (isinstance(X_train, pd.DataFrame) or is_sparse_matrix(X_train)) or not isinstance(y_train, (pd.Series, pd.DataFrame)):
+        raise ValueError("X_train must be a DataFrame or sparse matrix and y_train must be a Series or DataFrame.")
 
     if X_train.shape[0] != len(y_train):
         raise ValueError("Number of samples in X_train and y_train must match.")
 
-    if X_train.isna().any().any() or y_train.isna().any():
+    if contains_nan(X_train) or contains_nan(y_train):
         raise ValueError("Input data contains NaN values.")
 
-    # Train the Linear Regression model
-    model = LinearRegression(fit_intercept=fit_intercept)
-    model.fit(X_train, y_train)
+    requested, solver = solver, choose_solver(X_train, solver)
+    if solver == 'lstsq':
+        model = LinearRegression(fit_intercept=fit_intercept)
+        model.fit(as_float64(X_train), as_float64(y_train))
+        set_target_names(model, target_names(y_train))
+    else:
+        X = as_float64(X_train) if is_sparse_matrix(X_train) else X_train.to_numpy(dtype=np.float64)
+        Y = y_train.to_numpy(dtype=np.float64).reshape(len(y_train), -1)
+        # Chosen by 'auto', Cholesky must also pass the tighter condition bound
+        options = {}
+        if requested == 'auto' and solver == 'cholesky':
+            options['max_condition'] = AUTO_CHOLESKY_MAX_CONDITION
+        coef, intercept = SOLVER_FUNCTIONS[solver](X, Y, fit_intercept, **options)
+        if coef is None:
+            # Collinear or rank-deficient features: use the minimum-norm SVD solution
+            return linear_regression(X_train, y_train, fit_intercept, solver='lstsq')
+        if isinstance(y_train, pd.Series):
+            coef, intercept = coef[0], float(intercept[0])
+        feature_names = None
+        if isinstance(X_train, pd.DataFrame) and all(isinstance(column, str) for column in X_train.columns):
+            feature_names = list(X_train.columns)
+        model = build_linear_model(coef, intercept, fit_intercept, feature_names,
+                                   target_names=target_names(y_train) if isinstance(y_train, pd.DataFrame) else None)
+    model.solver_ = solver
+
+    return model
+
+
+def choose_solver(X, solver: str = 'auto') -> str:
+    """
+    Validates a solver for features X, resolving 'auto' from X's shape: Cholesky for
+    dense data with up to CHOLESKY_MAX_FEATURES features and at least
+    CHOLESKY_MIN_ROWS_PER_FEATURE rows per feature (linear_regression then also checks
+    its condition bound), otherwise minibatch SGD for data of at least SGD_MIN_CELLS
+    (stored) values and scikit-learn's solver below that.
+
+    Raises:
+        ValueError: If the solver is unknown or needs dense features.
+    """
+    if solver not in SOLVERS:
+        raise ValueError(f"Unsupported solver '{solver}'. Use one of {list(SOLVERS)}.")
+    sparse_input = is_sparse_matrix(X)
+    if sparse_input and solver in ('cholesky', 'qr'):
+        raise ValueError(f"The {solver} solver needs dense features; use lstsq or sgd for sparse ones.")
+    if solver != 'auto':
+        return solver
+
+    n, p = X.shape
+    if not sparse_input and p <= CHOLESKY_MAX_FEATURES and n >= CHOLESKY_MIN_ROWS_PER_FEATURE * p:
+        return 'cholesky'
+    if (X.nnz if sparse_input else n * p) >= SGD_MIN_CELLS:
+        return 'sgd'
+    return 'lstsq'
+
+
+def fit_cholesky(X: np.ndarray, Y: np.ndarray, fit_intercept: bool = True, chunksize: int = None,
+                 max_condition: float = None):
+    """
+    Solves least squares through the normal equations, accumulated over row chunks of
+    about CHUNK_VALUES values unless chunksize is given.
+
+    Returns:
+        tuple: (coef, intercept) of shapes (targets, p) and (targets,), or (None, None)
+        when X'X is too ill-conditioned for a Cholesky solve, or its scaled condition
+        number exceeds max_condition (see solve_normal_equations).
+    """
+    chunksize = chunksize or max(1, CHUNK_VALUES // (X.shape[1] + Y.shape[1]))
+    stats = None
+    for start in range(0, X.shape[0], chunksize):
+        Z = np.column_stack([X[start:start + chunksize], Y[start:start + chunksize]])
+        stats = merge_moments(stats, chunk_moments(Z, centered=fit_intercept))
+    _, mean, cross = stats
+    return solve_normal_equations(mean, cross, fit_intercept, n_targets=Y.shape[1], method='cholesky',
+                                  max_condition=max_condition)
 
+
+def fit_qr(X: np.ndarray, Y: np.ndarray, fit_intercept: bool = True):
+    """
+    Solves least squares with a Householder QR of the (centered) features, without
+    forming Q.
+
+    Returns:
+        tuple: (coef, intercept) of shapes (targets, p) and (targets,), or (None, None)
+        when X has fewer rows than columns or is numerically rank-deficient.
+    """
+    n, p = X.shape
+    if n < p:
+        return None, None
+    mean_x = X.mean(axis=0) if fit_intercept else np.zeros(p)
+    mean_y = Y.mean(axis=0) if fit_intercept else np.zeros(Y.shape[1])
+    # QtY is (Y' Q)'; qr_multiply overwrites the centered copies
+    YtQ, R = linalg.qr_multiply(X - mean_x, (Y - mean_y).T, mode='right', overwrite_a=True, overwrite_c=True)
+    diagonal = np.abs(np.diag(R))
+    if diagonal.min() <= diagonal.max() * np.finfo(np.float64).eps * max(n, p):
+        return None, None
+    coef = linalg.solve_triangular(R, YtQ.T).T
+    return coef, mean_y - coef @ mean_x
+
+
+def fit_sgd(X, Y: np.ndarray, fit_intercept: bool = True, batch_size: int = 1024, max_epochs: int = 50,
+            tol: float = 1e-7, random_state: int = 0):
+    """
+    Solves least squares by minibatch SGD on standardized features and targets.
+
+    Features are standardized implicitly (sparse batches stay sparse). The step size is
+    the inverse of the largest curvature of the loss, estimated on a sample batch, and
+    decays per epoch; the averaged iterate of each epoch is kept, and training stops once
+    an epoch changes it by less than tol (relative).
+
+    Returns:
+        tuple: (coef, intercept) of shapes (targets, p) and (targets,).
+    """
+    n, p = X.shape
+    if is_sparse_matrix(X):
+        # Column sums over slices of the stored values, without copying X
+        total, square = np.zeros(p), np.zeros(p)
+        for start in range(0, X.nnz, CHUNK_VALUES):
+            indices, data = X.indices[start:start + CHUNK_VALUES], X.data[start:start + CHUNK_VALUES]
+            total += np.bincount(indices, weights=data, minlength=p)
+            square += np.bincount(indices, weights=data ** 2, minlength=p)
+        mean_x = total / n if fit_intercept else np.zeros(p)
+        square /= n
+    else:
+        mean_x = X.mean(axis=0) if fit_intercept else np.zeros(p)
+        square = np.einsum('ij,ij->j', X, X) / n
+    scale_x = np.sqrt(np.maximum(square - mean_x ** 2, 0))
+    scale_x[scale_x == 0] = 1.0
+    mean_y = Y.mean(axis=0) if fit_intercept else np.zeros(Y.shape[1])
+    scale_y = np.sqrt(((Y - mean_y) ** 2).mean(axis=0))
+    scale_y[scale_y == 0] = 1.0
+
+    rng = np.random.default_rng(random_state)
+    sample = np.sort(rng.choice(n, min(n, 4 * batch_size), replace=False))
+    learning_rate = 1.0 / largest_curvature(X[sample], mean_x, scale_x)
+    W = np.zeros((p, Y.shape[1]))
+    averaged = W.copy()
+    for epoch in range(max_epochs):
+        step = learning_rate / np.sqrt(epoch + 1)
+        order = rng.permutation(n)
+        total, batches = np.zeros_like(W), 0
+        for start in range(0, n, batch_size):
+            # Sorted positions read X in memory order
+            rows = np.sort(order[start:start + batch_size])
+            X_batch = X[rows]
+            Y_batch = (Y[rows] - mean_y) / scale_y
+            W_raw = W / scale_x[:, None]
+            residual = X_batch @ W_raw - mean_x @ W_raw - Y_batch
+            gradient = (X_batch.T @ residual - np.outer(mean_x, residual.sum(axis=0))) / scale_x[:, None]
+            W -= step * gradient / len(rows)
+            total += W
+            batches += 1
+        previous, averaged = averaged, total / batches
+        if epoch and np.linalg.norm(averaged - previous) <= tol * max(np.linalg.norm(averaged), 1.0):
+            break
+
+    coef = (averaged / scale_x[:, None] * scale_y).T
+    return coef, mean_y - coef @ mean_x
+
+
+def largest_curvature(X_sample, mean_x: np.ndarray, scale_x: np.ndarray, iterations: int = 30) -> float:
+    """
+    Largest eigenvalue of the covariance of the standardized sample, by power iteration
+    (products with the sample only, so sparse samples stay sparse).
+    """
+    v = np.full(len(mean_x), 1.0 / np.sqrt(len(mean_x)))
+    eigenvalue = 1.0
+    for _ in range(iterations):
+        u = X_sample @ (v / scale_x) - mean_x @ (v / scale_x)
+        w = (X_sample.T @ u - mean_x * u.sum()) / scale_x / X_sample.shape[0]
+        eigenvalue = np.linalg.norm(w)
+        if eigenvalue == 0:
+            return 1.0
+        v = w / eigenvalue
+    return eigenvalue
+
+
+SOLVER_FUNCTIONS = {'cholesky': fit_cholesky, 'qr': fit_qr, 'sgd': fit_sgd}
+
+
+def as_float64(data):
+    """
+    data with float64 values, unchanged when it already is. DataFrames keep their column
+    names and sparse matrices their format.
+    """
+    if isinstance(data, pd.DataFrame):
+        if all(dtype == np.float64 for dtype in data.dtypes):
+            return data
+        return data.astype(np.float64)
+    if data.dtype == np.float64:
+        return data
+    return data.astype(np.float64)
+
+
+def target_names(y) -> list:
+    """Names of the targets of a Series (one target) or DataFrame (one per column)."""
+    if isinstance(y, pd.DataFrame):
+        return [str(column) for column in y.columns]
+    return [str(y.name)] if y.name is not None else []
+
+
+def set_target_names(model, names):
+    """
+    Records the names of the targets a model predicts, so predictions of multi-target
+    models can be labelled per target (scikit-learn does not keep them).
+    """
+    if names:
+        model.target_names_ = np.asarray(names, dtype=object)
+
+
+def linear_regression_chunked(file_path: str, feature_columns: list, target_column,
+                              fit_intercept: bool = True, chunksize: int = 100_000):
+    """
+    Trains a Linear Regression model by streaming a CSV file in chunks.
+
+    Only the normal-equation statistics (row count, means and the centered cross-products
+    of the features and target) are kept between chunks, so memory is bounded by
+    chunksize and the number of features rather than by the file size. The result
+    matches sklearn's LinearRegression on the full data up to numerical tolerance.
+
+    Args:
+        file_path (str): Path to the CSV file.
+        feature_columns (list): Feature column names.
+        target_column (str | list): Target column name, or a list of target columns fitted together.
+        fit_intercept (bool): Whether to fit the intercept term. Default is True.
+        chunksize (int): Number of rows read per chunk. Default is 100,000.
+
+    Returns:
+        LinearRegression: Fitted model.
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist.
+        ValueError: If columns are missing, the data contains NaN values or the file is empty.
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"File not found: {file_path}")
+    if not isinstance(feature_columns, list) or not feature_columns:
+        raise ValueError("feature_columns must be a non-empty list.")
+    if not target_column:
+        raise ValueError("target_column must be provided.")
+    if chunksize < 1:
+        raise ValueError("chunksize must be positive.")
+
+    targets = target_column if isinstance(target_column, list) else [target_column]
+    columns = feature_columns + targets
+    try:
+        reader = pd.read_csv(file_path, usecols=columns, chunksize=chunksize)
+    except ValueError as e:
+        raise ValueError(f"Error reading CSV file: {e}")
+
+    stats = None
+    with reader:
+        for chunk in reader:
+            Z = chunk[columns].to_numpy(dtype=np.float64)
+            if np.isnan(Z).any():
+                raise ValueError("Input data contains NaN values.")
+            stats = merge_moments(stats, chunk_moments(Z, centered=fit_intercept))
+
+    if stats is None or stats[0] == 0:
+        raise ValueError("The dataset contains no rows.")
+
+    n, mean, cross = stats
+    multi = isinstance(target_column, list)
+    coef, intercept = solve_normal_equations(mean, cross, fit_intercept, n_targets=len(targets) if multi else None)
+    return build_linear_model(coef, intercept, fit_intercept, feature_columns,
+                              target_names=targets if multi else None)
+
+
+def chunk_moments(Z: np.ndarray, centered: bool = True):
+    """
+    Returns (n, mean, cross-products) of the rows of Z. Cross-products are taken
+    around the mean when centered, otherwise around zero (for fits without intercept).
+    """
+    n = Z.shape[0]
+    if not centered:
+        return n, np.zeros(Z.shape[1]), Z.T @ Z
+    mean = Z.mean(axis=0)
+    D = Z - mean
+    return n, mean, D.T @ D
+
+
+def merge_moments(a, b):
+    """
+    Combines the moments of two row blocks (Chan et al.'s pairwise update), which stays
+    accurate when the column means are large compared with their spread.
+    """
+    if a is None or a[0] == 0:
+        return b
+    if b[0] == 0:
+        return a
+    n_a, mean_a, cross_a = a
+    n_b, mean_b, cross_b = b
+    n = n_a + n_b
+    delta = mean_b - mean_a
+    mean = mean_a + delta * (n_b / n)
+    cross = cross_a + cross_b + np.outer(delta, delta) * (n_a * n_b / n)
+    return n, mean, cross
+
+
+def solve_normal_equations(mean: np.ndarray, cross: np.ndarray, fit_intercept: bool = True,
+                           n_targets: int = None, method: str = 'lstsq', max_condition: float = None):
+    """
+    Solves for the coefficients from the moments of [X, Y] (targets in the last positions).
+
+    Uses a least-squares solve of the Gram system, which gives the minimum-norm solution
+    for rank-deficient features like sklearn does. All targets are solved together,
+    factorizing the Gram matrix of X once.
+
+    Args:
+        n_targets (int): Number of target columns. None means a single target, returned
+            as 1-D coefficients and a float intercept like sklearn does for a 1-D y.
+        method (str): 'lstsq', or 'cholesky' for a faster Cholesky solve of well-conditioned
+            systems.
+        max_condition (float): With method='cholesky', the largest estimated condition
+            number of the Gram matrix (scaled to a unit diagonal) that is solved.
+
+    Returns:
+        tuple: (coef, intercept), with coef of shape (n_targets, n_features) and intercept
+        of shape (n_targets,) when n_targets is given. With method='cholesky', (None, None)
+        when the Gram matrix is not safely positive definite or exceeds max_condition.
+    """
+    k = len(mean) - (n_targets or 1)
+    XtX = cross[:k, :k]
+    XtY = cross[:k, k:]
+    if method == 'cholesky':
+        try:
+            factor = linalg.cho_factor(XtX, check_finite=False)
+        except linalg.LinAlgError:
+            return None, None
+        # The factor's diagonal ratio bounds X's condition number from below; the solve
+        # loses about cond(X)² * eps of relative precision
+        diagonal = np.abs(np.diag(factor[0]))
+        if diagonal.min() <= diagonal.max() * np.finfo(np.float64).eps ** 0.25:
+            return None, None
+        if max_condition is not None and scaled_condition(factor[0], XtX) > max_condition:
+            return None, None
+        coef = linalg.cho_solve(factor, XtY, check_finite=False).T
+    else:
+        coef = np.linalg.lstsq(XtX, XtY, rcond=None)[0].T
+    intercept = mean[k:] - coef @ mean[:k] if fit_intercept else np.zeros(coef.shape[0])
+    if n_targets is None:
+        return coef[0], float(intercept[0])
+    return coef, intercept
+
+
+def scaled_condition(factor: np.ndarray, gram: np.ndarray) -> float:
+    """
+    Estimates the 1-norm condition number of a Gram matrix from its upper Cholesky
+    factor in O(p²), after scaling it to a unit diagonal: the accuracy of a Cholesky
+    solve does not depend on the units of the features, only on their collinearity.
+    """
+    scale = 1 / np.sqrt(np.diag(gram))
+    scaled_norm = np.abs(gram * np.outer(scale, scale)).sum(axis=0).max()
+    rcond, info = lapack.dpocon(np.triu(factor) * scale, scaled_norm)
+    return np.inf if info != 0 or rcond <= 0 else 1 / rcond
+
+
+def build_linear_model(coef, intercept, fit_intercept: bool = True, feature_names: list = None,
+                       target_names: list = None):
+    """
+    Builds a fitted sklearn LinearRegression from known coefficients, so models solved
+    outside of sklearn (or loaded from storage) can be used wherever a trained model is expected.
+    Multi-target models have 2-D coef of shape (n_targets, n_features).
+    """
+    model = LinearRegression(fit_intercept=fit_intercept)
+    model.coef_ = np.asarray(coef, dtype=np.float64)
+    model.intercept_ = intercept if np.ndim(intercept) else float(intercept)
+    model.n_features_in_ = model.coef_.shape[-1]
+    if feature_names is not None and len(feature_names):
+        model.feature_names_in_ = np.asarray([str(name) for name in feature_names], dtype=object)
+    set_target_names(model, target_names)
     return model
@@ -1,19 +1,23 @@
 import pandas as pd
 import numpy as np
 
-def feature_selection(dataframe: pd.DataFrame, target_column: str, feature_columns: list):
+from node.artifacts import freeze, remember_derived
+
+def feature_selection(dataframe: pd.DataFrame, target_column, feature_columns: list):
     """
-    Selects features and target column from a DataFrame and computes feature statistics.
+    Selects features and target column from a DataFrame. Column statistics are
+    served by the dataset profile (see node.services.input.profile).
 
     Args:
         dataframe (pd.DataFrame): Input dataset containing all columns.
-        target_column (str): Name of the target variable column.
+        target_column (str | list): Name of the target variable column, or a list of
+            target columns for multi-target models.
         feature_columns (list): List of feature column names to select.
 
     Returns:
         dict: Dictionary containing:
             - X: DataFrame with selected feature columns
-            - y: Series with target values
+            - y: Series with target values, or a DataFrame for a list of targets
 
     Raises:
         ValueError: If required columns are missing or inputs are invalid.
@@ -24,14 +28,20 @@ def feature_selection(dataframe: pd.DataFrame, target_column: str, feature_colum
         raise ValueError("Input must be a pandas DataFrame.")
     if not isinstance(feature_columns, list) or not feature_columns:
         raise ValueError("feature_columns must be a non-empty list.")
-    if target_column not in dataframe.columns:
-        raise ValueError(f"Target column '{target_column}' not found in DataFrame.")
+    target_columns = target_column if isinstance(target_column, list) else [target_column]
+    if not target_columns:
+        raise ValueError("At least one target column must be provided.")
+    for column in target_columns:
+        if column not in dataframe.columns:
+            raise ValueError(f"Target column '{column}' not found in DataFrame.")
 
     missing_features = [col for col in feature_columns if col not in dataframe.columns]
     if missing_features:
         raise ValueError(f"Missing feature columns: {missing_features}")
 
-    X = dataframe[feature_columns]
-    y = dataframe[target_column]
+    X = freeze(dataframe[feature_columns])
+    y = freeze(dataframe[target_column])
+    remember_derived(X, dataframe, ['columns', feature_columns])
+    remember_derived(y, dataframe, ['column', target_column])
 
     return {"X": X, "y": y}
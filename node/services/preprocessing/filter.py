@@ -0,0 +1,107 @@
+import pandas as pd
+import numpy as np
+
+from node.artifacts import freeze, remember_derived
+
+OPERATORS = ('==', '!=', '<', '<=', '>', '>=', 'in', 'not in', 'is null', 'not null')
+
+
+def filter_rows(dataframe: pd.DataFrame, conditions: list):
+    """
+    Keeps the rows of a DataFrame that satisfy all conditions.
+
+    Args:
+        dataframe (pd.DataFrame): Input dataset.
+        conditions (list): Predicates {'column', 'op', 'value'} combined with AND, where op
+            is one of ==, !=, <, <=, >, >=, in, not in, is null, not null
+            (e.g. {"column": "age", "op": ">=", "value": 18}).
+
+    Returns:
+        dict: Dictionary containing:
+            - data: DataFrame with the matching rows, keeping their original index
+            - rows: Number of matching rows
+
+    Raises:
+        ValueError: If the conditions are invalid or refer to missing columns.
+    """
+    if dataframe is None:
+        raise ValueError("A valid dataframe must be provided.")
+    if not isinstance(dataframe, pd.DataFrame):
+        raise ValueError("Input must be a pandas DataFrame.")
+
+    data = freeze(dataframe[row_mask(dataframe, conditions)])
+    remember_derived(data, dataframe, ['filter', conditions])
+    return {"data": data, "rows": len(data)}
+
+
+def validate_conditions(conditions: list):
+    """
+    Checks that conditions is a list of {'column', 'op', 'value'} predicates.
+
+    Raises:
+        ValueError: If a condition is malformed.
+    """
+    if not isinstance(conditions, list):
+        raise ValueError("conditions must be a list.")
+    for condition in conditions:
+        if not isinstance(condition, dict) or 'column' not in condition:
+            raise ValueError(f"Invalid condition: {condition}")
+        op = condition.get('op', '==')
+        if op not in OPERATORS:
+            raise ValueError(f"Unsupported operator '{op}'. Use one of {list(OPERATORS)}.")
+        if op in ('in', 'not in') and not isinstance(condition.get('value'), list):
+            raise ValueError(f"Operator '{op}' needs a list value.")
+        if op not in ('is null', 'not null') and 'value' not in condition:
+            raise ValueError(f"Condition on '{condition['column']}' needs a value.")
+
+
+def condition_columns(conditions: list) -> list:
+    """Columns referred to by a list of conditions."""
+    return list(dict.fromkeys(condition['column'] for condition in conditions))
+
+
+def row_mask(dataframe: pd.DataFrame, conditions: list) -> np.ndarray:
+    """
+    Evaluates conditions (combined with AND) on a DataFrame or a chunk of one.
+
+    Returns:
+        np.ndarray: Boolean mask of the matching rows.
+
+    Raises:
+        ValueError: If the conditions are invalid or refer to missing columns.
+    """
+    validate_conditions(conditions)
+    missing = [col for col in condition_columns(conditions) if col not in dataframe.columns]
+    if missing:
+        raise ValueError(f"Missing filter columns: {missing}")
+
+    mask = np.ones(len(dataframe), dtype=bool)
+    for condition in conditions:
+        column = dataframe[condition['column']]
+        op = condition.get('op', '==')
+        value = condition.get('value')
+        try:
+            if op == 'is null':
+                matches = column.isna()
+            elif op == 'not null':
+                matches = column.notna()
+            elif op == 'in':
+                matches = column.isin(value)
+            elif op == 'not in':
+                matches = ~column.isin(value)
+            elif op == '==':
+                matches = column == value
+            elif op == '!=':
+                matches = column != value
+            elif op == '<':
+                matches = column < value
+            elif op == '<=':
+                matches = column <= value
+            elif op == '>':
+                matches = column > value
+            else:
+                matches = column >= value
+        except TypeError as e:
+            raise ValueError(f"Cannot compare column '{condition['column']}' with {value!r}: {e}")
+        mask &= matches.fillna(False).to_numpy(dtype=bool)
+    return mask
@@ -0,0 +1,128 @@
+import hashlib
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from node.artifacts import freeze, remember_derived
+
+
+def hash_encode(X: pd.DataFrame, columns: list = None, n_buckets: int = 2 ** 20, chunksize: int = 100_000):
+    """
+    Encodes categorical columns with the hashing trick into a sparse feature matrix.
+
+    Every (column, value) pair is hashed to one of n_buckets indicator columns, so no
+    vocabulary is built and memory does not depend on the number of distinct values.
+    The remaining (numeric) columns are passed through as the first columns of the
+    matrix. Rows are encoded chunk by chunk, so temporary memory is bounded by chunksize.
+    Missing categorical values are left out; colliding values in a row add up.
+
+    Args:
+        X (pd.DataFrame): Features to encode.
+        columns (list): Columns to hash. Defaults to every non-numeric column.
+        n_buckets (int): Number of hashed columns. Default is 2**20.
+        chunksize (int): Number of rows encoded at a time. Default is 100,000.
+
+    Returns:
+        dict: Dictionary containing:
+            - X: CSR matrix of shape (rows, len(numeric_columns) + n_buckets)
+            - columns: Hashed columns
+            - numeric_columns: Passed-through columns, in matrix order
+            - n_features: Number of columns of X
+
+    Raises:
+        ValueError: If inputs are invalid, columns are missing or a column that is
+        not hashed is not numeric.
+    """
+    if X is None:
+        raise ValueError("A valid dataframe must be provided.")
+    if not isinstance(X, pd.DataFrame):
+        raise ValueError("Input must be a pandas DataFrame.")
+    if isinstance(n_buckets, bool) or not isinstance(n_buckets, int) or n_buckets < 1:
+        raise ValueError("n_buckets must be a positive integer.")
+    if chunksize < 1:
+        raise ValueError("chunksize must be positive.")
+
+    if not columns:
+        columns = [column for column in X.columns if not is_numeric_column(X[column])]
+    missing = [column for column in columns if column not in X.columns]
+    if missing:
+        raise ValueError(f"Missing columns: {missing}")
+
+    hashed = set(columns)
+    numeric_columns = [column for column in X.columns if column not in hashed]
+    not_numeric = [column for column in numeric_columns if not is_numeric_column(X[column])]
+    if not_numeric:
+        raise ValueError(f"Columns {not_numeric} are not numeric; add them to the hashed columns.")
+
+    n_features = len(numeric_columns) + n_buckets
+    seeds = [column_seed(column) for column in columns]
+    chunks = [
+        encode_chunk(X.iloc[start:start + chunksize], columns, seeds, numeric_columns, n_buckets)
+        for start in range(0, len(X), chunksize)
+    ]
+    if chunks:
+        matrix = sparse.vstack(chunks, format='csr')
+    else:
+        matrix = sparse.csr_matrix((0, n_features))
+    matrix = freeze(matrix)
+    remember_derived(matrix, X, ['hash_encode', list(columns), n_buckets])
+
+    return {
+        "X": matrix,
+        "columns": list(columns),
+        "numeric_columns": numeric_columns,
+        "n_features": n_features,
+    }
+
+
+def encode_chunk(chunk: pd.DataFrame, columns: list, seeds: list, numeric_columns: list, n_buckets: int):
+    """Encodes a block of rows; see hash_encode."""
+    n_rows = len(chunk)
+    rows, cols, values = [], [], []
+
+    if numeric_columns:
+        block = chunk[numeric_columns].to_numpy(dtype=np.float64)
+        rows.append(np.repeat(np.arange(n_rows), block.shape[1]))
+        cols.append(np.tile(np.arange(block.shape[1]), n_rows))
+        values.append(block.ravel())
+
+    offset = len(numeric_columns)
+    for column, seed in zip(columns, seeds):
+        series = chunk[column]
+        present = series.notna().to_numpy()
+        keys = pd.util.hash_pandas_object(series[present], index=False).to_numpy()
+        rows.append(np.flatnonzero(present))
+        cols.append(offset + bucket_of(keys, seed, n_buckets))
+        values.append(np.ones(len(keys)))
+
+    matrix = sparse.csr_matrix(
+        (np.concatenate(values), (np.concatenate(rows), np.concatenate(cols))),
+        shape=(n_rows, offset + n_buckets),
+    )
+    # Zeros of the numeric columns are not stored
+    matrix.eliminate_zeros()
+    return matrix
+
+
+def bucket_of(keys: np.ndarray, seed: np.uint64, n_buckets: int) -> np.ndarray:
+    """
+    Maps the 64-bit hashes of a column's values to buckets, mixed with the column's seed
+    (splitmix64 finalizer) so equal values of different columns land in unrelated buckets.
+    """
+    # uint64 arithmetic wraps around, which is intended
+    with np.errstate(over='ignore'):
+        x = keys ^ seed
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        x = x ^ (x >> np.uint64(31))
+    return (x % np.uint64(n_buckets)).astype(np.int64)
+
+
+def column_seed(column) -> np.uint64:
+    """Stable 64-bit seed of a column name, identical across processes."""
+    return np.uint64(int.from_bytes(hashlib.sha256(str(column).encode()).digest()[:8], 'little'))
+
+
+def is_numeric_column(series: pd.Series) -> bool:
+    return pd.api.types.is_numeric_dtype(series.dtype) and not isinstance(series.dtype, pd.CategoricalDtype)
@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+
+from node.artifacts import freeze, remember_derived, remember_rows
+
+STRATEGIES = ('mean', 'median', 'constant', 'drop')
+
+
+def impute(dataframe: pd.DataFrame, strategy: str = 'mean', columns: list = None, fill_value=None):
+    """
+    Fills or drops missing values of a DataFrame.
+
+    One NaN mask is built per column, in a single pass. Only the columns with missing
+    values are copied and filled; the others are shared with the input, which is never
+    modified (it may be a cached output or a read-only memory-mapped artifact). Dropped
+    rows are recorded as a row view of the input, so storing the result only stores the
+    kept positions.
+
+    The result is fingerprinted (see node.artifacts.remember_fingerprint) with whether
+    missing values remain, so downstream nodes skip their NaN scans.
+
+    Args:
+        dataframe (pd.DataFrame): Input dataset.
+        strategy (str): 'mean', 'median', 'constant' (fill with fill_value) or 'drop'
+            (drop rows with a missing value). Default is 'mean'.
+        columns (list): Columns to handle. Defaults to every column.
+        fill_value: Value used by the 'constant' strategy.
+
+    Returns:
+        dict: Dictionary containing:
+            - data: DataFrame with the missing values filled or their rows dropped
+            - rows: Number of rows of data
+            - missing: Number of missing values per handled column
+            - clean: Whether data has no missing values left
+
+    Raises:
+        ValueError: If inputs are invalid, columns are missing, or mean/median is asked
+        for a non-numeric column with missing values.
+    """
+    if dataframe is None:
+        raise ValueError("A valid dataframe must be provided.")
+    if not isinstance(dataframe, pd.DataFrame):
+        raise ValueError("Input must be a pandas DataFrame.")
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unsupported strategy '{strategy}'. Use one of {list(STRATEGIES)}.")
+    if strategy == 'constant' and fill_value is None:
+        raise ValueError("The constant strategy needs a fill_value.")
+
+    columns = list(dataframe.columns) if not columns else list(columns)
+    missing_columns = [column for column in columns if column not in dataframe.columns]
+    if missing_columns:
+        raise ValueError(f"Missing columns: {missing_columns}")
+
+    masks = {column: dataframe[column].isna().to_numpy() for column in dataframe.columns}
+    missing = {column: int(masks[column].sum()) for column in columns}
+
+    if strategy == 'drop':
+        dropped = np.zeros(len(dataframe), dtype=bool)
+        for column in columns:
+            if missing[column]:
+                dropped |= masks[column]
+        if dropped.any():
+            positions = np.flatnonzero(~dropped)
+            data = freeze(dataframe.iloc[positions])
+            remember_rows(data, dataframe, pd.Series(positions, name='position'))
+        else:
+            data = dataframe.copy(deep=False)
+        clean = not any(masks[column][~dropped].any() for column in dataframe.columns)
+    else:
+        data = dataframe.copy(deep=False)
+        for column in columns:
+            if missing[column]:
+                data[column] = fill_column(dataframe[column], masks[column], strategy, fill_value)
+        handled = set(columns)
+        clean = not any(masks[column].any() for column in dataframe.columns if column not in handled)
+
+    data = freeze(data)
+    remember_derived(data, dataframe, ['impute', strategy, columns, fill_value], nan_free=clean)
+    return {"data": data, "rows": len(data), "missing": missing, "clean": clean}
+
+
+def fill_column(series: pd.Series, mask: np.ndarray, strategy: str, fill_value=None) -> pd.Series:
+    """
+    Returns a filled copy of a column given its NaN mask; see impute. Columns filled
+    with their mean or median become float64.
+    """
+    if strategy == 'constant':
+        if isinstance(series.dtype, np.dtype) and series.dtype.kind == 'f':
+            values = series.to_numpy(copy=True)
+            values[mask] = fill_value
+            return pd.Series(values, index=series.index, name=series.name)
+        if isinstance(series.dtype, pd.CategoricalDtype) and fill_value not in series.cat.categories:
+            series = series.cat.add_categories([fill_value])
+        return series.where(~mask, fill_value)
+
+    if not pd.api.types.is_numeric_dtype(series.dtype) or pd.api.types.is_bool_dtype(series.dtype):
+        raise ValueError(f"Column '{series.name}' is not numeric; use the constant or drop strategy.")
+    values = series.to_numpy(dtype=np.float64, na_value=np.nan, copy=True)
+    present = values[~mask]
+    if not len(present):
+        raise ValueError(f"Column '{series.name}' has no values to compute the {strategy} from.")
+    values[mask] = present.mean() if strategy == 'mean' else np.median(present)
+    return pd.Series(values, index=series.index, name=series.name)
@@ -1,38 +1,93 @@
+import numpy as np
 import pandas as pd
-from sklearn.model_selection import train_test_split
 
-def train_test_split(X: pd.DataFrame, y: pd.Series, test_size: float = 0.2):
+from node.artifacts import RowView
+from node.services.sparse import contains_nan, is_sparse_matrix, to_csr
+
+def train_test_split(X, y, test_size: float = 0.2,
+                     random_state: int = None, stratify: bool = False):
     """
     Splits dataset into training and testing sets and computes split statistics.
 
+    The split is a seeded permutation of row positions, so the same seed always gives
+    the same split. The four outputs are row views of X and y holding only those
+    positions: the rows are copied when a node reads them (see node.artifacts.RowView),
+    and storing them only stores the positions.
+
     Args:
-        X (pd.DataFrame): Feature DataFrame.
-        y (pd.Series): Target Series.
+        X (pd.DataFrame | scipy.sparse matrix): Feature DataFrame, or a sparse matrix
+            which is split in CSR format without being densified.
+        y (pd.Series | pd.DataFrame): Target Series, or a DataFrame of several targets.
         test_size (float): Proportion of dataset for testing. Default is 0.2.
+        random_state (int): Seed of the permutation. A random seed is drawn if None.
+        stratify (bool): Whether to keep the class proportions of y in both sets. Needs a
+            single target.
 
     Returns:
-        dict: Dictionary containing X_train, X_test, y_train, y_test
+        dict: Dictionary containing X_train, X_test, y_train, y_test (RowView), the
+        sorted train_index and test_index row positions (Series) and the random_state used
 
     Raises:
         ValueError: If inputs are invalid or contain NaN values.
     """
     if X is None or y is None:
         raise ValueError("Both X and y must be provided.")
-    if not isinstance(X, pd.DataFrame) or not isinstance(y, pd.Series):
-        raise ValueError("X must be a DataFrame and y must be a Series.")
+    if is_sparse_matrix(X):
+        X = to_csr(X)
+    if not (isinstance(X, pd.DataFrame) or is_sparse_matrix(X)) or not isinstance(y, (pd.Series, pd.DataFrame)):
+        raise ValueError("X must be a DataFrame or sparse matrix and y must be a Series or DataFrame.")
+    if stratify and isinstance(y, pd.DataFrame):
+        raise ValueError("stratify needs a single target.")
     if not 0 < test_size < 1:
         raise ValueError("test_size must be between 0 and 1.")
-    if X.isna().any().any() or y.isna().any():
+    if contains_nan(X) or contains_nan(y):
         raise ValueError("Input data contains NaN values.")
-    if len(X) != len(y):
+    if X.shape[0] != len(y):
         raise ValueError("Number of samples in X and y must match.")
 
-    # Perform train-test split
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=test_size)
+    if random_state is None:
+        # Stored in an IntegerField, so kept below 2**31
+        random_state = int(np.random.default_rng().integers(0, 2 ** 31 - 1))
+
+    train_positions, test_positions = split_indices(
+        X.shape[0], test_size, random_state, labels=y.to_numpy() if stratify else None
+    )
+    train_index = pd.Series(train_positions, name="train_index")
+    test_index = pd.Series(test_positions, name="test_index")
 
+    # Validated above, so the model and metric nodes need not scan the rows again
     return {
-        "X_train": X_train,
-        "X_test": X_test,
-        "y_train": y_train,
-        "y_test": y_test
+        "X_train": RowView(X, train_index, nan_free=True),
+        "X_test": RowView(X, test_index, nan_free=True),
+        "y_train": RowView(y, train_index, nan_free=True),
+        "y_test": RowView(y, test_index, nan_free=True),
+        "train_index": train_index,
+        "test_index": test_index,
+        "random_state": random_state,
     }
+
+
+def split_indices(n_samples: int, test_size: float, random_state: int, labels: np.ndarray = None):
+    """
+    Returns sorted (train_index, test_index) row positions from a seeded permutation.
+    With labels, each class is split separately so both sets keep the class proportions.
+    """
+    rng = np.random.default_rng(random_state)
+
+    if labels is None:
+        n_test = int(np.ceil(test_size * n_samples))
+        if n_test >= n_samples:
+            raise ValueError("test_size leaves no samples for training.")
+        permutation = rng.permutation(n_samples)
+        return np.sort(permutation[n_test:]), np.sort(permutation[:n_test])
+
+    classes, class_of_row = np.unique(labels, return_inverse=True)
+    if (np.bincount(class_of_row) < 2).any():
+        raise ValueError("Every class needs at least 2 samples to stratify.")
+    train_parts, test_parts = [], []
+    for class_index in range(len(classes)):
+        rows = rng.permutation(np.flatnonzero(class_of_row == class_index))
+        n_test = min(max(int(round(test_size * len(rows))), 1), len(rows) - 1)
+        test_parts.append(rows[:n_test])
+        train_parts.append(rows[n_test:])
+    return np.sort(np.concatenate(train_parts)), np.sort(np.concatenate(test_parts))
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from node.artifacts import known_fingerprint
+
+
+def is_sparse_matrix(value):
+    return sparse.issparse(value)
+
+
+def to_csr(X):
+    """
+    Returns a SciPy sparse matrix in CSR format (X itself when it already is one), which
+    supports fast row selection and is accepted by the scikit-learn estimators.
+
+    Raises:
+        ValueError: If the matrix is not 2-dimensional or its values are not numeric.
+    """
+    if X.ndim != 2:
+        raise ValueError("Sparse features must be a 2-dimensional matrix.")
+    if X.dtype.kind not in 'biuf':
+        raise ValueError(f"Sparse features must be numeric, got dtype {X.dtype}.")
+    return X if X.format == 'csr' else X.tocsr()
+
+
+def contains_nan(value):
+    """
+    Whether a DataFrame, Series, array or sparse matrix contains NaN values. Sparse
+    matrices are checked on their stored values only, without densifying them.
+
+    Values with a validation fingerprint (see node.artifacts.remember_fingerprint) are
+    trusted and not scanned. Other values are scanned every time: the caller may still
+    modify them, so the result is not recorded.
+    """
+    fingerprint = known_fingerprint(value)
+    if fingerprint is not None and fingerprint['nan_free'] is not None:
+        return not fingerprint['nan_free']
+
+    if is_sparse_matrix(value):
+        data = value.data if value.format in ('csr', 'csc', 'coo', 'bsr') else value.tocsr().data
+        found = data.dtype.kind == 'f' and bool(np.isnan(data).any())
+    elif isinstance(value, pd.DataFrame):
+        found = bool(value.isna().any().any())
+    elif isinstance(value, pd.Series):
+        found = bool(value.isna().any())
+    else:
+        return bool(pd.isna(np.asarray(value)).any())
+    return found
+
+
+def to_vector(value, name):
+    """
+    Returns a target or prediction vector as a Series. Sparse inputs must have a single
+    row or column; only that vector is densified.
+
+    Raises:
+        ValueError: If the value is not a Series, a 1-dimensional array or a sparse vector.
+    """
+    if isinstance(value, pd.Series):
+        return value
+    if is_sparse_matrix(value):
+        if value.ndim == 2 and 1 not in value.shape:
+            raise ValueError(f"{name} must be a single sparse row or column.")
+        return pd.Series(value.toarray().ravel(), name=name)
+    if isinstance(value, np.ndarray) and value.ndim == 1:
+        return pd.Series(value, name=name)
+    raise ValueError(f"{name} must be a pandas Series, a 1-dimensional array or a sparse vector.")
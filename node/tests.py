@@ -1,3 +1,1000 @@
-from django.test import TestCase
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+import pandas as pd
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from scipy import sparse
+from sklearn.linear_model import LinearRegression as SklearnLinearRegression
+
+from node import jobs, model_registry, views
+from node.artifacts import (
+    RowView, artifact_exists, artifact_path, artifacts_owned_by, content_hash, freeze, known_fingerprint,
+    known_rows, materialize, open_artifact, prune_artifacts, read_artifact_meta, remember_fingerprint,
+    save_artifact,
+)
+from node.models import Dataset, Job
+from node.modules.model.linear_regression import fit_from_gram
+from node.services.evaluation.accuracy import accuracy_metric
+from node.services.evaluation.predict import predict
+from node.services.input.dataset import (
+    columnar_copy_id, csv_engine, dataset as load_dataset, filtered_dataset, read_csv_file, sampled_dataset,
+)
+from node.services.input.sample import ChunkSampler, sample_rows
+from node.services.model import grouped_regression, linear_regression as linear_regression_module
+from node.services.model.grouped_regression import grouped_linear_regression
+from node.services.model.linear_regression import choose_solver, linear_regression, linear_regression_chunked
+from node.services.preprocessing.feature_selection import feature_selection
+from node.services.preprocessing.filter import filter_rows
+from node.services.preprocessing.hash_encoding import hash_encode
+from node.services.preprocessing.imputation import impute
+from node.services.preprocessing.train_test_split import train_test_split
+from node.services.sparse import contains_nan
+from project.models import Workspace
+
+
+class DatabaseJobQueueTests(TestCase):
+
+    def setUp(self):
+        # Without worker threads jobs only run when work_once is called
+        self.queue = jobs.DatabaseJobQueue(workers=0)
+        self.user = get_user_model().objects.create(username='owner', email='owner@example.com')
+        self.other = get_user_model().objects.create(username='other', email='other@example.com')
+        self.workspace = Workspace.objects.create(user=self.user, name='workspace')
+
+    def submit(self, kind, payload, user=None):
+        job = jobs.new_job(kind, payload, (user or self.user).id)
+        return self.queue.submit(job)
+
+    def test_job_lifecycle(self):
+        job = self.submit('workspace.run', {'workspace_id': self.workspace.id})
+        self.assertEqual(self.queue.get(job['id'])['status'], jobs.QUEUED)
+
+        finished = self.queue.work_once(timeout=0)
+        self.assertEqual(finished['id'], job['id'])
+
+        stored = self.queue.get(job['id'])
+        self.assertEqual(stored['status'], jobs.SUCCEEDED)
+        self.assertEqual(stored['result']['nodes'], [])
+        self.assertIsNotNone(stored['started_at'])
+        self.assertIsNotNone(stored['finished_at'])
+        self.assertIsNone(self.queue.work_once(timeout=0))
+
+    def test_failed_job_records_error(self):
+        job = self.submit('node.execute', {'node_type': 'Missing', 'payload': {}})
+        self.queue.work_once(timeout=0)
+
+        stored = self.queue.get(job['id'])
+        self.assertEqual(stored['status'], jobs.FAILED)
+        self.assertIn('Unknown node type', stored['error'])
+
+    def test_status_is_only_visible_to_its_owner(self):
+        job = self.submit('workspace.run', {'workspace_id': self.workspace.id})
+        with override_settings(JOB_QUEUE={'BACKEND': 'database', 'WORKERS': 0}):
+            jobs._queue = self.queue
+            self.addCleanup(setattr, jobs, '_queue', None)
+            self.assertEqual(jobs.get_job(job['id'], self.user)['status'], jobs.QUEUED)
+            self.assertNotIn('payload', jobs.get_job(job['id'], self.user))
+            self.assertIsNone(jobs.get_job(job['id'], self.other))
+
+    def test_prune_removes_expired_and_fails_lost_jobs(self):
+        finished = self.submit('workspace.run', {'workspace_id': self.workspace.id})
+        self.queue.work_once(timeout=0)
+        lost = self.submit('workspace.run', {'workspace_id': self.workspace.id})
+        long_ago = timezone.now() - timedelta(days=30)
+        Job.objects.filter(pk=finished['id']).update(finished_at=long_ago)
+        Job.objects.filter(pk=lost['id']).update(status=jobs.RUNNING, started_at=long_ago)
+
+        self.queue.prune()
+        self.assertIsNone(self.queue.get(finished['id']))
+        self.assertEqual(self.queue.get(lost['id'])['status'], jobs.FAILED)
+
+    @override_settings(JOB_QUEUE={'BACKEND': 'redis'}, REDIS_URL=None)
+    def test_redis_backend_requires_redis_url(self):
+        jobs._queue = None
+        self.addCleanup(setattr, jobs, '_queue', None)
+        with self.assertRaises(ImproperlyConfigured):
+            jobs.get_job_queue()
+
+
+class ArtifactTests(TestCase):
+
+    def setUp(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root, ignore_errors=True)
+        settings_override = override_settings(ARTIFACT_ROOT=root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_round_trip(self):
+        frame = pd.DataFrame({'a': [1.5, 2.5], 'b': ['x', 'y']}, index=[10, 20])
+        opened = open_artifact(save_artifact(frame))
+        pd.testing.assert_frame_equal(opened, frame, check_dtype=False)
+        self.assertFalse(opened['a'].to_numpy().flags.writeable)
+
+    def test_string_columns_are_stored_as_arrow(self):
+        frame = pd.DataFrame({
+            'str': pd.Series(['x', None, 'z']),
+            'string': pd.Series(['x', pd.NA, 'z'], dtype='string'),
+            'object': pd.Series(['x', None, 'z'], dtype=object),
+            'mixed': pd.Series([1, 'x', None], dtype=object),
+        })
+        handle = save_artifact(frame)
+        formats = [column['format'] for column in read_artifact_meta(handle['artifact_id'])['columns']]
+        self.assertEqual(formats, ['arrow', 'arrow', 'arrow', 'json'])
+
+        opened = open_artifact(handle)
+        # Strings of object columns are opened as strings, as pandas infers them
+        pd.testing.assert_frame_equal(opened, frame.astype({'object': 'str'}))
+        for column in ('str', 'object'):
+            self.assertIsInstance(opened[column].array, pd.arrays.ArrowStringArray)
+        pd.testing.assert_series_equal(open_artifact(handle, columns=['string'])['string'], frame['string'])
+
+    def test_artifacts_are_only_opened_by_their_owner(self):
+        with artifacts_owned_by(1):
+            handle = save_artifact(pd.Series([1, 2, 3], name='x'))
+            self.assertEqual(open_artifact(handle).tolist(), [1, 2, 3])
+        with artifacts_owned_by(2), self.assertRaisesMessage(ValueError, 'Artifact not found'):
+            open_artifact(handle)
+
+    def test_prune_deletes_unused_artifacts(self):
+        old = save_artifact(pd.Series([1.0], name='old'))
+        recent = save_artifact(pd.Series([2.0], name='recent'))
+        long_ago = time.time() - 30 * 86400
+        os.utime(os.path.join(artifact_path(old['artifact_id']), 'meta.json'), (long_ago, long_ago))
+
+        self.assertEqual(prune_artifacts(max_age=86400), 1)
+        self.assertFalse(artifact_exists(old['artifact_id']))
+        self.assertTrue(artifact_exists(recent['artifact_id']))
+
+
+class GramFitTests(SimpleTestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.dataframe = pd.DataFrame(rng.normal(size=(500, 3)), columns=['a', 'b', 'c'])
+        self.dataframe['t'] = self.dataframe @ [1.5, -2.0, 0.5] + 3 + rng.normal(scale=0.1, size=500)
+        # As loaded by a Dataset node: read-only, so its fingerprint can be recorded
+        self.dataframe = freeze(self.dataframe)
+        content_hash(self.dataframe)
+        selected = feature_selection(self.dataframe, 't', ['a', 'b', 'c'])
+        split = train_test_split(selected['X'], selected['y'], test_size=0.2, random_state=0)
+        self.split = {name: materialize(value) for name, value in split.items()}
+
+    def params(self, **overrides):
+        return {'dataframe': self.dataframe, 'X_train': self.split['X_train'],
+                'y_train': self.split['y_train'], 'fit_intercept': True, **overrides}
+
+    def test_matches_direct_fit(self):
+        model, _ = fit_from_gram(self.params())
+        direct = linear_regression(self.split['X_train'], self.split['y_train'])
+        np.testing.assert_allclose(model.coef_, direct.coef_, rtol=1e-9)
+        np.testing.assert_allclose(model.intercept_, direct.intercept_, rtol=1e-9)
+
+    def test_needs_training_data_selected_from_the_dataframe(self):
+        altered = self.split['X_train'] + 1
+        self.assertIsNone(fit_from_gram(self.params(X_train=altered)))
+
+        other = freeze(self.dataframe.assign(a=self.dataframe['a'] * 2))
+        content_hash(other)
+        self.assertIsNone(fit_from_gram(self.params(dataframe=other)))
+
+
+class TrainTestSplitTests(SimpleTestCase):
+
+    def setUp(self):
+        self.X = pd.DataFrame({'a': np.arange(100.0)})
+        self.y = pd.Series(np.repeat([0, 1], [80, 20]), name='label')
+
+    def test_same_seed_gives_same_split(self):
+        first = train_test_split(self.X, self.y, test_size=0.25, random_state=7)
+        second = train_test_split(self.X, self.y, test_size=0.25, random_state=7)
+        pd.testing.assert_series_equal(first['test_index'], second['test_index'])
+        self.assertEqual(len(first['X_test']), 25)
+        self.assertEqual(sorted(first['train_index'].tolist() + first['test_index'].tolist()), list(range(100)))
+
+    def test_stratified_split_keeps_class_proportions(self):
+        result = train_test_split(self.X, self.y, test_size=0.25, random_state=0, stratify=True)
+        self.assertEqual(materialize(result['y_test']).value_counts().to_dict(), {0: 20, 1: 5})
+        self.assertEqual(materialize(result['y_train']).value_counts().to_dict(), {0: 60, 1: 15})
+
+    def test_rows_are_copied_only_when_read(self):
+        X = freeze(self.X)
+        content_hash(X)
+        result = train_test_split(X, self.y, test_size=0.25, random_state=7)
+        view = result['X_train']
+        self.assertIsInstance(view, RowView)
+        self.assertIs(view.parent, X)
+        self.assertEqual(view.shape, (75, 1))
+
+        rows = materialize(view)
+        pd.testing.assert_frame_equal(rows, X.iloc[result['train_index']])
+        self.assertFalse(rows['a'].to_numpy().flags.writeable)
+        self.assertEqual(known_rows(rows), (X, result['train_index']))
+        self.assertEqual(known_fingerprint(rows)['hash'], view.fingerprint()['hash'])
+        self.assertTrue(known_fingerprint(rows)['nan_free'])
+
+        sparse_rows = materialize(train_test_split(
+            sparse.csr_matrix(X.to_numpy()), self.y, test_size=0.25, random_state=7)['X_test'])
+        np.testing.assert_array_equal(sparse_rows.toarray(), X.to_numpy()[result['test_index']])
+
+    def test_row_views_are_stored_as_their_positions(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root, ignore_errors=True)
+        with override_settings(ARTIFACT_ROOT=root):
+            result = train_test_split(self.X, self.y, test_size=0.25, random_state=7)
+            handle = save_artifact(result['X_test'])
+            parent = save_artifact(self.X)
+            self.assertEqual((handle['artifact_id'], handle['shape']), (parent['artifact_id'], [25, 1]))
+            self.assertIn('rows', handle)
+            self.assertIs(save_artifact(result['X_test']), handle)
+            pd.testing.assert_frame_equal(open_artifact(handle), self.X.iloc[result['test_index']])
+
+    def test_drawn_seed_fits_an_integer_field(self):
+        for _ in range(50):
+            seed = train_test_split(self.X, self.y)['random_state']
+            self.assertTrue(0 <= seed < 2 ** 31)
+
+
+class CsvIngestionTests(SimpleTestCase):
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        self.file_path = os.path.join(directory, 'codes.csv')
+        with open(self.file_path, 'w') as f:
+            f.write("code,amount\n00123,1.5\n04567,2.5\n")
+
+    def test_pyarrow_parser_is_the_default(self):
+        self.assertEqual(csv_engine(), 'pyarrow')
+        with override_settings(DATASET_CSV_ENGINE='c'):
+            self.assertEqual(csv_engine(), 'c')
+        with mock.patch('importlib.util.find_spec', return_value=None):
+            self.assertEqual(csv_engine('auto'), 'c')
+        with self.assertRaises(ValueError):
+            csv_engine('fast')
+
+    def test_hinted_columns_keep_leading_zeros_with_any_engine(self):
+        for engine, used in (('c', 'c'), ('auto', 'pyarrow'), ('pyarrow', 'pyarrow')):
+            df = read_csv_file(self.file_path, dtypes={'code': 'str'}, engine=engine)
+            self.assertEqual(df['code'].tolist(), ['00123', '04567'])
+            self.assertEqual(df['amount'].tolist(), [1.5, 2.5])
+            self.assertEqual(df.attrs['csv_engine'], used)
+
+    def test_pyarrow_parses_hinted_columns_as_their_dtype(self):
+        with open(self.file_path, 'a') as f:
+            f.write("00089,\n")
+        hints = {'code': 'category', 'amount': 'float32'}
+        arrow = read_csv_file(self.file_path, dtypes=hints, engine='pyarrow')
+        c = read_csv_file(self.file_path, dtypes=hints, engine='c')
+        self.assertEqual(arrow.attrs['csv_engine'], 'pyarrow')
+        pd.testing.assert_frame_equal(arrow, c)
+        self.assertEqual(list(arrow['code'].cat.categories), ['00089', '00123', '04567'])
+
+        nullable = read_csv_file(self.file_path, dtypes={'code': 'Int64'}, engine='pyarrow')
+        self.assertEqual(nullable['code'].tolist(), [123, 4567, 89])
+
+    def test_columnar_copy_is_parsed_with_the_hints(self):
+        with override_settings(ARTIFACT_ROOT=os.path.join(os.path.dirname(self.file_path), 'artifacts'),
+                               DATASET_CSV_SIDECAR=True):
+            self.assertEqual(load_dataset(self.file_path)['code'].tolist(), [123, 4567])
+            hinted = load_dataset(self.file_path, dtypes={'code': 'str'})
+            self.assertEqual(hinted['code'].tolist(), ['00123', '04567'])
+
+            filtered, _ = filtered_dataset(self.file_path, [[{'column': 'amount', 'op': '>', 'value': 2}]],
+                                           dtypes={'code': 'str'})
+            self.assertEqual(filtered['code'].tolist(), ['04567'])
+
+
+class LinearRegressionSolverTests(SimpleTestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.X = pd.DataFrame(rng.normal(size=(2000, 4)) * [1, 10, 100, 0.1] + [5, -5, 50, 0],
+                              columns=['a', 'b', 'c', 'd'])
+        self.y = pd.Series(self.X @ [1.0, -0.5, 0.02, 3.0] + 2 + rng.normal(scale=0.01, size=2000), name='y')
+
+    def test_float32_features_are_solved_in_float64(self):
+        X32 = self.X.astype(np.float32)
+        reference = SklearnLinearRegression().fit(X32.astype(np.float64), self.y)
+        for solver in ('lstsq', 'cholesky', 'qr'):
+            model = linear_regression(X32, self.y, solver=solver)
+            self.assertEqual(model.coef_.dtype, np.float64)
+            np.testing.assert_allclose(model.coef_, reference.coef_, rtol=1e-9)
+
+    def test_direct_solvers_match_sklearn(self):
+        for fit_intercept in (True, False):
+            reference = SklearnLinearRegression(fit_intercept=fit_intercept).fit(self.X, self.y)
+            for solver in ('lstsq', 'cholesky', 'qr'):
+                model = linear_regression(self.X, self.y, fit_intercept=fit_intercept, solver=solver)
+                self.assertEqual(model.solver_, solver)
+                np.testing.assert_allclose(model.coef_, reference.coef_, rtol=1e-9)
+                self.assertAlmostEqual(model.intercept_, reference.intercept_, places=8)
+                np.testing.assert_allclose(model.predict(self.X), reference.predict(self.X), rtol=1e-9)
+
+    def test_sgd_approximates_sklearn(self):
+        reference = SklearnLinearRegression().fit(self.X, self.y)
+        model = linear_regression(self.X, self.y, solver='sgd')
+        residual = self.y - model.predict(self.X)
+        self.assertLess(np.sqrt((residual ** 2).mean()), 0.05)
+        np.testing.assert_allclose(model.coef_, reference.coef_, rtol=1e-3)
+
+    def test_collinear_features_fall_back_to_lstsq(self):
+        X = self.X.assign(e=self.X['a'] * 2)
+        reference = SklearnLinearRegression().fit(X, self.y)
+        for solver in ('cholesky', 'qr'):
+            model = linear_regression(X, self.y, solver=solver)
+            self.assertEqual(model.solver_, 'lstsq')
+            np.testing.assert_allclose(model.coef_, reference.coef_, rtol=1e-9)
+
+    def test_auto_solver_depends_on_the_shape(self):
+        self.assertEqual(choose_solver(self.X), 'cholesky')
+        self.assertEqual(choose_solver(self.X.iloc[:3]), 'lstsq')
+        # Fewer than CHOLESKY_MIN_ROWS_PER_FEATURE rows per feature
+        self.assertEqual(choose_solver(self.X.iloc[:399]), 'lstsq')
+        self.assertEqual(choose_solver(self.X.iloc[:400]), 'cholesky')
+        self.assertEqual(choose_solver(sparse.csr_matrix(self.X.to_numpy())), 'lstsq')
+        with mock.patch.object(linear_regression_module, 'SGD_MIN_CELLS', 1000):
+            self.assertEqual(choose_solver(sparse.csr_matrix(self.X.to_numpy())), 'sgd')
+        with mock.patch.object(linear_regression_module, 'CHOLESKY_MAX_FEATURES', 2):
+            self.assertEqual(choose_solver(self.X.iloc[:100]), 'lstsq')
+        with self.assertRaisesMessage(ValueError, 'Unsupported solver'):
+            choose_solver(self.X, 'newton')
+
+    def test_auto_solver_uses_cholesky_only_when_well_conditioned(self):
+        self.assertEqual(linear_regression(self.X, self.y).solver_, 'cholesky')
+
+        # Nearly collinear features pass the Cholesky solver's own check but not the bound of 'auto'
+        rng = np.random.default_rng(1)
+        X = self.X[['a']].assign(e=self.X['a'] + 1e-3 * rng.normal(size=len(self.X)))
+        reference = SklearnLinearRegression().fit(X, self.y)
+        self.assertEqual(linear_regression(X, self.y, solver='cholesky').solver_, 'cholesky')
+        model = linear_regression(X, self.y)
+        self.assertEqual(model.solver_, 'lstsq')
+        np.testing.assert_allclose(model.coef_, reference.coef_, rtol=1e-9)
+
+    def test_sparse_features_are_fitted_without_densifying(self):
+        X = sparse.csr_matrix(np.where(np.abs(self.X.to_numpy()) > 1, self.X.to_numpy(), 0))
+        reference = SklearnLinearRegression().fit(X.toarray(), self.y)
+
+        model = linear_regression(X, self.y, solver='lstsq')
+        np.testing.assert_allclose(model.coef_, reference.coef_, rtol=1e-6)
+        approximate = linear_regression(X, self.y, solver='sgd')
+        np.testing.assert_allclose(approximate.predict(X), reference.predict(X.toarray()), atol=0.05)
+        with self.assertRaisesMessage(ValueError, 'needs dense features'):
+            linear_regression(X, self.y, solver='cholesky')
+
+    def test_sparse_features_are_predicted_and_scored_without_densifying(self):
+        X = sparse.csr_matrix(np.where(np.abs(self.X.to_numpy()) > 1, self.X.to_numpy(), 0))
+        model = linear_regression(X, self.y, solver='lstsq')
+        dense = pd.Series(model.predict(X.toarray()))
+
+        for features in (X, X.tocoo(), X.tocsc()):
+            predictions = predict(model, features)['predictions']
+            np.testing.assert_allclose(predictions, dense)
+        self.assertAlmostEqual(
+            accuracy_metric(sparse.csr_matrix(self.y.to_numpy()).T, predictions, 'r2'),
+            accuracy_metric(self.y, dense, 'r2'),
+        )
+
+        with self.assertRaisesMessage(ValueError, 'NaN'):
+            predict(model, sparse.csr_matrix(np.where(X.toarray() > 1, np.nan, X.toarray())))
+        with self.assertRaisesMessage(ValueError, 'single sparse row or column'):
+            accuracy_metric(X, predictions, 'r2')
+
+
+class FingerprintTests(SimpleTestCase):
+
+    def test_only_read_only_values_are_fingerprinted(self):
+        writeable = pd.DataFrame({'a': [1.0, 2.0]})
+        remember_fingerprint(writeable, nan_free=True)
+        self.assertIsNone(known_fingerprint(writeable))
+
+        frozen = freeze(writeable)
+        remember_fingerprint(frozen, nan_free=True)
+        self.assertTrue(known_fingerprint(frozen)['nan_free'])
+        with self.assertRaises(ValueError):
+            frozen.loc[0, 'a'] = np.nan
+
+    def test_fingerprint_is_dropped_when_data_is_replaced(self):
+        frozen = freeze(pd.DataFrame({'a': [1.0, 2.0], 'b': ['x', 'y']}))
+        remember_fingerprint(frozen, nan_free=True)
+        frozen['a'] = [np.nan, 1.0]
+        self.assertIsNone(known_fingerprint(frozen))
+        self.assertTrue(contains_nan(frozen))
+
+    def test_scans_do_not_fingerprint_caller_values(self):
+        values = pd.Series([1.0, 2.0])
+        self.assertFalse(contains_nan(values))
+        self.assertIsNone(known_fingerprint(values))
+
+
+class GroupedLinearRegressionTests(SimpleTestCase):
+
+    def test_each_group_matches_sklearn(self):
+        rng = np.random.default_rng(0)
+        frames = []
+        for group, rows in [('plain', 200), ('collinear', 200), ('few_rows', 2)]:
+            X = rng.normal(size=(rows, 3))
+            if group == 'collinear':
+                X[:, 2] = X[:, 0] + 1e-7 * rng.normal(size=rows)
+            frame = pd.DataFrame(X, columns=['a', 'b', 'c'])
+            frame['y'] = X @ [2.0, -1.0, 0.5] + 1 + rng.normal(scale=0.01, size=rows)
+            frame['group'] = group
+            frames.append(frame)
+        data = pd.concat(frames, ignore_index=True)
+
+        model = grouped_linear_regression(data[['group', 'a', 'b', 'c']], data['y'], 'group')
+        for position, group in enumerate(model.groups_):
+            rows = data[data['group'] == group]
+            reference = SklearnLinearRegression().fit(rows[['a', 'b', 'c']], rows['y'])
+            np.testing.assert_allclose(model.coef_[position], reference.coef_, rtol=1e-6, atol=1e-8)
+            self.assertAlmostEqual(model.intercept_[position], reference.intercept_, places=6)
+
+        predictions = model.predict(data)
+        self.assertEqual(predictions.shape, (len(data),))
+
+    def grouped_data(self, n_groups=20, rows=50):
+        rng = np.random.default_rng(1)
+        X = pd.DataFrame(rng.normal(size=(n_groups * rows, 3)), columns=['a', 'b', 'c'])
+        X['store'] = rng.integers(0, n_groups, size=len(X))
+        slopes = rng.normal(size=(n_groups, 3))
+        Y = pd.DataFrame({
+            'sales': np.einsum('nk,nk->n', slopes[X['store']], X[['a', 'b', 'c']]) + X['store'],
+            'returns': X['a'] - 2 * X['store'] + rng.normal(scale=0.1, size=len(X)),
+        })
+        return X, Y
+
+    def test_each_group_of_several_targets_matches_sklearn(self):
+        X, Y = self.grouped_data()
+        model = grouped_linear_regression(X, Y, 'store')
+        self.assertEqual(model.coef_.shape, (20, 2, 3))
+        for position, group in enumerate(model.groups_):
+            rows = X['store'] == group
+            reference = SklearnLinearRegression().fit(X.loc[rows, ['a', 'b', 'c']], Y[rows])
+            np.testing.assert_allclose(model.coef_[position], reference.coef_, rtol=1e-9, atol=1e-12)
+            np.testing.assert_allclose(model.intercept_[position], reference.intercept_, rtol=1e-9, atol=1e-12)
+        np.testing.assert_allclose(model.predict(X), Y.to_numpy(), atol=0.5)
+
+    def test_blocks_fitted_by_worker_processes_match_one_block(self):
+        X, Y = self.grouped_data()
+        expected = grouped_linear_regression(X, Y, 'store')
+        with mock.patch.object(grouped_regression, 'PARALLEL_MIN_ROWS', 0), \
+                mock.patch('os.cpu_count', return_value=2), \
+                mock.patch.object(grouped_regression, 'process_pool', wraps=grouped_regression.process_pool) as pool:
+            model = grouped_linear_regression(X, Y, 'store', max_workers=2)
+        pool.assert_called_once_with(2)
+        np.testing.assert_array_equal(model.groups_, expected.groups_)
+        np.testing.assert_allclose(model.coef_, expected.coef_, rtol=1e-12, atol=1e-12)
+        np.testing.assert_allclose(model.intercept_, expected.intercept_, rtol=1e-12, atol=1e-12)
+
+
+class ModelRegistryTests(SimpleTestCase):
+
+    def setUp(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root, ignore_errors=True)
+        settings_override = override_settings(MODEL_REGISTRY_ROOT=root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        rng = np.random.default_rng(0)
+        self.X = pd.DataFrame(rng.normal(size=(100, 3)), columns=['a', 'b', 'c'])
+        self.y = pd.Series(self.X @ [1.0, -2.0, 0.5] + 4, name='t')
+
+    def reloaded(self, reference):
+        """Loads a model from its file rather than from the in-memory LRU."""
+        with mock.patch.object(model_registry, '_loaded', model_registry.LoadedModels()):
+            return model_registry.load_model(reference)
+
+    def test_round_trip(self):
+        model = linear_regression(self.X, self.y)
+        data_hash = model_registry.training_data_hash(self.X, self.y)
+        handle = model_registry.save_model(7, model, data_hash)
+
+        self.assertEqual(handle['model_id'], f"7-{data_hash}")
+        self.assertEqual(handle['feature_names'], ['a', 'b', 'c'])
+        for reference in (handle, handle['model_id'], {'node_id': 7}):
+            loaded = self.reloaded(reference)
+            np.testing.assert_array_equal(loaded.coef_, model.coef_)
+            self.assertEqual(loaded.intercept_, model.intercept_)
+            np.testing.assert_array_equal(loaded.predict(self.X), model.predict(self.X))
+            self.assertEqual(model_registry.known_model(loaded)['model_id'], handle['model_id'])
+
+    def test_latest_model_of_a_node_is_loaded(self):
+        other = self.y * 2
+        first = linear_regression(self.X, self.y)
+        second = linear_regression(self.X, other)
+        model_registry.save_model(7, first, model_registry.training_data_hash(self.X, self.y))
+        model_registry.save_model(7, second, model_registry.training_data_hash(self.X, other))
+
+        np.testing.assert_array_equal(self.reloaded({'node_id': 7}).coef_, second.coef_)
+
+    @override_settings(MODEL_REGISTRY_MODELS_PER_NODE=2)
+    def test_superseded_models_of_a_node_are_pruned(self):
+        handles = []
+        for scale in range(1, 5):
+            y = self.y * scale
+            data_hash = model_registry.training_data_hash(self.X, y)
+            handle = model_registry.save_model(7, linear_regression(self.X, y), data_hash)
+            # Saved one after another, with distinct modification times
+            os.utime(model_registry.model_path(handle['model_id']), ns=(scale, scale))
+            handles.append(handle)
+        model_registry.save_model(8, linear_regression(self.X, self.y), 'f' * 32)
+
+        stored = sorted(os.listdir(os.path.join(model_registry.registry_root(), '7')))
+        self.assertEqual(stored, sorted([f"{handle['data_hash']}.npz" for handle in handles[2:]] + ['latest']))
+        self.assertEqual(len(os.listdir(os.path.join(model_registry.registry_root(), '8'))), 2)
+        np.testing.assert_array_equal(self.reloaded({'node_id': 7}).coef_, self.reloaded(handles[3]).coef_)
+        with self.assertRaisesMessage(ValueError, 'Model not found'):
+            self.reloaded(handles[0])
+
+    def test_grouped_model_round_trip(self):
+        X = self.X.assign(group=np.where(self.X['c'] > 0, 'high', 'low'))
+        model = grouped_linear_regression(X, self.y, 'group')
+        data_hash = model_registry.training_data_hash(X, self.y, group_by='group')
+        handle = model_registry.save_model(8, model, data_hash)
+
+        loaded = self.reloaded(handle)
+        np.testing.assert_array_equal(loaded.groups_, model.groups_)
+        np.testing.assert_array_equal(loaded.predict(X), model.predict(X))
+
+    def test_models_are_only_loaded_by_their_owner(self):
+        model = linear_regression(self.X, self.y)
+        handle = model_registry.save_model(7, model, model_registry.training_data_hash(self.X, self.y), owner=1)
+
+        # From the in-memory LRU, then from the file
+        for load in (model_registry.load_model, self.reloaded):
+            with artifacts_owned_by(1):
+                np.testing.assert_array_equal(load({'node_id': 7}).coef_, model.coef_)
+            with artifacts_owned_by(2):
+                for reference in (handle, handle['model_id'], {'node_id': 7}):
+                    with self.assertRaisesMessage(ValueError, 'Model not found'):
+                        load(reference)
+
+    def test_unknown_models_are_rejected(self):
+        with self.assertRaisesMessage(ValueError, 'Invalid model id'):
+            model_registry.load_model('../7-abc')
+        with self.assertRaisesMessage(ValueError, 'Model not found'):
+            self.reloaded(f"7-{'0' * 32}")
+        with self.assertRaisesMessage(ValueError, 'No trained model found'):
+            self.reloaded({'node_id': 9})
+
+
+class DatasetUploadTests(TestCase):
+
+    url = '/api/node/datasets/upload/'
+
+    def setUp(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root, ignore_errors=True)
+        settings_override = override_settings(DATASET_UPLOAD_ROOT=root, DATASET_UPLOAD_CHUNK_SIZE=16)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.client = APIClient()
+        self.client.force_authenticate(get_user_model().objects.create(username='owner', email='owner@example.com'))
+        self.content = b"a,b\n1,2\n3,4\n5,6\n"
+
+    def upload(self, name, content):
+        return self.client.post(self.url, {'file': SimpleUploadedFile(name, content)}, format='multipart')
+
+    def test_same_content_is_stored_once(self):
+        first = self.upload('data.csv', self.content)
+        second = self.upload('copy.csv', self.content)
+
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(second.status_code, 200)
+        self.assertFalse(first.json()['deduplicated'])
+        self.assertTrue(second.json()['deduplicated'])
+        self.assertEqual(first.json()['file_path'], second.json()['file_path'])
+        self.assertEqual(first.json()['sha256'], hashlib.sha256(self.content).hexdigest())
+        with open(first.json()['file_path'], 'rb') as f:
+            self.assertEqual(f.read(), self.content)
+
+        other = self.upload('data.csv', self.content + b"7,8\n")
+        self.assertEqual(other.status_code, 201)
+        self.assertNotEqual(other.json()['file_path'], first.json()['file_path'])
+
+    def test_stored_content_is_found_by_hash(self):
+        sha256 = hashlib.sha256(self.content).hexdigest()
+        self.assertEqual(self.client.get(self.url, {'sha256': sha256}).status_code, 404)
+
+        stored = self.upload('data.csv', self.content).json()
+        found = self.client.get(self.url, {'sha256': sha256})
+        self.assertEqual(found.status_code, 200)
+        self.assertEqual(found.json()['file_path'], stored['file_path'])
+        self.assertEqual(self.client.get(self.url, {'sha256': 'not-a-hash'}).status_code, 400)
+
+    def test_unsupported_format_is_rejected(self):
+        response = self.upload('data.exe', self.content)
+        self.assertEqual(response.status_code, 400)
+
+
+class DatasetViewTests(TestCase):
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        settings_override = override_settings(ARTIFACT_ROOT=os.path.join(directory, 'artifacts'))
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.file_path = os.path.join(directory, 'codes.csv')
+        with open(self.file_path, 'w') as f:
+            f.write("code,amount,city\n00123,1.5,b\n04567,0.5,a\n00089,2.5,c\n01000,,a\n")
+
+        self.user = get_user_model().objects.create(username='owner', email='owner@example.com')
+        workspace = Workspace.objects.create(user=self.user, name='workspace')
+        self.dataset = Dataset.objects.create(workspace=workspace, file_path=self.file_path, rows=4, columns=3,
+                                              dtypes='{"code": "str"}')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def preview(self, **params):
+        return self.client.get(f'/api/node/datasets/{self.dataset.id}/preview/', params)
+
+    def test_preview_is_parsed_with_the_dtype_hints(self):
+        response = self.preview()
+        self.assertEqual(response.status_code, 200)
+        page = response.json()
+        self.assertEqual(page['total_rows'], 4)
+        self.assertEqual(page['columns'], ['code', 'amount', 'city'])
+        self.assertEqual(page['data']['code'], ['00123', '04567', '00089', '01000'])
+        self.assertEqual(page['data']['amount'], [1.5, 0.5, 2.5, None])
+
+    def test_preview_pages_and_sorts(self):
+        page = self.preview(offset=1, limit=2, columns='code,city').json()
+        self.assertEqual((page['offset'], page['limit']), (1, 2))
+        self.assertEqual(page['data'], {'code': ['04567', '00089'], 'city': ['a', 'c']})
+
+        page = self.preview(limit=3, columns='code', sort='-amount').json()
+        self.assertEqual(page['data'], {'code': ['00089', '00123', '04567']})
+        page = self.preview(offset=3, columns='code', sort='city').json()
+        self.assertEqual(page['data'], {'code': ['00089']})
+        self.assertEqual(self.preview(offset=10).json()['data']['code'], [])
+
+    def test_invalid_preview_requests_are_rejected(self):
+        self.assertIn('Missing columns', self.preview(columns='code,missing').json()['error'])
+        self.assertEqual(self.preview(sort='missing').status_code, 400)
+        self.assertEqual(self.preview(limit='many').status_code, 400)
+        self.assertEqual(self.preview(offset=-1).status_code, 400)
+
+    def profile(self):
+        return self.client.get(f'/api/node/datasets/{self.dataset.id}/profile/')
+
+    def test_profile_describes_every_column(self):
+        response = self.profile()
+        self.assertEqual(response.status_code, 200)
+        profile = response.json()
+        self.assertEqual(profile['rows'], 4)
+        columns = {column['name']: column for column in profile['columns']}
+        self.assertEqual(list(columns), ['code', 'amount', 'city'])
+
+        # Parsed with the hints, so codes are strings
+        self.assertEqual(columns['code']['distinct'], 4)
+        self.assertIsNone(columns['code']['mean'])
+        self.assertEqual(len(columns['code']['top']), 4)
+        self.assertEqual(
+            {key: columns['amount'][key] for key in ('count', 'nulls', 'min', 'max', 'mean')},
+            {'count': 3, 'nulls': 1, 'min': 0.5, 'max': 2.5, 'mean': 1.5},
+        )
+        self.assertEqual(columns['city']['top'][0], {'value': 'a', 'count': 2})
+
+    def test_profile_is_recomputed_when_its_key_changes(self):
+        with mock.patch('node.views.dataset_profile', wraps=views.dataset_profile) as profile:
+            first = self.profile().json()
+            self.assertEqual(self.profile().json(), first)
+            self.assertEqual(profile.call_count, 1)
+
+            # Other hints give another columnar copy
+            Dataset.objects.filter(id=self.dataset.id).update(dtypes='')
+            self.assertNotEqual(self.profile().json()['profile_key'], first['profile_key'])
+            self.assertEqual(profile.call_count, 2)
+
+            # So does another version of the file
+            with open(self.file_path, 'a') as f:
+                f.write("00007,3.5,d\n")
+            self.assertEqual(self.profile().json()['rows'], 5)
+            self.assertEqual(profile.call_count, 3)
+
+    def test_other_users_dataset_is_not_found(self):
+        self.client.force_authenticate(get_user_model().objects.create(username='other', email='other@example.com'))
+        self.assertEqual(self.preview().status_code, 404)
+        self.assertEqual(self.profile().status_code, 404)
+
+
+class ChunkedLinearRegressionTests(SimpleTestCase):
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        rng = np.random.default_rng(0)
+        frame = pd.DataFrame(rng.normal(size=(1000, 3)) * [1, 10, 100] + [5, -5, 50], columns=['a', 'b', 'c'])
+        frame['t'] = frame @ [1.0, -0.5, 0.02] + 2 + rng.normal(scale=0.1, size=1000)
+        frame['u'] = frame['a'] * 3 - frame['c']
+        self.path = os.path.join(directory, 'data.csv')
+        frame.to_csv(self.path, index=False)
+        # Compared against the values as parsed back from the file
+        self.frame = pd.read_csv(self.path)
+
+    def test_matches_sklearn_on_the_whole_file(self):
+        features = ['a', 'b', 'c']
+        for fit_intercept in (True, False):
+            model = linear_regression_chunked(self.path, features, 't', fit_intercept=fit_intercept, chunksize=300)
+            reference = SklearnLinearRegression(fit_intercept=fit_intercept).fit(self.frame[features], self.frame['t'])
+            np.testing.assert_allclose(model.coef_, reference.coef_, rtol=1e-8)
+            self.assertAlmostEqual(model.intercept_, reference.intercept_, places=8)
+
+    def test_several_targets_are_fitted_together(self):
+        model = linear_regression_chunked(self.path, ['a', 'b', 'c'], ['t', 'u'], chunksize=300)
+        reference = SklearnLinearRegression().fit(self.frame[['a', 'b', 'c']], self.frame[['t', 'u']])
+        self.assertEqual(model.coef_.shape, (2, 3))
+        np.testing.assert_allclose(model.coef_, reference.coef_, rtol=1e-8, atol=1e-10)
+        np.testing.assert_allclose(model.intercept_, reference.intercept_, rtol=1e-8, atol=1e-10)
+
+    def test_nan_values_are_rejected(self):
+        self.frame.loc[700, 'b'] = np.nan
+        self.frame.to_csv(self.path, index=False)
+        with self.assertRaisesMessage(ValueError, 'NaN'):
+            linear_regression_chunked(self.path, ['a', 'b', 'c'], 't', chunksize=300)
+
+
+class FilteredDatasetTests(SimpleTestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        rng = np.random.default_rng(0)
+        self.frame = pd.DataFrame({
+            'age': rng.integers(0, 90, size=500),
+            'city': rng.choice(['Oslo', 'Lima', 'Pune'], size=500),
+            'income': rng.normal(50, 10, size=500).round(3),
+        })
+        self.frame.loc[rng.choice(500, size=20, replace=False), 'income'] = np.nan
+        self.file_path = os.path.join(self.directory, 'people.csv')
+        self.frame.to_csv(self.file_path, index=False)
+        self.filters = [
+            [{'column': 'age', 'op': '>=', 'value': 60}, {'column': 'city', 'op': 'in', 'value': ['Oslo', 'Pune']}],
+            [{'column': 'income', 'op': 'is null'}],
+        ]
+        settings_override = override_settings(ARTIFACT_ROOT=os.path.join(self.directory, 'artifacts'))
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def binary_copies(self):
+        """The dataset as Parquet and Feather files, as written by pandas."""
+        full = pd.read_csv(self.file_path)
+        paths = [os.path.join(self.directory, name) for name in ('people.parquet', 'people.feather')]
+        full.to_parquet(paths[0])
+        full.to_feather(paths[1])
+        return paths
+
+    def expected(self, columns):
+        """Rows matching any filter, selected from the whole dataset after loading it."""
+        full = pd.read_csv(self.file_path)
+        index = sorted(set().union(*(filter_rows(full, conditions)['data'].index for conditions in self.filters)))
+        return full.loc[index, columns]
+
+    def assert_filtered(self, filtered, total_rows, columns):
+        self.assertEqual(total_rows, len(self.frame))
+        pd.testing.assert_frame_equal(filtered.sort_index(), self.expected(columns), check_dtype=False)
+
+    def test_chunked_read_matches_filtering_the_full_dataset(self):
+        filtered, total_rows = filtered_dataset(self.file_path, self.filters, chunksize=37)
+        self.assert_filtered(filtered, total_rows, ['age', 'city', 'income'])
+
+    def test_projected_read_matches_filtering_the_full_dataset(self):
+        filtered, total_rows = filtered_dataset(self.file_path, self.filters, usecols=['income'], chunksize=37)
+        self.assert_filtered(filtered, total_rows, ['income'])
+
+    def test_columnar_copy_matches_filtering_the_full_dataset(self):
+        with override_settings(DATASET_CSV_SIDECAR=True):
+            load_dataset(self.file_path)
+            self.assertTrue(artifact_exists(columnar_copy_id(self.file_path)))
+            filtered, total_rows = filtered_dataset(self.file_path, self.filters, usecols=['income'])
+        self.assert_filtered(filtered, total_rows, ['income'])
+
+    def test_binary_formats_match_filtering_the_full_dataset(self):
+        for path in self.binary_copies():
+            for usecols, columns in ((None, ['age', 'city', 'income']), (['city', 'income'], ['city', 'income'])):
+                with self.subTest(path=os.path.basename(path), usecols=usecols):
+                    filtered, total_rows = filtered_dataset(path, self.filters, usecols=usecols)
+                    self.assert_filtered(filtered, total_rows, columns)
+
+    def test_binary_formats_load_the_requested_columns(self):
+        full = pd.read_csv(self.file_path)
+        for path in self.binary_copies():
+            with self.subTest(path=os.path.basename(path)):
+                pd.testing.assert_frame_equal(load_dataset(path), full)
+                pd.testing.assert_frame_equal(load_dataset(path, usecols=['income', 'age', 'height']),
+                                              full[['age', 'income']])
+                hinted = load_dataset(path, usecols=['age'], dtypes={'age': 'int16'})
+                self.assertEqual(hinted['age'].dtype, np.int16)
+
+    def test_missing_filter_column_is_rejected(self):
+        with self.assertRaisesMessage(ValueError, 'Missing filter columns'):
+            filtered_dataset(self.file_path, [[{'column': 'height', 'op': '>', 'value': 1}]])
+
+
+class SampleTests(SimpleTestCase):
+
+    def setUp(self):
+        self.frame = pd.DataFrame({'a': np.arange(1000), 'b': np.arange(1000) % 7})
+
+    def test_chunked_sample_matches_sampling_all_rows(self):
+        for sample in ({'rows': 50}, {'rows': 50, 'seed': 3}, {'fraction': 0.1}):
+            sampler = ChunkSampler(sample)
+            for start in range(0, len(self.frame), 64):
+                chunk = self.frame.iloc[start:start + 64]
+                sampler.add(chunk, np.arange(start, start + len(chunk)))
+            pd.testing.assert_frame_equal(sampler.result(), sample_rows(self.frame, sample))
+
+    def test_sampled_load_matches_sampling_the_loaded_dataset(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        frame = self.frame.assign(code=[f"{i:05d}" for i in range(1000)])
+        csv_path = os.path.join(directory, 'rows.csv')
+        frame.to_csv(csv_path, index=False)
+        parquet_path, feather_path = os.path.join(directory, 'rows.parquet'), os.path.join(directory, 'rows.feather')
+        frame.to_parquet(parquet_path)
+        frame.to_feather(feather_path)
+
+        hints = {'code': 'str', 'b': 'int8'}
+        with override_settings(ARTIFACT_ROOT=os.path.join(directory, 'artifacts')):
+            for sample in ({'rows': 50, 'seed': 2}, {'fraction': 0.1}):
+                expected = sample_rows(load_dataset(csv_path, usecols=['code', 'b'], dtypes=hints), sample)
+                for path, sidecar in ((csv_path, True), (csv_path, False), (parquet_path, True), (feather_path, True)):
+                    with self.subTest(path=os.path.basename(path), sidecar=sidecar, sample=sample), \
+                            override_settings(DATASET_CSV_SIDECAR=sidecar):
+                        df, total_rows = sampled_dataset(path, sample, usecols=['code', 'b', 'missing'],
+                                                         dtypes=hints, chunksize=64)
+                        self.assertEqual(total_rows, 1000)
+                        pd.testing.assert_frame_equal(df, expected, check_index_type=False)
+
+    def test_sample_depends_only_on_row_numbers_and_seed(self):
+        sample = sample_rows(self.frame, {'rows': 50})
+        self.assertEqual(len(sample), 50)
+        self.assertTrue(sample.index.is_monotonic_increasing)
+        pd.testing.assert_frame_equal(sample_rows(self.frame, {'rows': 50}), sample)
+        self.assertFalse(sample.index.equals(sample_rows(self.frame, {'rows': 50, 'seed': 1}).index))
+
+        # A row sampled from the whole file is sampled from any subset containing it
+        subset = self.frame.iloc[::2]
+        subset_sample = sample_rows(subset, {'fraction': 0.2}, row_numbers=subset.index)
+        full_sample = sample_rows(self.frame, {'fraction': 0.2})
+        self.assertEqual(list(subset_sample.index), [i for i in full_sample.index if i % 2 == 0])
+
+
+class HashEncodingTests(SimpleTestCase):
+
+    def setUp(self):
+        self.X = pd.DataFrame({
+            'amount': [1.5, 0.0, -2.0, 4.0, 3.0],
+            'city': ['Oslo', 'Lima', None, 'Oslo', 'Pune'],
+            'device': ['ios', 'web', 'web', 'ios', 'Oslo'],
+        })
+
+    def test_numeric_columns_are_passed_through_and_values_hashed(self):
+        result = hash_encode(self.X, n_buckets=64)
+        X = result['X']
+
+        self.assertEqual(result['columns'], ['city', 'device'])
+        self.assertEqual(result['numeric_columns'], ['amount'])
+        self.assertEqual(X.format, 'csr')
+        self.assertEqual(X.shape, (5, 65))
+        self.assertEqual(result['n_features'], 65)
+        np.testing.assert_array_equal(X[:, 0].toarray().ravel(), self.X['amount'])
+
+        hashed = X[:, 1:].toarray()
+        # One indicator per present value; the missing city is left out
+        np.testing.assert_array_equal(hashed.sum(axis=1), [2, 2, 1, 2, 2])
+        np.testing.assert_array_equal(hashed[0], hashed[3])
+        self.assertFalse(np.array_equal(hashed[0], hashed[1]))
+
+    def test_encoding_is_deterministic_across_chunks_and_dtypes(self):
+        expected = hash_encode(self.X, n_buckets=1024)['X']
+        chunked = hash_encode(self.X, n_buckets=1024, chunksize=2)['X']
+        categorical = hash_encode(self.X.astype({'city': 'category', 'device': 'category'}), n_buckets=1024)['X']
+
+        self.assertEqual((expected != chunked).nnz, 0)
+        self.assertEqual((expected != categorical).nnz, 0)
+
+    def test_equal_values_of_different_columns_use_different_buckets(self):
+        X = hash_encode(pd.DataFrame({'city': ['Oslo'], 'device': ['Oslo']}))['X']
+        np.testing.assert_array_equal(X.data, [1.0, 1.0])
+
+    def test_unhashed_columns_must_be_numeric(self):
+        with self.assertRaisesMessage(ValueError, 'not numeric'):
+            hash_encode(self.X, columns=['city'])
+        with self.assertRaisesMessage(ValueError, 'Missing columns'):
+            hash_encode(self.X, columns=['country'])
+
+
+class ImputationTests(SimpleTestCase):
+
+    def setUp(self):
+        self.frame = pd.DataFrame({
+            'age': [20.0, np.nan, 40.0, 60.0],
+            'visits': pd.array([1, 2, None, 5], dtype='Int64'),
+            'city': pd.Series(['Oslo', None, 'Lima', 'Oslo'], dtype='category'),
+        })
+        self.original = self.frame.copy()
+
+    def test_mean_and_median_match_pandas(self):
+        for strategy in ('mean', 'median'):
+            result = impute(self.frame, strategy=strategy, columns=['age', 'visits'])
+            for column in ('age', 'visits'):
+                values = self.frame[column].astype(np.float64)
+                expected = values.fillna(getattr(values, strategy)())
+                pd.testing.assert_series_equal(result['data'][column], expected)
+            self.assertEqual(result['missing'], {'age': 1, 'visits': 1})
+            # The city column still has a missing value
+            self.assertFalse(result['clean'])
+        pd.testing.assert_frame_equal(self.frame, self.original)
+
+    def test_constant_fill_of_every_column(self):
+        result = impute(self.frame.drop(columns=['age', 'visits']), strategy='constant', fill_value='unknown')
+        self.assertEqual(result['data']['city'].tolist(), ['Oslo', 'unknown', 'Lima', 'Oslo'])
+        self.assertTrue(result['clean'])
+        self.assertFalse(contains_nan(result['data']))
+
+    def test_drop_keeps_complete_rows(self):
+        result = impute(self.frame, strategy='drop')
+        self.assertEqual(result['data'].index.tolist(), [0, 3])
+        self.assertEqual(result['rows'], 2)
+        self.assertEqual(result['missing'], {'age': 1, 'visits': 1, 'city': 1})
+        self.assertTrue(result['clean'])
+
+        untouched = impute(self.frame, strategy='drop', columns=['age'])
+        self.assertEqual(untouched['data'].index.tolist(), [0, 2, 3])
+        self.assertFalse(untouched['clean'])
+
+    def test_invalid_requests_are_rejected(self):
+        with self.assertRaisesMessage(ValueError, 'not numeric'):
+            impute(self.frame, strategy='mean')
+        with self.assertRaisesMessage(ValueError, 'needs a fill_value'):
+            impute(self.frame, strategy='constant')
+        with self.assertRaisesMessage(ValueError, 'Missing columns'):
+            impute(self.frame, columns=['income'])
+
+
+class MultiTargetRegressionTests(SimpleTestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.X = pd.DataFrame(rng.normal(size=(300, 3)), columns=['a', 'b', 'c'])
+        noise = rng.normal(scale=0.1, size=(300, 2))
+        self.Y = pd.DataFrame({
+            'price': self.X @ [2.0, -1.0, 0.5] + 3 + noise[:, 0],
+            'demand': self.X @ [-0.5, 0.0, 4.0] - 1 + noise[:, 1],
+        })
+
+    def test_every_solver_matches_sklearn(self):
+        reference = SklearnLinearRegression().fit(self.X, self.Y)
+        for solver in ('lstsq', 'cholesky', 'qr'):
+            model = linear_regression(self.X, self.Y, solver=solver)
+            self.assertEqual(model.coef_.shape, (2, 3))
+            np.testing.assert_allclose(model.coef_, reference.coef_, rtol=1e-9, atol=1e-12)
+            np.testing.assert_allclose(model.intercept_, reference.intercept_, rtol=1e-9)
+            self.assertEqual(list(model.target_names_), ['price', 'demand'])
+
+    def test_joint_fit_equals_one_fit_per_target(self):
+        model = linear_regression(self.X, self.Y)
+        for position, target in enumerate(self.Y.columns):
+            single = linear_regression(self.X, self.Y[target])
+            np.testing.assert_allclose(model.coef_[position], single.coef_, rtol=1e-9, atol=1e-12)
+            self.assertAlmostEqual(model.intercept_[position], single.intercept_, places=9)
+
+    def test_predictions_are_labelled_per_target(self):
+        predictions = predict(linear_regression(self.X, self.Y), self.X)['predictions']
+        self.assertEqual(list(predictions.columns), ['price', 'demand'])
+        np.testing.assert_allclose(predictions.to_numpy(), self.Y.to_numpy(), atol=0.5)
@@ -0,0 +1,124 @@
+import glob
+import hashlib
+import os
+import re
+import uuid
+
+from django.conf import settings
+from django.core.files.uploadhandler import FileUploadHandler, SkipFile, StopUpload
+from django.core.files.uploadedfile import UploadedFile
+
+from node.services.input.dataset import dataset_format
+
+
+def upload_root():
+    return getattr(settings, 'DATASET_UPLOAD_ROOT', os.path.join(settings.MEDIA_ROOT, 'uploads'))
+
+
+def blob_path(sha256, extension):
+    """Uploaded files are stored once per content hash, as uploads/<sha[:2]>/<sha><extension>."""
+    return os.path.join(upload_root(), sha256[:2], f"{sha256}{extension}")
+
+
+def find_blob(sha256):
+    """
+    Returns the stored file with the given content hash, or None.
+
+    Raises:
+        ValueError: If sha256 is not a 64-character hex digest.
+    """
+    sha256 = str(sha256).lower()
+    if not re.fullmatch(r'[0-9a-f]{64}', sha256):
+        raise ValueError("sha256 must be a 64-character hex digest.")
+    matches = sorted(glob.glob(os.path.join(upload_root(), sha256[:2], f"{sha256}.*")))
+    return matches[0] if matches else None
+
+
+def blob_info(file_path, deduplicated):
+    sha256, extension = os.path.splitext(os.path.basename(file_path))
+    return {
+        'file_path': file_path,
+        'sha256': sha256,
+        'format': dataset_format(file_path),
+        'size': os.path.getsize(file_path),
+        'deduplicated': deduplicated,
+    }
+
+
+class StoredUpload(UploadedFile):
+    """An uploaded dataset already stored under upload_root(); see DatasetUploadHandler."""
+
+    def __init__(self, name, info):
+        super().__init__(file=None, name=name, size=info['size'])
+        self.info = info
+
+
+class DatasetUploadHandler(FileUploadHandler):
+    """
+    Streams uploaded dataset files to upload_root() in fixed-size chunks, hashing them
+    while they are written, instead of buffering them in memory or a temporary file.
+
+    A file whose content is already stored is not kept again: the new copy is deleted
+    and the existing file is reused, so every distinct content is stored once across
+    users and workspaces.
+    """
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.chunk_size = getattr(settings, 'DATASET_UPLOAD_CHUNK_SIZE', 1024 * 1024)
+        self.max_bytes = getattr(settings, 'DATASET_UPLOAD_MAX_BYTES', None)
+        self.error = None
+        self._staging = None
+        self._file = None
+
+    def new_file(self, field_name, file_name, *args, **kwargs):
+        super().new_file(field_name, file_name, *args, **kwargs)
+        try:
+            dataset_format(file_name)
+        except ValueError as e:
+            self.error = str(e)
+            raise SkipFile()
+
+        os.makedirs(upload_root(), exist_ok=True)
+        self._staging = os.path.join(upload_root(), f".upload-{uuid.uuid4().hex}")
+        self._file = open(self._staging, 'wb')
+        self._hash = hashlib.sha256()
+        self._size = 0
+
+    def receive_data_chunk(self, raw_data, start):
+        self._size += len(raw_data)
+        if self.max_bytes and self._size > self.max_bytes:
+            self.error = f"File exceeds the maximum upload size of {self.max_bytes} bytes."
+            self._discard()
+            raise StopUpload(connection_reset=True)
+        self._hash.update(raw_data)
+        self._file.write(raw_data)
+        # Other handlers do not need the data
+        return None
+
+    def file_complete(self, file_size):
+        self._file.close()
+        sha256 = self._hash.hexdigest()
+        extension = os.path.splitext(self.file_name)[1].lower()
+        path = blob_path(sha256, extension)
+
+        deduplicated = os.path.exists(path)
+        if deduplicated:
+            os.remove(self._staging)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Stored files are never modified, so they can be shared and cached by path
+            os.chmod(self._staging, 0o444)
+            os.replace(self._staging, path)
+        self._staging = None
+        return StoredUpload(self.file_name, blob_info(path, deduplicated))
+
+    def upload_interrupted(self):
+        self._discard()
+
+    def _discard(self):
+        if self._file is not None:
+            self._file.close()
+        if self._staging is not None and os.path.exists(self._staging):
+            os.remove(self._staging)
+        self._staging = None
@@ -6,10 +6,14 @@ from .views import (
     DatasetViewSet,
     FeatureSelectionViewSet,
     TrainTestSplitViewSet,
+    FilterViewSet,
+    HashEncodingViewSet,
+    ImputationViewSet,
     LinearRegressionViewSet,
     PredictViewSet,
     AccuracyViewSet,
     Add2IntViewSet,
+    JobViewSet,
 )
 
 router = DefaultRouter()
@@ -18,10 +22,14 @@ router.register(r'texts', TextViewSet, basename='text')
 router.register(r'datasets', DatasetViewSet, basename='dataset')
 router.register(r'feature-selections', FeatureSelectionViewSet, basename='featureselection')
 router.register(r'train-test-splits', TrainTestSplitViewSet, basename='traintestsplit')
+router.register(r'filters', FilterViewSet, basename='filter')
+router.register(r'hash-encodings', HashEncodingViewSet, basename='hashencoding')
+router.register(r'imputations', ImputationViewSet, basename='imputation')
 router.register(r'linear-regressions', LinearRegressionViewSet, basename='linearregression')
 router.register(r'predicts', PredictViewSet, basename='predict')
 router.register(r'accuracies', AccuracyViewSet, basename='accuracy')
 router.register(r'add2ints', Add2IntViewSet, basename='add2int')
+router.register(r'jobs', JobViewSet, basename='job')
 
 urlpatterns = [
     path('', include(router.urls)),
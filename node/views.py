@@ -2,15 +2,24 @@ from django.shortcuts import get_object_or_404
 from django.http import JsonResponse
 from rest_framework.decorators import api_view, permission_classes, action
 from rest_framework.permissions import IsAuthenticated
-from rest_framework import viewsets
+from rest_framework import viewsets, status
 from rest_framework.response import Response
 
+from utils.outputs import serialize_outputs
+from node.jobs import submit_job, get_job
+from node.services.input.dataset import columnar_copy_id, dataset_preview
+from node.services.input.profile import dataset_profile
+from node.uploads import DatasetUploadHandler, blob_info, find_blob
+
 from node.serializers import (
     IntegerSerializer,
     TextSerializer,
     DatasetSerializer,
     FeatureSelectionSerializer,
     TrainTestSplitSerializer,
+    FilterSerializer,
+    HashEncodingSerializer,
+    ImputationSerializer,
     LinearRegressionSerializer,
     PredictSerializer,
     AccuracySerializer,
@@ -22,11 +31,27 @@ from node.modules.output.text import Text
 from node.modules.input.dataset import Dataset
 from node.modules.preprocessing.feature_selection import FeatureSelection
 from node.modules.preprocessing.train_test_split import TrainTestSplit
+from node.modules.preprocessing.filter import Filter
+from node.modules.preprocessing.hash_encoding import HashEncoding
+from node.modules.preprocessing.imputation import Imputation
 from node.modules.model.linear_regression import LinearRegression
 from node.modules.evaluation.predict import Predict
 from node.modules.evaluation.accuracy import Accuracy
 from node.modules.arithmetic.add2int import Add2Int
 
+def submit_execute_job(request, node_class):
+    """
+    Queues a node execution instead of running it in the request thread.
+    Returns 202 with the job record; poll GET /api/node/jobs/{id}/ for its result.
+    """
+    payload = {key: value for key, value in request.data.items() if key != "async"}
+    job = submit_job(
+        "node.execute",
+        {"node_type": node_class.__name__, "payload": payload},
+        user=request.user,
+    )
+    return Response(job, status=status.HTTP_202_ACCEPTED)
+
 class IntegerViewSet(viewsets.ModelViewSet):
     queryset = Integer.objects.all()
     serializer_class = IntegerSerializer
@@ -35,7 +60,7 @@ class IntegerViewSet(viewsets.ModelViewSet):
     @action(methods=["post"], detail=True) 
     def execute(self, request, pk=None): 
         result = Integer.execute(request.data)
-        return Response(result)
+        return Response(serialize_outputs(result))
 
 class TextViewSet(viewsets.ModelViewSet):
     queryset = Text.objects.all()
@@ -45,7 +70,7 @@ class TextViewSet(viewsets.ModelViewSet):
     @action(methods=["post"], detail=False)
     def execute(self, request):
         result = Text.execute(request.data)
-        return Response(result)
+        return Response(serialize_outputs(result))
 
 class DatasetViewSet(viewsets.ModelViewSet):
     queryset = Dataset.objects.all()
@@ -54,7 +79,100 @@ class DatasetViewSet(viewsets.ModelViewSet):
 
     @action(methods=["post"], detail=False)
     def execute(self, request):
+        if request.data.get("async"):
+            return submit_execute_job(request, Dataset)
         result = Dataset.execute(request.data)
+        return Response(serialize_outputs(result))
+
+    @action(methods=["get", "post"], detail=False)
+    def upload(self, request):
+        """
+        Uploads a dataset file (multipart field "file"), streaming it to MEDIA_ROOT.
+        POST /api/node/datasets/upload/
+
+        Files are stored once per content hash. Before uploading, clients can check whether
+        a file is already stored with GET /api/node/datasets/upload/?sha256=<hex digest>,
+        which returns it without transferring the file again, or 404.
+
+        Use the returned file_path as the Dataset node's file_path.
+        """
+        if request.method == "GET":
+            try:
+                file_path = find_blob(request.query_params.get("sha256", ""))
+            except ValueError as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            if file_path is None:
+                return Response({"error": "No file with this content has been uploaded."},
+                                status=status.HTTP_404_NOT_FOUND)
+            return Response(blob_info(file_path, deduplicated=True))
+
+        handler = DatasetUploadHandler(request._request)
+        # Must be set before the request body is parsed
+        request._request.upload_handlers = [handler]
+        upload = request.FILES.get("file")
+        if upload is None:
+            error = handler.error or "A file must be uploaded in the 'file' field."
+            return Response({"error": error}, status=status.HTTP_400_BAD_REQUEST)
+
+        info = upload.info
+        return Response(info, status=status.HTTP_200_OK if info["deduplicated"] else status.HTTP_201_CREATED)
+
+    @action(methods=["get"], detail=True)
+    def profile(self, request, pk=None):
+        """
+        Returns the dataset's schema and column statistics.
+        GET /api/node/datasets/{id}/profile/
+
+        The profile is stored on the Dataset and only recomputed when the file or its
+        dtype hints change. Only datasets in the user's own workspaces can be profiled.
+        """
+        instance = get_object_or_404(Dataset, pk=pk, workspace__user=request.user)
+        dtypes = instance.get_inputs().get("dtypes")
+        try:
+            key = columnar_copy_id(instance.file_path, dtypes)
+            if instance.profile is None or instance.profile_key != key:
+                instance.profile = dataset_profile(instance.file_path, dtypes=dtypes)
+                instance.profile_key = instance.profile['profile_key']
+                instance.save(update_fields=["profile", "profile_key"])
+        except (ValueError, FileNotFoundError) as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(instance.profile)
+
+    @action(methods=["get"], detail=True)
+    def preview(self, request, pk=None):
+        """
+        Returns one page of the dataset in columnar form, parsed with its dtype hints.
+        GET /api/node/datasets/{id}/preview/?offset=0&limit=100&columns=a,b&sort=-a
+
+        A leading "-" on the sort column sorts in descending order. Only datasets in
+        the user's own workspaces can be previewed.
+        """
+        instance = get_object_or_404(Dataset, pk=pk, workspace__user=request.user)
+        try:
+            offset = int(request.query_params.get("offset", 0))
+            limit = min(int(request.query_params.get("limit", 100)), 1000)
+        except ValueError:
+            return Response({"error": "offset and limit must be integers."}, status=status.HTTP_400_BAD_REQUEST)
+
+        columns = request.query_params.get("columns")
+        columns = [column for column in columns.split(",") if column] if columns else None
+        sort = request.query_params.get("sort")
+        sort_by = sort.lstrip("-") if sort else None
+
+        try:
+            result = dataset_preview(
+                instance.file_path,
+                offset=offset,
+                limit=limit,
+                columns=columns,
+                sort_by=sort_by,
+                ascending=not (sort or "").startswith("-"),
+                dtypes=instance.get_inputs().get("dtypes"),
+            )
+        except (ValueError, FileNotFoundError) as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
         return Response(result)
 
 class FeatureSelectionViewSet(viewsets.ModelViewSet):
@@ -65,7 +183,7 @@ class FeatureSelectionViewSet(viewsets.ModelViewSet):
     @action(methods=["post"], detail=False)
     def execute(self, request):
         result = FeatureSelection.execute(request.data)
-        return Response(result)
+        return Response(serialize_outputs(result))
 
 class TrainTestSplitViewSet(viewsets.ModelViewSet):
     queryset = TrainTestSplit.objects.all()
@@ -75,7 +193,37 @@ class TrainTestSplitViewSet(viewsets.ModelViewSet):
     @action(methods=["post"], detail=False)
     def execute(self, request):
         result = TrainTestSplit.execute(request.data)
-        return Response(result)
+        return Response(serialize_outputs(result))
+
+class FilterViewSet(viewsets.ModelViewSet):
+    queryset = Filter.objects.all()
+    serializer_class = FilterSerializer
+    permission_classes = [IsAuthenticated]
+
+    @action(methods=["post"], detail=False)
+    def execute(self, request):
+        result = Filter.execute(request.data)
+        return Response(serialize_outputs(result))
+
+class HashEncodingViewSet(viewsets.ModelViewSet):
+    queryset = HashEncoding.objects.all()
+    serializer_class = HashEncodingSerializer
+    permission_classes = [IsAuthenticated]
+
+    @action(methods=["post"], detail=False)
+    def execute(self, request):
+        result = HashEncoding.execute(request.data)
+        return Response(serialize_outputs(result))
+
+class ImputationViewSet(viewsets.ModelViewSet):
+    queryset = Imputation.objects.all()
+    serializer_class = ImputationSerializer
+    permission_classes = [IsAuthenticated]
+
+    @action(methods=["post"], detail=False)
+    def execute(self, request):
+        result = Imputation.execute(request.data)
+        return Response(serialize_outputs(result))
 
 class LinearRegressionViewSet(viewsets.ModelViewSet):
     queryset = LinearRegression.objects.all()
@@ -84,8 +232,10 @@ class LinearRegressionViewSet(viewsets.ModelViewSet):
 
     @action(methods=["post"], detail=False)
     def execute(self, request):
+        if request.data.get("async"):
+            return submit_execute_job(request, LinearRegression)
         result = LinearRegression.execute(request.data)
-        return Response(result)
+        return Response(serialize_outputs(result))
 
 class PredictViewSet(viewsets.ModelViewSet):
     queryset = Predict.objects.all()
@@ -95,7 +245,7 @@ class PredictViewSet(viewsets.ModelViewSet):
     @action(methods=["post"], detail=False)
     def execute(self, request):
         result = Predict.execute(request.data)
-        return Response(result)
+        return Response(serialize_outputs(result))
 
 class AccuracyViewSet(viewsets.ModelViewSet):
     queryset = Accuracy.objects.all()
@@ -105,7 +255,7 @@ class AccuracyViewSet(viewsets.ModelViewSet):
     @action(methods=["post"], detail=False)
     def execute(self, request):
         result = Accuracy.execute(request.data)
-        return Response(result)
+        return Response(serialize_outputs(result))
 
 class Add2IntViewSet(viewsets.ModelViewSet):
     queryset = Add2Int.objects.all()
@@ -116,4 +266,17 @@ class Add2IntViewSet(viewsets.ModelViewSet):
     def execute(self, request, pk=None):
         instance = self.get_object()
         result = Add2Int.execute(request.data, instance_id=instance.id)
-        return Response(result)
+        return Response(serialize_outputs(result))
+
+class JobViewSet(viewsets.ViewSet):
+    """
+    Status of asynchronously executed nodes and workspace runs.
+    GET /api/node/jobs/{id}/
+    """
+    permission_classes = [IsAuthenticated]
+
+    def retrieve(self, request, pk=None):
+        job = get_job(pk, request.user)
+        if job is None:
+            return Response({"error": "Job not found."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(job)
@@ -20,8 +20,28 @@ class Workspace(models.Model):
         node_ids.update(self.dataset_nodes.values_list('id', flat=True))
         node_ids.update(self.feature_selection_nodes.values_list('id', flat=True))
         node_ids.update(self.train_test_split_nodes.values_list('id', flat=True))
+        node_ids.update(self.filter_nodes.values_list('id', flat=True))
+        node_ids.update(self.hash_encoding_nodes.values_list('id', flat=True))
+        node_ids.update(self.imputation_nodes.values_list('id', flat=True))
         node_ids.update(self.linear_regression_nodes.values_list('id', flat=True))
         node_ids.update(self.prediction_nodes.values_list('id', flat=True))
         node_ids.update(self.accuracy_nodes.values_list('id', flat=True))
         node_ids.update(self.add2int_nodes.values_list('id', flat=True))
         return node_ids
+
+    def get_all_nodes(self):
+        """Get all node instances from all node types in this workspace."""
+        nodes = []
+        nodes.extend(self.integer_nodes.all())
+        nodes.extend(self.text_nodes.all())
+        nodes.extend(self.dataset_nodes.all())
+        nodes.extend(self.feature_selection_nodes.all())
+        nodes.extend(self.train_test_split_nodes.all())
+        nodes.extend(self.filter_nodes.all())
+        nodes.extend(self.hash_encoding_nodes.all())
+        nodes.extend(self.imputation_nodes.all())
+        nodes.extend(self.linear_regression_nodes.all())
+        nodes.extend(self.prediction_nodes.all())
+        nodes.extend(self.accuracy_nodes.all())
+        nodes.extend(self.add2int_nodes.all())
+        return nodes
@@ -0,0 +1,192 @@
+import copy
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from scipy import sparse
+
+from node.artifacts import RowView, remember_copy
+
+
+class NodeOutputCache:
+    """
+    In-process LRU cache of node outputs, bounded by entry count and estimated size in bytes.
+    """
+
+    def __init__(self, max_entries=128, max_bytes=1024 ** 3):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, outputs):
+        size = estimate_size(outputs)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._size -= self._entries.pop(key)[1]
+            self._entries[key] = (outputs, size)
+            self._size += size
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(self._entries),
+                'bytes': self._size,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_node_output_cache():
+    """Returns the process-wide node output cache configured by settings.NODE_OUTPUT_CACHE."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            config = getattr(settings, 'NODE_OUTPUT_CACHE', {})
+            _cache = NodeOutputCache(
+                max_entries=config.get('MAX_ENTRIES', 128),
+                max_bytes=config.get('MAX_BYTES', 1024 ** 3),
+            )
+        return _cache
+
+
+def cache_key(node_type, inputs, upstream, node_id=None, workspace_id=None):
+    """
+    Builds a content-addressed key for a node run.
+
+    Executing a node persists state (its database row, a trained model in the registry),
+    so the key includes the node itself: two nodes fed the same data each run once, and
+    only reruns of an unchanged node are served from the cache.
+
+    Args:
+        node_type (str): Node class name.
+        inputs (dict): Inputs stored on the node (small, JSON-like values).
+        upstream (dict): Input name -> key of the upstream output wired into it.
+        node_id (int): ID of the node.
+        workspace_id (int): ID of the node's workspace.
+
+    Returns:
+        str: SHA-256 hex digest identifying the node's outputs.
+    """
+    description = {
+        'type': node_type,
+        'node': [node_id, workspace_id],
+        'inputs': {name: normalize_input(name, value) for name, value in inputs.items()},
+        'upstream': upstream,
+    }
+    encoded = json.dumps(description, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def copy_outputs(outputs):
+    """
+    Returns copies of cached outputs, so callers cannot modify the cached objects.
+
+    Tables are shallow copies (copy-on-write keeps the cached data unchanged), arrays and
+    sparse matrices read-only views of the cached data, and what is known about the cached
+    tables (their artifact, fingerprint) carries over to the copies. JSON-like values are
+    deep-copied; other objects, such as trained models and row views, are shared.
+    """
+    return {name: _copy_output(value) for name, value in outputs.items()}
+
+
+def _copy_output(value):
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return remember_copy(value.copy(deep=False), value)
+    if isinstance(value, np.ndarray):
+        view = value.view()
+        view.flags.writeable = False
+        return view
+    if sparse.issparse(value) and value.format == 'csr':
+        arrays = []
+        for array in (value.data, value.indices, value.indptr):
+            array = array.view()
+            array.flags.writeable = False
+            arrays.append(array)
+        return remember_copy(type(value)(tuple(arrays), shape=value.shape, copy=False), value)
+    if isinstance(value, (dict, list, tuple)):
+        return copy.deepcopy(value)
+    return value
+
+
+def output_key(node_key, output_name):
+    """Key of a single output, derived from the key of the node run that produced it."""
+    return hashlib.sha256(f"{node_key}:{output_name}".encode()).hexdigest()
+
+
+def normalize_input(name, value):
+    # Files are identified by path, modification time and size so edits invalidate the cache
+    if name == 'file_path' and isinstance(value, str) and os.path.exists(value):
+        stat = os.stat(value)
+        return [os.path.abspath(value), stat.st_mtime_ns, stat.st_size]
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (list, tuple)):
+        return [normalize_input(name, item) for item in value]
+    return value
+
+
+def estimate_size(outputs):
+    """Estimates the memory held by a node's outputs in bytes."""
+    size = 0
+    for value in outputs.values():
+        if isinstance(value, pd.DataFrame):
+            size += int(value.memory_usage(index=True, deep=True).sum())
+        elif isinstance(value, pd.Series):
+            size += int(value.memory_usage(index=True, deep=True))
+        elif isinstance(value, np.ndarray):
+            size += value.nbytes
+        elif sparse.issparse(value):
+            size += sparse_nbytes(value)
+        elif isinstance(value, RowView):
+            # The parent table is held by the upstream node's outputs
+            size += value.positions.nbytes
+        else:
+            size += 64
+    return size
+
+
+def sparse_nbytes(matrix):
+    """Bytes held by the arrays of a sparse matrix: its stored values and their indices."""
+    if matrix.format in ('csr', 'csc', 'bsr'):
+        return matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes
+    if matrix.format == 'coo':
+        return matrix.data.nbytes + sum(coords.nbytes for coords in matrix.coords)
+    # Other formats (e.g. LIL, DOK) hold about a value and its row and column per entry
+    return matrix.nnz * (matrix.dtype.itemsize + 2 * np.dtype(np.intp).itemsize)
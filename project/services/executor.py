@@ -0,0 +1,362 @@
+import contextvars
+import json
+import time
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.db import connection
+
+from node.services.input.sample import validate_sample
+from utils.outputs import summarize_outputs
+
+from .cache import cache_key, copy_outputs, get_node_output_cache, output_key
+
+
+def run_workspace(workspace, use_cache=True, max_workers=None, sample=None):
+    """
+    Runs every node of a workspace in dependency order, wiring outputs into inputs in memory.
+
+    Each edge passes the source node's output named by source_handle (e.g. O_Dataset_data
+    or data) into the target node's input named by target_handle (e.g.
+    I_FeatureSelection_dataframe). Inputs stored on a node are used unless an edge
+    provides them.
+
+    Nodes run on a bounded thread pool as soon as all of their upstream nodes have
+    finished, so independent branches execute concurrently.
+
+    Nodes producing a table (e.g. Dataset) are told which columns and rows their
+    downstream nodes read, so only those are loaded (see plan_tables).
+
+    Outputs are memoized per node by its stored inputs and the keys of the upstream
+    outputs, so nodes whose inputs did not change since a previous run are not recomputed.
+
+    With sample, the graph runs on a deterministic sample of the rows of every source
+    table (see node.services.input.sample) for fast feedback while editing; every node
+    downstream of one is marked as sampled. Running again without sample replays the
+    same graph on all the data. Sampled and full outputs are cached separately.
+
+    Args:
+        workspace (Workspace): Workspace whose graph should be run.
+        use_cache (bool): Whether to read cached outputs. Results are cached either way.
+        max_workers (int): Number of nodes run concurrently, capped at and defaulting to
+            settings.WORKSPACE_RUN_MAX_WORKERS.
+        sample (dict): Optional {'rows': int} or {'fraction': float}, with an optional 'seed'.
+
+    Returns:
+        dict: {
+            'workspace_id': int,
+            'mode': 'sample' or 'full',
+            'sample': the normalized sample specification, or None,
+            'order': list of node labels in topological order,
+            'nodes': list of {'id', 'type', 'sampled', 'cached', 'started_ms', 'duration_ms',
+                     'outputs'} with summarized outputs and timings relative to the start of the run,
+            'duration_ms': wall-clock time of the whole run,
+            'cache': cache statistics
+        }
+
+    Raises:
+        ValueError: If an edge is invalid, the graph contains a cycle, the sample is
+            invalid or a node fails.
+    """
+    if sample is not None:
+        sample = validate_sample(sample)
+    nodes = workspace.get_all_nodes()
+    edges = resolve_edges(nodes, workspace.edges or [])
+    order = topological_sort(nodes, edges)
+    planned = plan_tables(order, edges)
+    cache = get_node_output_cache()
+    worker_limit = getattr(settings, 'WORKSPACE_RUN_MAX_WORKERS', 4)
+    max_workers = min(max_workers or worker_limit, worker_limit)
+
+    incoming = defaultdict(list)
+    for edge in edges:
+        incoming[node_key(edge['target'])].append(edge)
+    in_degree, downstream = dependency_counts(nodes, edges)
+
+    if sample is not None:
+        # Source tables (e.g. Dataset nodes) load a sample of their rows
+        for node in nodes:
+            if type(node).table_outputs and not incoming[node_key(node)]:
+                planned.setdefault(node_key(node), {})['sample'] = sample
+    sampled = {}
+
+    outputs = {}
+    keys = {}
+    runs = {}
+    started = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        pending = {}
+
+        def submit(node):
+            inputs, upstream, stored = collect_inputs(
+                node, incoming[node_key(node)], outputs, keys, planned.get(node_key(node))
+            )
+            key = cache_key(type(node).__name__, stored, upstream, node.id, node.workspace_id)
+            keys[node_key(node)] = key
+            sampled[node_key(node)] = 'sample' in planned.get(node_key(node), {}) or any(
+                sampled[node_key(edge['source'])] for edge in incoming[node_key(node)]
+            )
+            # Nodes run as the user of the run, who owns the artifacts and models they use
+            future = pool.submit(contextvars.copy_context().run, run_node,
+                                 workspace, node, inputs, key, cache, use_cache, started)
+            pending[future] = node
+
+        for node in order:
+            if in_degree[node_key(node)] == 0:
+                submit(node)
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                node = pending.pop(future)
+                try:
+                    result, run = future.result()
+                except Exception:
+                    for other in pending:
+                        other.cancel()
+                    raise
+                outputs[node_key(node)] = result
+                runs[node_key(node)] = run
+                for target in downstream[node_key(node)]:
+                    in_degree[node_key(target)] -= 1
+                    if in_degree[node_key(target)] == 0:
+                        submit(target)
+
+    return {
+        'workspace_id': workspace.id,
+        'mode': 'sample' if sample is not None else 'full',
+        'sample': sample,
+        'order': [node_label(node) for node in order],
+        'nodes': [
+            {
+                'id': node.id,
+                'type': type(node).__name__,
+                'sampled': sampled[node_key(node)],
+                **runs[node_key(node)],
+                'outputs': summarize_outputs(outputs[node_key(node)]),
+            }
+            for node in order
+        ],
+        'duration_ms': round((time.perf_counter() - started) * 1000, 3),
+        'cache': cache.stats(),
+    }
+
+
+def run_node(workspace, node, inputs, key, cache, use_cache, run_started):
+    """
+    Runs a single node on a worker thread, reading and filling the output cache.
+
+    Returns:
+        tuple: (outputs, {'cached', 'started_ms', 'duration_ms'})
+    """
+    node_started = time.perf_counter()
+    try:
+        result = cache.get(key) if use_cache else None
+        cached = result is not None
+        if result is None:
+            result = execute_node(node, build_payload(workspace, node, inputs))
+            cache.put(key, result)
+        else:
+            result = {**copy_outputs(result), **node_identity(node)}
+    finally:
+        # Worker threads open their own database connections
+        connection.close()
+    node_finished = time.perf_counter()
+
+    return result, {
+        'cached': cached,
+        'started_ms': round((node_started - run_started) * 1000, 3),
+        'duration_ms': round((node_finished - node_started) * 1000, 3),
+    }
+
+
+def node_key(node):
+    """Node IDs are only unique per node type, so nodes are keyed by (type, id)."""
+    return (type(node).__name__, node.id)
+
+
+def node_label(node):
+    return f"{type(node).__name__}:{node.id}"
+
+
+def handle_name(handle, node):
+    """
+    Strips the I_/O_ and node type prefixes from an edge handle,
+    e.g. I_LinearRegression_X_train -> X_train.
+    """
+    for prefix in (f"I_{type(node).__name__}_", f"O_{type(node).__name__}_", "I_", "O_"):
+        if handle.startswith(prefix):
+            return handle[len(prefix):]
+    return handle
+
+
+def resolve_edges(nodes, edges):
+    """
+    Resolves the source and target IDs of each stored edge to node instances.
+
+    Returns:
+        list: [{'source', 'target', 'output', 'input'}] with node instances and handle names
+    """
+    nodes_by_id = defaultdict(list)
+    for node in nodes:
+        nodes_by_id[node.id].append(node)
+
+    resolved = []
+    for edge in edges:
+        source = _resolve_node(nodes_by_id, edge.get('source_id'), edge.get('source_handle', ''))
+        target = _resolve_node(nodes_by_id, edge.get('target_id'), edge.get('target_handle', ''))
+        resolved.append({
+            'source': source,
+            'target': target,
+            'output': handle_name(edge.get('source_handle', ''), source),
+            'input': handle_name(edge.get('target_handle', ''), target),
+        })
+    return resolved
+
+
+def _resolve_node(nodes_by_id, node_id, handle):
+    candidates = nodes_by_id.get(node_id, [])
+    if len(candidates) > 1:
+        # Disambiguate with the node type carried by handles such as I_Add2Int_num1
+        candidates = [node for node in candidates if handle.startswith(f"I_{type(node).__name__}_")
+                      or handle.startswith(f"O_{type(node).__name__}_")]
+    if not candidates:
+        raise ValueError(f"Node with id={node_id} does not exist in this workspace.")
+    if len(candidates) > 1:
+        raise ValueError(f"Node id={node_id} is ambiguous; prefix handle '{handle}' with the node type.")
+    return candidates[0]
+
+
+def dependency_counts(nodes, edges):
+    """
+    Returns:
+        tuple: (in_degree, downstream) mapping each node key to its number of incoming
+        edges and to the list of nodes its outgoing edges point to.
+    """
+    in_degree = {node_key(node): 0 for node in nodes}
+    downstream = defaultdict(list)
+    for edge in edges:
+        downstream[node_key(edge['source'])].append(edge['target'])
+        in_degree[node_key(edge['target'])] += 1
+    return in_degree, downstream
+
+
+def topological_sort(nodes, edges):
+    """
+    Orders nodes so that every node comes after all of its upstream nodes (Kahn's algorithm).
+
+    Raises:
+        ValueError: If the graph contains a cycle.
+    """
+    in_degree, downstream = dependency_counts(nodes, edges)
+
+    ready = deque(node for node in nodes if in_degree[node_key(node)] == 0)
+    order = []
+    while ready:
+        node = ready.popleft()
+        order.append(node)
+        for target in downstream[node_key(node)]:
+            in_degree[node_key(target)] -= 1
+            if in_degree[node_key(target)] == 0:
+                ready.append(target)
+
+    if len(order) != len(nodes):
+        raise ValueError("Workspace graph contains a cycle.")
+    return order
+
+
+def plan_tables(order, edges):
+    """
+    Works out which part of its table each node with table_outputs has to load, from
+    the nodes those outputs are wired into:
+
+    - usecols: the union of the columns read by its consumers, if all of them declare it
+    - filters: the row filters of its consumers, if all of them filter rows; a row is
+      needed if it passes any of them
+
+    Consumers are planned first (reverse topological order), so nodes passing a table
+    through, such as Filter, can add the columns read further downstream.
+
+    Returns:
+        dict: Node key -> planned inputs, for nodes that do not need their whole table.
+    """
+    consumers = defaultdict(list)
+    for edge in edges:
+        if edge['output'] in type(edge['source']).table_outputs:
+            consumers[node_key(edge['source'])].append(edge)
+
+    planned = {}
+    for node in reversed(order):
+        if not consumers[node_key(node)]:
+            continue
+        columns, filters = set(), []
+        for edge in consumers[node_key(node)]:
+            target, name = edge['target'], edge['input']
+            required = target.get_required_columns(name, planned.get(node_key(target), {}).get('usecols'))
+            columns = None if columns is None or required is None else columns | set(required)
+            row_filter = target.get_row_filter(name)
+            filters = None if filters is None or not row_filter else filters + [row_filter]
+
+        plan = {}
+        if columns is not None:
+            plan['usecols'] = sorted(columns)
+        if filters:
+            unique = {json.dumps(conditions, sort_keys=True): conditions for conditions in filters}
+            plan['filters'] = [unique[key] for key in sorted(unique)]
+        if plan:
+            planned[node_key(node)] = plan
+    return planned
+
+
+def collect_inputs(node, incoming_edges, outputs, keys, planned=None):
+    """
+    Gathers a node's inputs from its stored inputs, the inputs planned for it by
+    plan_tables and its upstream outputs.
+
+    Returns:
+        tuple: (inputs, upstream, stored) where upstream maps each wired input to the
+        key of the upstream output and stored holds the inputs not provided by edges.
+    """
+    stored = {**node.get_inputs(), **(planned or {})}
+    inputs = dict(stored)
+    upstream = {}
+    for edge in incoming_edges:
+        source_outputs = outputs[node_key(edge['source'])]
+        if edge['output'] not in source_outputs:
+            raise ValueError(f"{node_label(edge['source'])} has no output '{edge['output']}'.")
+        inputs[edge['input']] = source_outputs[edge['output']]
+        upstream[edge['input']] = output_key(keys[node_key(edge['source'])], edge['output'])
+        stored.pop(edge['input'], None)
+    return inputs, upstream, stored
+
+
+def build_payload(workspace, node, inputs):
+    """
+    Builds the execute payload for a node from its inputs.
+    """
+    node_type = type(node).__name__
+    params = {f"I_{node_type}_{name}": value for name, value in inputs.items()}
+    return {
+        'workspace': workspace.id,
+        'metadata': {'id': node.id, **params},
+        **params,
+    }
+
+
+def node_identity(node):
+    """Fields of the node row that may have changed (e.g. its position) since its outputs were cached."""
+    return {
+        'id': node.id,
+        'position_x': node.position_x,
+        'position_y': node.position_y,
+        'workspace': node.workspace_id,
+    }
+
+
+def execute_node(node, payload):
+    try:
+        return type(node).execute(payload)
+    except (ValueError, FileNotFoundError) as e:
+        raise ValueError(f"{node_label(node)} failed: {e}")
@@ -1,3 +1,459 @@
-from django.test import TestCase
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from rest_framework.test import APIClient
+
+from node.artifacts import artifacts_owned_by
+from node.model_registry import load_model
+from node.models import (
+    Accuracy, Dataset, FeatureSelection, Filter, Imputation, LinearRegression, Predict, TrainTestSplit,
+)
+from node.services.model import gram
+from project.models import Workspace
+from project.services import executor
+from project.services.cache import NodeOutputCache, copy_outputs, estimate_size, get_node_output_cache
+from project.services.executor import node_label, run_workspace
+
+
+def edge(source, output, target, input_name):
+    return {
+        'source_id': source.id,
+        'target_id': target.id,
+        'source_handle': f"O_{type(source).__name__}_{output}",
+        'target_handle': f"I_{type(target).__name__}_{input_name}",
+        'edge_id': f"{source.id}-{target.id}-{input_name}",
+    }
+
+
+class WorkspaceRunTestCase(TransactionTestCase):
+    """Runs workspace graphs against a temporary MEDIA_ROOT and an empty output cache."""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(
+            MEDIA_ROOT=self.media_root,
+            ARTIFACT_ROOT=os.path.join(self.media_root, 'artifacts'),
+            MODEL_REGISTRY_ROOT=os.path.join(self.media_root, 'models'),
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        get_node_output_cache().clear()
+
+        self.user = get_user_model().objects.create(username='owner', email='owner@example.com')
+        self.workspace = Workspace.objects.create(user=self.user, name='workspace')
+
+        rng = np.random.default_rng(0)
+        frame = pd.DataFrame({'a': rng.normal(size=200), 'b': rng.normal(size=200)})
+        frame['t'] = 3 * frame['a'] - 2 * frame['b'] + 0.5
+        self.csv_path = os.path.join(self.media_root, 'data.csv')
+        frame.to_csv(self.csv_path, index=False)
+
+    def add_pipeline(self):
+        """Dataset -> FeatureSelection -> TrainTestSplit -> LinearRegression -> Predict -> Accuracy."""
+        ws = self.workspace
+        nodes = {
+            'dataset': Dataset.objects.create(workspace=ws, file_path=self.csv_path, rows=0, columns=0),
+            'selection': FeatureSelection.objects.create(workspace=ws, target_column='t', n_features=2,
+                                                         feature_columns='["a", "b"]'),
+            'split': TrainTestSplit.objects.create(workspace=ws, test_size=0.25, random_state=0,
+                                                  train_samples=0, test_samples=0),
+            'regression': LinearRegression.objects.create(workspace=ws, n_features=0),
+            'predict': Predict.objects.create(workspace=ws, n_predictions=0),
+            'accuracy': Accuracy.objects.create(workspace=ws, metric_type='r2', metric_value=0),
+        }
+        ws.edges = (ws.edges or []) + [
+            edge(nodes['dataset'], 'data', nodes['selection'], 'dataframe'),
+            edge(nodes['selection'], 'X', nodes['split'], 'X'),
+            edge(nodes['selection'], 'y', nodes['split'], 'y'),
+            edge(nodes['split'], 'X_train', nodes['regression'], 'X_train'),
+            edge(nodes['split'], 'y_train', nodes['regression'], 'y_train'),
+            edge(nodes['regression'], 'model', nodes['predict'], 'model'),
+            edge(nodes['split'], 'X_test', nodes['predict'], 'X'),
+            edge(nodes['predict'], 'predictions', nodes['accuracy'], 'y_pred'),
+            edge(nodes['split'], 'y_test', nodes['accuracy'], 'y_true'),
+        ]
+        ws.save()
+        return nodes
+
+    def run_nodes(self, **options):
+        result = run_workspace(self.workspace, **options)
+        return {(node['type'], node['id']): node for node in result['nodes']}
+
+
+class ConcurrentRunTests(WorkspaceRunTestCase):
+
+    def run_tracked(self, dataset_barrier=None, **options):
+        """Runs the workspace, returning the node runs and the most nodes that ran at once."""
+        execute = executor.execute_node
+        lock = threading.Lock()
+        running, peak = [0], [0]
+
+        def tracked(node, payload):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            try:
+                if dataset_barrier is not None and isinstance(node, Dataset):
+                    # Only passes once every Dataset node is running
+                    dataset_barrier.wait()
+                else:
+                    time.sleep(0.005)
+                return execute(node, payload)
+            finally:
+                with lock:
+                    running[0] -= 1
+
+        with mock.patch.object(executor, 'execute_node', side_effect=tracked):
+            return self.run_nodes(**options), peak[0]
+
+    def assert_runs_after_upstream(self, runs):
+        for edge in self.workspace.edges:
+            source = next(run for key, run in runs.items() if key[1] == edge['source_id']
+                          and edge['source_handle'].startswith(f"O_{key[0]}_"))
+            target = next(run for key, run in runs.items() if key[1] == edge['target_id']
+                          and edge['target_handle'].startswith(f"I_{key[0]}_"))
+            self.assertGreaterEqual(target['started_ms'] + 0.01, source['started_ms'] + source['duration_ms'])
+
+    def test_independent_branches_run_concurrently(self):
+        first = self.add_pipeline()
+        second = self.add_pipeline()
+        runs, peak = self.run_tracked(dataset_barrier=threading.Barrier(2, timeout=10), max_workers=2)
+
+        self.assertEqual(peak, 2)
+        for nodes in (first, second):
+            accuracy = runs[('Accuracy', nodes['accuracy'].id)]
+            self.assertAlmostEqual(accuracy['outputs']['metric_value'], 1.0)
+        for run in runs.values():
+            self.assertGreaterEqual(run['started_ms'], 0)
+            self.assertGreaterEqual(run['duration_ms'], 0)
+        self.assert_runs_after_upstream(runs)
+
+    def test_one_worker_runs_nodes_one_at_a_time(self):
+        self.add_pipeline()
+        self.add_pipeline()
+        runs, peak = self.run_tracked(max_workers=1)
+
+        self.assertEqual(peak, 1)
+        intervals = sorted((run['started_ms'], run['started_ms'] + run['duration_ms']) for run in runs.values())
+        for (_, finished), (started, _) in zip(intervals, intervals[1:]):
+            self.assertGreaterEqual(started + 0.01, finished)
+        self.assert_runs_after_upstream(runs)
+
+
+class NodeOutputCacheSizeTests(SimpleTestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.X = sparse.random(1000, 500, density=0.01, format='csr', random_state=rng)
+
+    def test_sparse_outputs_are_sized_by_their_arrays(self):
+        X = self.X
+        self.assertEqual(estimate_size({'X': X}), X.data.nbytes + X.indices.nbytes + X.indptr.nbytes)
+        coo = X.tocoo()
+        self.assertEqual(estimate_size({'X': coo}), coo.data.nbytes + coo.row.nbytes + coo.col.nbytes)
+        self.assertGreaterEqual(estimate_size({'X': X.tolil()}), X.nnz * X.dtype.itemsize)
+
+    def test_sparse_outputs_count_against_the_byte_limit(self):
+        cache = NodeOutputCache(max_bytes=estimate_size({'X': self.X}) + 100)
+        cache.put('first', {'X': self.X})
+        self.assertEqual(cache.stats()['bytes'], estimate_size({'X': self.X}))
+        cache.put('second', {'X': self.X.copy()})
+        self.assertIsNone(cache.get('first'))
+        self.assertIsNotNone(cache.get('second'))
+        cache.put('large', {'X': sparse.vstack([self.X, self.X], format='csr')})
+        self.assertIsNone(cache.get('large'))
+
+
+class NodeOutputCacheTests(WorkspaceRunTestCase):
+
+    def test_rerun_is_served_from_cache(self):
+        nodes = self.add_pipeline()
+        first = self.run_nodes()
+        second = self.run_nodes()
+
+        self.assertFalse(any(node['cached'] for node in first.values()))
+        self.assertTrue(all(node['cached'] for node in second.values()))
+        accuracy = ('Accuracy', nodes['accuracy'].id)
+        self.assertEqual(first[accuracy]['outputs']['metric_value'], second[accuracy]['outputs']['metric_value'])
+
+    def test_changed_input_invalidates_downstream(self):
+        nodes = self.add_pipeline()
+        self.run_nodes()
+        nodes['split'].test_size = 0.5
+        nodes['split'].save()
+
+        runs = self.run_nodes()
+        self.assertTrue(runs[('Dataset', nodes['dataset'].id)]['cached'])
+        self.assertTrue(runs[('FeatureSelection', nodes['selection'].id)]['cached'])
+        for name, node_type in [('split', 'TrainTestSplit'), ('regression', 'LinearRegression'),
+                                ('accuracy', 'Accuracy')]:
+            self.assertFalse(runs[(node_type, nodes[name].id)]['cached'])
+
+    def test_edited_file_invalidates_dataset(self):
+        nodes = self.add_pipeline()
+        self.run_nodes()
+        frame = pd.read_csv(self.csv_path)
+        frame['t'] = frame['a'] + 1
+        frame.to_csv(self.csv_path, index=False)
+        os.utime(self.csv_path, ns=(0, os.stat(self.csv_path).st_mtime_ns + 10 ** 9))
+
+        runs = self.run_nodes()
+        self.assertFalse(runs[('Dataset', nodes['dataset'].id)]['cached'])
+        self.assertAlmostEqual(runs[('Accuracy', nodes['accuracy'].id)]['outputs']['metric_value'], 1.0)
+
+    def test_use_cache_false_recomputes(self):
+        self.add_pipeline()
+        self.run_nodes()
+        runs = self.run_nodes(use_cache=False)
+        self.assertFalse(any(node['cached'] for node in runs.values()))
+
+    def test_nodes_with_identical_inputs_each_persist_their_results(self):
+        first = self.add_pipeline()
+        second = self.add_pipeline()
+        self.run_nodes()
+
+        for nodes in (first, second):
+            regression = LinearRegression.objects.get(id=nodes['regression'].id)
+            self.assertEqual(regression.n_features, 2)
+            model = load_model({'node_id': regression.id})
+            np.testing.assert_allclose(model.coef_, [3, -2], atol=1e-8)
+
+    def test_cache_hits_return_copies(self):
+        frame = pd.DataFrame({'a': [1.0, 2.0]})
+        cached = {'X': frame, 'values': frame['a'].to_numpy(), 'columns': ['a']}
+
+        outputs = copy_outputs(cached)
+        outputs['X'].loc[0, 'a'] = 100.0
+        outputs['columns'].append('b')
+        with self.assertRaises(ValueError):
+            outputs['values'][0] = 100.0
+
+        self.assertEqual(frame.loc[0, 'a'], 1.0)
+        self.assertEqual(cached['columns'], ['a'])
+
+
+class GramFitWorkspaceTests(WorkspaceRunTestCase):
+
+    def test_regression_wired_to_its_dataset_fits_from_gram_statistics(self):
+        nodes = self.add_pipeline()
+        self.workspace.edges.append(edge(nodes['dataset'], 'data', nodes['regression'], 'dataframe'))
+        self.workspace.save()
+        gram._cache._entries.clear()
+
+        runs = self.run_nodes()
+        self.assertEqual(len(gram._cache._entries), 1)
+        model = load_model({'node_id': nodes['regression'].id})
+        np.testing.assert_allclose(model.coef_, [3, -2], atol=1e-8)
+        self.assertAlmostEqual(runs[('Accuracy', nodes['accuracy'].id)]['outputs']['metric_value'], 1.0)
+
+
+class WorkspaceRunTests(WorkspaceRunTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = f'/api/project/workspaces/{self.workspace.id}/run/'
+
+    def test_runs_every_node_in_dependency_order(self):
+        nodes = self.add_pipeline()
+        response = self.client.post(self.url, {}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        result = response.json()
+        self.assertEqual(len(result['nodes']), len(nodes))
+        position = {label: index for index, label in enumerate(result['order'])}
+        for source, target in [('dataset', 'selection'), ('selection', 'split'), ('split', 'regression'),
+                               ('regression', 'predict'), ('predict', 'accuracy'), ('split', 'accuracy')]:
+            self.assertLess(position[node_label(nodes[source])], position[node_label(nodes[target])])
+
+        by_type = {node['type']: node for node in result['nodes']}
+        self.assertAlmostEqual(by_type['Accuracy']['outputs']['metric_value'], 1.0)
+        self.assertEqual(TrainTestSplit.objects.get(id=nodes['split'].id).train_samples, 150)
+
+    def test_cycle_is_rejected(self):
+        nodes = self.add_pipeline()
+        self.workspace.edges.append(edge(nodes['accuracy'], 'metric_value', nodes['selection'], 'dataframe'))
+        self.workspace.save()
+
+        response = self.client.post(self.url, {}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('cycle', response.json()['error'])
+
+    def test_invalid_options_are_rejected(self):
+        self.add_pipeline()
+        for body in ({'use_cache': 'maybe'}, {'use_cache': 0}, {'use_cache': None}, {'async': 'yes'},
+                     {'max_workers': 0}, {'max_workers': True}, {'max_workers': '2'}, {'max_workers': 1.5},
+                     {'sample': {'rows': 0}}):
+            with self.subTest(body=body):
+                response = self.client.post(self.url, body, format='json')
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('error', response.json())
+
+    def test_boolean_options_are_parsed_strictly(self):
+        self.add_pipeline()
+        self.assertEqual(self.client.post(self.url, {'max_workers': 1}, format='json').status_code, 200)
+
+        response = self.client.post(self.url, {'use_cache': 'false'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(any(node['cached'] for node in response.json()['nodes']))
+        response = self.client.post(self.url, {'use_cache': True}, format='json')
+        self.assertTrue(all(node['cached'] for node in response.json()['nodes']))
+
+    def test_trained_models_belong_to_the_workspace_owner(self):
+        nodes = self.add_pipeline()
+        self.assertEqual(self.client.post(self.url, {}, format='json').status_code, 200)
+        other = get_user_model().objects.create(username='other', email='other@example.com')
+
+        with artifacts_owned_by(self.user.id):
+            self.assertEqual(load_model({'node_id': nodes['regression'].id}).n_features_in_, 2)
+        with artifacts_owned_by(other.id), self.assertRaisesMessage(ValueError, 'Model not found'):
+            load_model({'node_id': nodes['regression'].id})
+
+    def test_other_users_workspace_is_not_found(self):
+        other = get_user_model().objects.create(username='other', email='other@example.com')
+        self.client.force_authenticate(other)
+        response = self.client.post(self.url, {}, format='json')
+        self.assertEqual(response.status_code, 404)
+
+
+class SampledRunTests(WorkspaceRunTestCase):
+
+    def dataset_rows(self, result):
+        return next(node for node in result['nodes'] if node['type'] == 'Dataset')['outputs']['data']['shape'][0]
+
+    def test_sampled_run_marks_every_node(self):
+        self.add_pipeline()
+        result = run_workspace(self.workspace, sample={'rows': 40})
+
+        self.assertEqual(result['mode'], 'sample')
+        self.assertEqual(result['sample'], {'rows': 40, 'seed': 0})
+        self.assertTrue(all(node['sampled'] for node in result['nodes']))
+        self.assertEqual(self.dataset_rows(result), 40)
+
+    def test_sample_is_deterministic_and_cached_apart_from_full_runs(self):
+        nodes = self.add_pipeline()
+        first = run_workspace(self.workspace, sample={'fraction': 0.3, 'seed': 4})
+        second = run_workspace(self.workspace, sample={'fraction': 0.3, 'seed': 4}, use_cache=False)
+        self.assertEqual(self.dataset_rows(first), self.dataset_rows(second))
+        self.assertEqual(
+            [node['outputs'].get('metric_value') for node in first['nodes']],
+            [node['outputs'].get('metric_value') for node in second['nodes']],
+        )
+
+        full = run_workspace(self.workspace)
+        self.assertEqual(full['mode'], 'full')
+        self.assertFalse(any(node['cached'] or node['sampled'] for node in full['nodes']))
+        self.assertEqual(self.dataset_rows(full), 200)
+        self.assertEqual(TrainTestSplit.objects.get(id=nodes['split'].id).train_samples, 150)
+
+        again = run_workspace(self.workspace, sample={'fraction': 0.3, 'seed': 4})
+        self.assertTrue(all(node['cached'] for node in again['nodes']))
+
+    def test_sampled_run_does_not_load_the_whole_table(self):
+        self.add_pipeline()
+        with mock.patch('node.modules.input.dataset.load_dataset', side_effect=AssertionError('loaded every row')):
+            result = run_workspace(self.workspace, sample={'rows': 40})
+        self.assertEqual(self.dataset_rows(result), 40)
+        dataset = next(node for node in result['nodes'] if node['type'] == 'Dataset')
+        self.assertEqual(dataset['outputs']['rows'], 200)
+
+    def test_invalid_sample_is_rejected(self):
+        self.add_pipeline()
+        with self.assertRaisesMessage(ValueError, 'sample rows must be a positive integer'):
+            run_workspace(self.workspace, sample={'rows': 0})
+
+
+class PlanTablesTests(WorkspaceRunTestCase):
+
+    def setUp(self):
+        super().setUp()
+        frame = pd.read_csv(self.csv_path)
+        frame['unused'] = 1.0
+        frame.to_csv(self.csv_path, index=False)
+        ws = self.workspace
+        self.dataset = Dataset.objects.create(workspace=ws, file_path=self.csv_path, rows=0, columns=0)
+        self.selection = FeatureSelection.objects.create(workspace=ws, target_column='t', n_features=1,
+                                                         feature_columns='["a"]')
+
+    def connect(self, *edges):
+        self.workspace.edges = list(edges)
+        self.workspace.save()
+
+    def plan(self):
+        nodes = self.workspace.get_all_nodes()
+        edges = executor.resolve_edges(nodes, self.workspace.edges)
+        return executor.plan_tables(executor.topological_sort(nodes, edges), edges)
+
+    def test_dataset_loads_the_columns_its_consumers_read(self):
+        self.connect(edge(self.dataset, 'data', self.selection, 'dataframe'))
+
+        self.assertEqual(self.plan(), {('Dataset', self.dataset.id): {'usecols': ['a', 't']}})
+        runs = self.run_nodes()
+        data = runs[('Dataset', self.dataset.id)]['outputs']['data']
+        self.assertEqual((data['columns'], data['shape']), (['a', 't'], [200, 2]))
+        self.assertEqual(runs[('Dataset', self.dataset.id)]['outputs']['columns'], 4)
+
+    def test_columns_and_filters_of_every_consumer_are_combined(self):
+        conditions = [{'column': 'b', 'op': '>', 'value': 0}]
+        row_filter = Filter.objects.create(workspace=self.workspace, conditions=json.dumps(conditions), rows=0)
+        self.connect(
+            edge(self.dataset, 'data', row_filter, 'dataframe'),
+            edge(row_filter, 'data', self.selection, 'dataframe'),
+        )
+
+        # The filter reads its condition column on top of what is read downstream of it
+        self.assertEqual(self.plan(), {
+            ('Dataset', self.dataset.id): {'usecols': ['a', 'b', 't'], 'filters': [conditions]},
+            ('Filter', row_filter.id): {'usecols': ['a', 't']},
+        })
+        frame = pd.read_csv(self.csv_path)
+        data = self.run_nodes()[('Dataset', self.dataset.id)]['outputs']['data']
+        self.assertEqual(data['columns'], ['a', 'b', 't'])
+        self.assertEqual(data['shape'], [int((frame['b'] > 0).sum()), 3])
+
+        # Consumers reading every row load all rows, and one reading every column all columns
+        unfiltered = FeatureSelection.objects.create(workspace=self.workspace, target_column='t',
+                                                     n_features=1, feature_columns='["b"]')
+        self.workspace.edges.append(edge(self.dataset, 'data', unfiltered, 'dataframe'))
+        self.workspace.save()
+        self.assertEqual(self.plan()[('Dataset', self.dataset.id)], {'usecols': ['a', 'b', 't']})
+        regression = LinearRegression.objects.create(workspace=self.workspace, n_features=0)
+        self.workspace.edges.append(edge(self.dataset, 'data', regression, 'dataframe'))
+        self.workspace.save()
+        self.assertNotIn(('Dataset', self.dataset.id), self.plan())
+
+
+class ImputationWorkspaceTests(WorkspaceRunTestCase):
+
+    def test_imputed_columns_are_loaded_when_not_read_downstream(self):
+        frame = pd.read_csv(self.csv_path)
+        frame['c'] = np.where(frame.index % 10 == 0, np.nan, 1.0)
+        frame.loc[3, 'a'] = np.nan
+        frame.to_csv(self.csv_path, index=False)
+        ws = self.workspace
+        dataset = Dataset.objects.create(workspace=ws, file_path=self.csv_path, rows=0, columns=0)
+        imputation = Imputation.objects.create(workspace=ws, strategy='mean', columns='["a", "c"]', rows=0)
+        selection = FeatureSelection.objects.create(workspace=ws, target_column='t', n_features=2,
+                                                    feature_columns='["a", "b"]')
+        ws.edges = [
+            edge(dataset, 'data', imputation, 'dataframe'),
+            edge(imputation, 'data', selection, 'dataframe'),
+        ]
+        ws.save()
+
+        runs = self.run_nodes()
+        self.assertEqual(runs[('Dataset', dataset.id)]['outputs']['data']['columns'], ['a', 'b', 't', 'c'])
+        self.assertEqual(runs[('Imputation', imputation.id)]['outputs']['missing'], {'a': 1, 'c': 20})
+        self.assertEqual(runs[('FeatureSelection', selection.id)]['outputs']['X']['shape'], [200, 2])
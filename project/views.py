@@ -5,6 +5,9 @@ from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
 from .models import Workspace
 from .serializers import WorkspaceSerializer, EdgeSerializer
+from .services.executor import run_workspace
+from node.jobs import submit_job
+from node.services.input.sample import validate_sample
 import uuid
 
 from node.serializers import (
@@ -13,6 +16,9 @@ from node.serializers import (
     DatasetSerializer,
     FeatureSelectionSerializer,
     TrainTestSplitSerializer,
+    FilterSerializer,
+    HashEncodingSerializer,
+    ImputationSerializer,
     LinearRegressionSerializer,
     PredictSerializer,
     AccuracySerializer,
@@ -20,6 +26,21 @@ from node.serializers import (
 )
 
 
+def parse_bool(value, name):
+    """
+    Reads a boolean request option: JSON true/false, or "true"/"false" (any case) as sent
+    by form data.
+
+    Raises:
+        ValueError: For any other value, rather than treating e.g. "false" as true.
+    """
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.lower() in ('true', 'false'):
+        return value.lower() == 'true'
+    raise ValueError(f"{name} must be true or false.")
+
+
 class WorkspaceViewSet(viewsets.ModelViewSet):
     """
     ViewSet for CRUD operations on Workspace.
@@ -58,6 +79,9 @@ class WorkspaceViewSet(viewsets.ModelViewSet):
                 'dataset': DatasetSerializer(workspace.dataset_nodes.all(), many=True).data,
                 'featureSelection': FeatureSelectionSerializer(workspace.feature_selection_nodes.all(), many=True).data,
                 'trainTestSplit': TrainTestSplitSerializer(workspace.train_test_split_nodes.all(), many=True).data,
+                'filter': FilterSerializer(workspace.filter_nodes.all(), many=True).data,
+                'hashEncoding': HashEncodingSerializer(workspace.hash_encoding_nodes.all(), many=True).data,
+                'imputation': ImputationSerializer(workspace.imputation_nodes.all(), many=True).data,
                 'linearRegression': LinearRegressionSerializer(workspace.linear_regression_nodes.all(), many=True).data,
                 'predict': PredictSerializer(workspace.prediction_nodes.all(), many=True).data,
                 'evaluation': AccuracySerializer(workspace.accuracy_nodes.all(), many=True).data,
@@ -68,6 +92,69 @@ class WorkspaceViewSet(viewsets.ModelViewSet):
         
         return Response(graph_data)
 
+    @action(detail=True, methods=['post'])
+    def run(self, request, pk=None):
+        """
+        Run the whole workspace graph in one request.
+        POST /api/project/workspaces/{id}/run/
+
+        Body (optional): {"use_cache": false, "max_workers": 4, "async": true,
+                          "sample": {"rows": 10000, "seed": 0}}
+
+        With "sample" ({"rows": n} or {"fraction": f}) the graph runs on a deterministic
+        sample of each dataset's rows and the result is marked "mode": "sample"; run
+        without it for exact results on all the data.
+
+        With "async": true the run is queued as a job and 202 is returned with its ID;
+        poll GET /api/node/jobs/{job_id}/ for the result.
+
+        Nodes are executed in dependency order, independent branches concurrently, and
+        outputs are passed along edges in memory; only a summary of each node's
+        outputs is returned, together with per-node timings.
+        """
+        workspace = get_object_or_404(Workspace, pk=pk, user=request.user)
+        max_workers = request.data.get('max_workers')
+        sample = request.data.get('sample')
+
+        try:
+            use_cache = parse_bool(request.data.get('use_cache', True), 'use_cache')
+            run_async = parse_bool(request.data.get('async', False), 'async')
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        # bool is a subclass of int, but true is not a number of workers
+        if max_workers is not None and (isinstance(max_workers, bool) or not isinstance(max_workers, int)
+                                        or max_workers < 1):
+            return Response(
+                {'error': 'max_workers must be a positive integer.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if sample is not None:
+            try:
+                sample = validate_sample(sample)
+            except ValueError as e:
+                return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        if run_async:
+            job = submit_job(
+                'workspace.run',
+                {'workspace_id': workspace.id, 'use_cache': use_cache, 'max_workers': max_workers,
+                 'sample': sample},
+                user=request.user
+            )
+            return Response(job, status=status.HTTP_202_ACCEPTED)
+
+        try:
+            result = run_workspace(workspace, use_cache=use_cache, max_workers=max_workers, sample=sample)
+        except ValueError as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        return Response(result)
+
     @action(detail=True, methods=['post'], url_path='edges')
     def create_edge(self, request, pk=None):
         """
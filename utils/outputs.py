@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+from django.db import models
+from scipy import sparse
+
+from node.artifacts import RowView, save_artifact
+from node.model_registry import known_model
+
+
+def serialize_outputs(data):
+    """
+    Converts the values returned by a node's execute method into JSON-renderable values.
+
+    Args:
+        data: Dictionary returned by a node's execute method
+
+    Returns:
+        Dictionary with DataFrames, Series and sparse matrices stored as artifacts and replaced by their
+        handles, numpy values converted to Python values, model instances to their
+        primary key, trained models to their registry handle and any other object
+        to its repr
+    """
+    return {key: _serialize_value(value) for key, value in data.items()}
+
+
+def summarize_outputs(data, max_items=100):
+    """
+    Builds a small summary of a node's outputs, suitable for returning from a graph run.
+
+    Args:
+        data: Dictionary returned by a node's execute method
+        max_items: Lists and dicts longer than this are replaced by their length
+
+    Returns:
+        Dictionary with tables and other large values replaced by their type and shape
+    """
+    return {key: _summarize_value(value, max_items) for key, value in data.items()}
+
+
+def _serialize_value(value):
+    if isinstance(value, (pd.DataFrame, pd.Series, RowView)) or sparse.issparse(value):
+        return save_artifact(value)
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, models.Model):
+        return value.pk
+    if isinstance(value, dict):
+        return {key: _serialize_value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_serialize_value(item) for item in value]
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    handle = known_model(value)
+    if handle is not None:
+        return handle
+    return repr(value)
+
+
+def _summarize_value(value, max_items):
+    if isinstance(value, RowView):
+        # Summarized as the rows it selects, without copying them
+        summary = _summarize_value(value.parent, max_items)
+        if 'length' in summary:
+            summary['length'] = len(value)
+        else:
+            summary['shape'] = list(value.shape)
+            summary.pop('nnz', None)
+        return summary
+    if isinstance(value, pd.DataFrame):
+        return {
+            'type': 'DataFrame',
+            'shape': list(value.shape),
+            'columns': [str(column) for column in value.columns[:max_items]],
+        }
+    if isinstance(value, pd.Series):
+        return {'type': 'Series', 'name': _serialize_value(value.name), 'length': len(value)}
+    if isinstance(value, np.ndarray):
+        return {'type': 'ndarray', 'shape': list(value.shape), 'dtype': str(value.dtype)}
+    if sparse.issparse(value):
+        return {'type': type(value).__name__, 'shape': list(value.shape), 'nnz': int(value.nnz),
+                'dtype': str(value.dtype)}
+    if isinstance(value, (list, tuple, dict)):
+        if len(value) > max_items:
+            return {'type': type(value).__name__, 'length': len(value)}
+        return _serialize_value(value)
+    if isinstance(value, (np.generic, models.Model)) or value is None or isinstance(value, (str, int, float, bool)):
+        return _serialize_value(value)
+    return {'type': type(value).__name__}